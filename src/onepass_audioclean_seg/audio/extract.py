@@ -2,6 +2,7 @@
 
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -16,6 +17,7 @@ def extract_wav_segment(
     start_sec: float,
     end_sec: float,
     ffmpeg_path: Optional[str] = None,
+    make_parents: bool = True,
 ) -> bool:
     """使用 ffmpeg 提取音频片段并保存为 WAV 文件
     
@@ -25,6 +27,7 @@ def extract_wav_segment(
         start_sec: 片段开始时间（秒）
         end_sec: 片段结束时间（秒）
         ffmpeg_path: ffmpeg 可执行文件路径（可选，默认从 PATH 查找）
+        make_parents: 是否创建输出目录（调用方已创建时传 False，省去每段一次 mkdir）
     
     Returns:
         是否成功提取
@@ -40,7 +43,8 @@ def extract_wav_segment(
             return False
     
     # 确保输出目录存在
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if make_parents:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
     
     # 构建 ffmpeg 命令
     # 使用 -ss 和 -to 指定时间范围，-acodec pcm_s16le 重新编码为 PCM16
@@ -78,3 +82,89 @@ def extract_wav_segment(
         logger.warning(f"提取音频片段时发生错误: {e}", exc_info=True)
         return False
 
+
+def extract_wav_segments_batch(
+    audio_path: Path,
+    items: list[tuple[Path, float, float]],
+    ffmpeg_path: Optional[str] = None,
+    batch_size: int = 32,
+    max_workers: int = 1,
+) -> list[bool]:
+    """在一个 ffmpeg 进程中提取多个音频片段
+    
+    每个片段作为一个带 -ss/-to 的独立输入（各自 seek，只解码自身范围），
+    按 batch_size 分批调用 ffmpeg，输出与逐段调用 extract_wav_segment 逐字节一致。
+    某批失败时回退为逐段提取，以便定位具体失败的片段。
+    max_workers > 1 时多个批次在线程池中并发运行（各批写入互不相同的文件）。
+    
+    Args:
+        audio_path: 输入音频文件路径
+        items: 待提取片段列表，每个元素为 (out_path, start_sec, end_sec)
+        ffmpeg_path: ffmpeg 可执行文件路径（可选，默认从 PATH 查找）
+        batch_size: 每个 ffmpeg 进程处理的片段数（限制命令行长度和打开的文件数）
+        max_workers: 同时运行的 ffmpeg 进程数（默认 1，即逐批串行）
+    
+    Returns:
+        与 items 一一对应的成功标记列表
+    """
+    results = [False] * len(items)
+    if not items:
+        return results
+    
+    if ffmpeg_path is None:
+        ffmpeg_path = which("ffmpeg")
+        if ffmpeg_path is None:
+            logger.error("ffmpeg 未找到，无法提取音频片段")
+            return results
+    
+    # 无效时间范围直接判失败（与 extract_wav_segment 一致）
+    valid: list[int] = []
+    for i, (out_path, start_sec, end_sec) in enumerate(items):
+        if start_sec < 0 or end_sec <= start_sec:
+            logger.warning(f"无效的时间范围: start={start_sec}, end={end_sec}")
+            continue
+        valid.append(i)
+    
+    def run_batch(batch: list[int]) -> None:
+        cmd = [ffmpeg_path, "-hide_banner", "-nostats", "-y"]
+        for i in batch:
+            _, start_sec, end_sec = items[i]
+            cmd.extend(["-ss", str(start_sec), "-to", str(end_sec), "-i", str(audio_path)])
+        for input_idx, i in enumerate(batch):
+            cmd.extend(["-map", f"{input_idx}:a", "-acodec", "pcm_s16le", str(items[i][0])])
+        
+        try:
+            result = run_cmd(cmd, timeout_sec=60 + 10 * len(batch))
+            batch_ok = result.returncode == 0
+            if not batch_ok:
+                error_msg = result.stderr or result.stdout or "未知错误"
+                logger.warning(f"ffmpeg 批量提取失败（返回码 {result.returncode}），回退为逐段提取: {error_msg[:200]}")
+        except Exception as e:
+            logger.warning(f"批量提取音频片段时发生错误，回退为逐段提取: {e}")
+            batch_ok = False
+        
+        for i in batch:
+            out_path, start_sec, end_sec = items[i]
+            if batch_ok and out_path.exists():
+                results[i] = True
+            else:
+                results[i] = extract_wav_segment(
+                    audio_path,
+                    out_path,
+                    start_sec,
+                    end_sec,
+                    ffmpeg_path,
+                    make_parents=False,
+                )
+    
+    step = max(1, batch_size)
+    batches = [valid[batch_start:batch_start + step] for batch_start in range(0, len(valid), step)]
+    if max_workers > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            # list() 取出结果以便把批次中的异常抛给调用方
+            list(executor.map(run_batch, batches))
+    else:
+        for batch in batches:
+            run_batch(batch)
+    
+    return results
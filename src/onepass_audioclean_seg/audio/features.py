@@ -3,12 +3,165 @@
 import array
 import logging
 import math
+import operator
 import wave
+from itertools import repeat
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# compute_rms_batch 整文件读入的 PCM 字节上限，超过则回退为逐段 setpos 读取
+BATCH_FULL_READ_MAX_BYTES = 512 * 1024 * 1024
+
+# 平方和：Python 3.12+ 的 math.sumprod 在 C 层完成乘加（整数输入结果精确），
+# 旧版本退回 sum(map(mul))，两者结果逐位一致
+if hasattr(math, "sumprod"):
+    def _sum_of_squares(samples) -> int:
+        return math.sumprod(samples, samples)
+else:
+    def _sum_of_squares(samples) -> int:
+        return sum(map(operator.mul, samples, samples))
+
+
+def _downmix_pcm16(samples: array.array, n_channels: int) -> array.array:
+    """多声道交错 int16 样本下混为单声道（按帧取平均并截断为整数）
+    
+    整个下混由 map 链在 C 层迭代完成，不逐样本执行 Python 表达式；不完整的尾帧被丢弃。
+    """
+    # 按声道步长切片
+    channels = [samples[ch::n_channels] for ch in range(n_channels)]
+    frame_sums = map(operator.add, *channels) if n_channels == 2 else map(sum, zip(*channels))
+    # int(s / n) 向零截断，与逐样本 int16 下混一致
+    return array.array("h", map(int, map(operator.truediv, frame_sums, repeat(n_channels))))
+
+
+def rms_from_pcm16(frames: bytes, n_channels: int = 1) -> Optional[float]:
+    """计算 16-bit PCM 数据块的 RMS（归一化到 [0, 1]）
+    
+    多声道先按帧取平均（截断为整数，与逐样本 int16 下混一致），
+    然后在整数域一次性累加平方和，避免逐样本 float 转换和中间列表。
+    
+    Args:
+        frames: wave.readframes 返回的原始 PCM 字节
+        n_channels: 声道数
+    
+    Returns:
+        RMS 值，若数据为空则返回 None
+    """
+    audio_data = array.array("h", frames)  # 'h' 表示 signed short (int16)
+    
+    if n_channels > 1:
+        audio_data = _downmix_pcm16(audio_data, n_channels)
+    
+    if len(audio_data) == 0:
+        return None
+    
+    # RMS = sqrt(mean(x^2)) / 32768.0（整数平方和精确无误差）
+    sum_squares = _sum_of_squares(audio_data)
+    return math.sqrt(sum_squares / len(audio_data)) / 32768.0
+
+
+def rms_series_from_pcm16(
+    frames: bytes,
+    n_channels: int,
+    frame_samples: int,
+    hop_samples: int,
+    total_samples: Optional[int] = None,
+) -> tuple[list[float], list[int]]:
+    """计算整段 16-bit PCM 数据的逐帧 RMS 序列（帧长 frame_samples，帧移 hop_samples）
+    
+    结果与逐帧切片后调用 rms_from_pcm16 逐位一致：先整体下混一次，再按帧移分块
+    累加整数平方和并求前缀和。每帧的平方和 = 若干整块之差 + 不足一块的尾部切片，
+    重叠帧之间共享的样本只平方一次，总开销约为 O(样本数) 而非 O(样本数 × frame/hop)。
+    
+    Args:
+        frames: 整段原始 PCM 字节（wave.readframes 的返回值）
+        n_channels: 声道数
+        frame_samples: 每帧样本数（> 0）
+        hop_samples: 帧移样本数（> 0）
+        total_samples: 只处理前 total_samples 个样本（可选，默认全部）
+    
+    Returns:
+        (rms_series, frame_starts) 元组
+        - rms_series: 每帧的 RMS 值（归一化到 [0, 1]）
+        - frame_starts: 每帧的起始样本位置
+    """
+    samples = array.array("h", frames)
+    if n_channels > 1:
+        # 与 rms_from_pcm16 相同的下混规则（按帧平均后截断为整数）
+        samples = _downmix_pcm16(samples, n_channels)
+    
+    available = len(samples)
+    limit = available if total_samples is None else min(total_samples, available)
+    if limit <= 0:
+        return [], []
+    
+    # 每个帧移块的平方和及其前缀和：prefix[b] 为前 b 个整块的平方和（帧长小于帧移时用不到）
+    prefix = [0]
+    if frame_samples >= hop_samples:
+        running = 0
+        for block_start in range(0, limit - hop_samples + 1, hop_samples):
+            running += _sum_of_squares(samples[block_start:block_start + hop_samples])
+            prefix.append(running)
+    full_blocks_per_frame = frame_samples // hop_samples
+    
+    rms_series: list[float] = []
+    frame_starts: list[int] = []
+    for index, start in enumerate(range(0, limit, hop_samples)):
+        end = min(start + frame_samples, limit)
+        n_frame = end - start
+        n_blocks = min(full_blocks_per_frame, n_frame // hop_samples)
+        tail_start = start + n_blocks * hop_samples
+        sum_squares = _sum_of_squares(samples[tail_start:end])
+        if n_blocks:
+            sum_squares += prefix[index + n_blocks] - prefix[index]
+        rms_series.append(math.sqrt(sum_squares / n_frame) / 32768.0)
+        frame_starts.append(start)
+    
+    return rms_series, frame_starts
+
+
+def _read_segment_rms(
+    wf: wave.Wave_read,
+    start_sec: float,
+    end_sec: float,
+    sample_rate: int,
+    n_channels: int,
+    pcm: Optional[bytes] = None,
+) -> Optional[float]:
+    """从已打开的 16-bit PCM WAV 中读取 [start_sec, end_sec) 并计算 RMS
+    
+    若提供 pcm（整文件的原始帧数据），直接按字节切片，不再 setpos/readframes。
+    """
+    # 计算帧范围
+    start_frame = int(start_sec * sample_rate)
+    end_frame = int(end_sec * sample_rate)
+    n_frames = end_frame - start_frame
+    
+    if n_frames <= 0:
+        logger.warning(f"无效的帧范围: start_frame={start_frame}, end_frame={end_frame}")
+        return None
+    
+    if pcm is not None:
+        # 每帧 2 字节 × 声道数，越界切片自然截断（与 readframes 行为一致）
+        frame_bytes = 2 * n_channels
+        frames = pcm[start_frame * frame_bytes:end_frame * frame_bytes]
+    else:
+        # 定位到起始帧
+        wf.setpos(start_frame)
+        
+        # 读取帧数据
+        frames = wf.readframes(n_frames)
+    
+    if len(frames) == 0:
+        logger.warning(f"读取到空数据: start_frame={start_frame}, end_frame={end_frame}")
+        return None
+    
+    # 计算 RMS（下混不足一帧时按 0 处理）
+    rms = rms_from_pcm16(frames, n_channels)
+    return float(rms) if rms is not None else 0.0
+
 
 def compute_rms(
     audio_path: Path,
@@ -49,45 +202,7 @@ def compute_rms(
                 logger.warning(f"不支持的样本宽度: {sample_width}（需要 2，即 16-bit PCM）")
                 return None
             
-            # 计算帧范围
-            start_frame = int(start_sec * sample_rate)
-            end_frame = int(end_sec * sample_rate)
-            n_frames = end_frame - start_frame
-            
-            if n_frames <= 0:
-                logger.warning(f"无效的帧范围: start_frame={start_frame}, end_frame={end_frame}")
-                return None
-            
-            # 定位到起始帧
-            wf.setpos(start_frame)
-            
-            # 读取帧数据
-            frames = wf.readframes(n_frames)
-            
-            if len(frames) == 0:
-                logger.warning(f"读取到空数据: start_frame={start_frame}, end_frame={end_frame}")
-                return None
-            
-            # 转换为 array（int16）
-            audio_data = array.array("h", frames)  # 'h' 表示 signed short (int16)
-            
-            # 如果是多声道，取平均值
-            if n_channels > 1:
-                # 重塑为 (n_frames, n_channels) 并取平均值
-                n_samples = len(audio_data) // n_channels
-                reshaped = []
-                for i in range(n_samples):
-                    sample_sum = sum(audio_data[i * n_channels + ch] for ch in range(n_channels))
-                    reshaped.append(sample_sum / n_channels)
-                audio_data = array.array("h", [int(x) for x in reshaped])
-            
-            # 计算 RMS
-            # RMS = sqrt(mean(x^2)) / 32768.0（归一化到 [0, 1]）
-            sum_squares = sum(float(x) ** 2 for x in audio_data)
-            mean_square = sum_squares / len(audio_data) if len(audio_data) > 0 else 0.0
-            rms = math.sqrt(mean_square) / 32768.0
-            
-            return float(rms)
+            return _read_segment_rms(wf, start_sec, end_sec, sample_rate, n_channels)
     
     except wave.Error as e:
         logger.warning(f"wave 库读取失败: {e}")
@@ -100,6 +215,71 @@ def compute_rms(
         return None
 
 
+def compute_rms_batch(
+    audio_path: Path,
+    segments: list[tuple[float, float]],
+    sample_rate_hint: Optional[int] = None,
+) -> list[Optional[float]]:
+    """批量计算多个片段的 RMS 值
+    
+    只打开一次 WAV 文件并解析一次头部。文件 PCM 数据不超过
+    BATCH_FULL_READ_MAX_BYTES 时一次性读入内存，各片段直接按字节切片；
+    否则逐段 setpos + readframes。两种方式结果均与逐段调用 compute_rms 一致。
+    
+    Args:
+        audio_path: 音频文件路径（WAV 格式）
+        segments: 片段列表，每个元素为 (start_sec, end_sec)
+        sample_rate_hint: 采样率提示（可选，用于验证）
+    
+    Returns:
+        与 segments 一一对应的 RMS 列表，无法计算的片段为 None
+    """
+    results: list[Optional[float]] = [None] * len(segments)
+    if not segments:
+        return results
+    
+    try:
+        with wave.open(str(audio_path), "rb") as wf:
+            sample_rate = wf.getframerate()
+            sample_width = wf.getsampwidth()
+            n_channels = wf.getnchannels()
+            
+            # 验证采样率（如果提供了 hint）
+            if sample_rate_hint is not None and sample_rate != sample_rate_hint:
+                logger.debug(f"采样率不匹配: 文件={sample_rate}, 提示={sample_rate_hint}")
+            
+            # 只支持 16-bit PCM（sample_width=2）
+            if sample_width != 2:
+                logger.warning(f"不支持的样本宽度: {sample_width}（需要 2，即 16-bit PCM）")
+                return results
+            
+            # 整文件一次读入，省去每段的 seek 与小块读取
+            pcm: Optional[bytes] = None
+            if wf.getnframes() * sample_width * n_channels <= BATCH_FULL_READ_MAX_BYTES:
+                pcm = wf.readframes(wf.getnframes())
+            
+            for i, (start_sec, end_sec) in enumerate(segments):
+                if start_sec < 0 or end_sec <= start_sec:
+                    logger.warning(f"无效的时间范围: start={start_sec}, end={end_sec}")
+                    continue
+                try:
+                    results[i] = _read_segment_rms(
+                        wf, start_sec, end_sec, sample_rate, n_channels, pcm
+                    )
+                except wave.Error as e:
+                    # 单段越界（如 setpos 超出文件长度）不影响其余片段
+                    logger.warning(f"wave 库读取失败: {e}")
+    
+    except wave.Error as e:
+        logger.warning(f"wave 库读取失败: {e}")
+    except OSError as e:
+        logger.warning(f"文件读取失败: {e}")
+    except Exception as e:
+        logger.warning(f"批量计算 RMS 时发生未预期错误: {e}", exc_info=True)
+    
+    return results
+
+
 def rms_to_db(rms: float, eps: float = 1e-12) -> float:
     """将 RMS 值转换为 dB（分贝）
     
@@ -9,6 +9,58 @@ from onepass_audioclean_seg.audio.ffmpeg import run_cmd, which
 
 logger = logging.getLogger(__name__)
 
+# ffprobe 探测结果缓存：{(绝对路径, st_mtime_ns, st_size): duration_sec}
+# 文件被改写后 mtime/size 变化即自动失效；只缓存成功的结果
+_PROBE_CACHE_MAXSIZE = 1024
+_probe_cache: dict[tuple[str, int, int], float] = {}
+
+
+def _probe_cache_key(audio_path: Path) -> Optional[tuple[str, int, int]]:
+    """构建 ffprobe 缓存键，文件不可 stat 时返回 None（不走缓存）"""
+    try:
+        st = audio_path.stat()
+    except OSError:
+        return None
+    return (str(audio_path.absolute()), st.st_mtime_ns, st.st_size)
+
+
+def read_duration_from_meta(meta_path: Optional[Path]) -> Optional[float]:
+    """从 meta.json 读取音频时长（秒）
+    
+    Args:
+        meta_path: meta.json 路径（可选）
+    
+    Returns:
+        音频时长（秒），若 meta.json 不存在或不含 duration_sec 则返回 None
+    """
+    if not meta_path or not meta_path.exists():
+        return None
+    
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        
+        # 尝试多个可能的字段路径
+        duration = None
+        if "duration_sec" in obj:
+            duration = obj["duration_sec"]
+        elif "audio" in obj and isinstance(obj["audio"], dict):
+            if "duration_sec" in obj["audio"]:
+                duration = obj["audio"]["duration_sec"]
+        elif "output" in obj and isinstance(obj["output"], dict):
+            if "duration_sec" in obj["output"]:
+                duration = obj["output"]["duration_sec"]
+        
+        if duration is not None:
+            try:
+                return float(duration)
+            except (ValueError, TypeError):
+                logger.warning(f"从 {meta_path} 读取的 duration_sec 无法转换为 float: {duration}")
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"读取 {meta_path} 失败: {e}")
+    
+    return None
+
 
 def get_audio_duration_sec(
     audio_path: Path,
@@ -30,29 +82,9 @@ def get_audio_duration_sec(
         音频时长（秒），若无法获取则返回 None
     """
     # 优先级 1: 从 meta_path 读取
-    if meta_path and meta_path.exists():
-        try:
-            with open(meta_path, "r", encoding="utf-8") as f:
-                obj = json.load(f)
-            
-            # 尝试多个可能的字段路径
-            duration = None
-            if "duration_sec" in obj:
-                duration = obj["duration_sec"]
-            elif "audio" in obj and isinstance(obj["audio"], dict):
-                if "duration_sec" in obj["audio"]:
-                    duration = obj["audio"]["duration_sec"]
-            elif "output" in obj and isinstance(obj["output"], dict):
-                if "duration_sec" in obj["output"]:
-                    duration = obj["output"]["duration_sec"]
-            
-            if duration is not None:
-                try:
-                    return float(duration)
-                except (ValueError, TypeError):
-                    logger.warning(f"从 {meta_path} 读取的 duration_sec 无法转换为 float: {duration}")
-        except (json.JSONDecodeError, OSError) as e:
-            logger.warning(f"读取 {meta_path} 失败: {e}")
+    duration = read_duration_from_meta(meta_path)
+    if duration is not None:
+        return duration
     
     # 优先级 2: 使用 ffprobe
     if ffprobe_path is None:
@@ -62,6 +94,23 @@ def get_audio_duration_sec(
         logger.warning("ffprobe 未找到，无法获取音频时长")
         return None
     
+    # 同一文件（路径、mtime、大小均未变）在进程内只调用一次 ffprobe
+    cache_key = _probe_cache_key(audio_path)
+    if cache_key is not None:
+        cached = _probe_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    duration = _run_ffprobe_duration(ffprobe_path, audio_path)
+    if duration is not None and cache_key is not None:
+        if len(_probe_cache) >= _PROBE_CACHE_MAXSIZE:
+            _probe_cache.clear()
+        _probe_cache[cache_key] = duration
+    return duration
+
+
+def _run_ffprobe_duration(ffprobe_path: str, audio_path: Path) -> Optional[float]:
+    """调用 ffprobe 读取音频时长（秒），失败返回 None"""
     try:
         cmd = [
             ffprobe_path,
@@ -271,7 +271,7 @@ def create_parser() -> argparse.ArgumentParser:
         "--jobs",
         type=int,
         default=DEFAULT_JOBS,
-        help=f"并行任务数（默认: {DEFAULT_JOBS}）",
+        help=f"并行任务数，0 表示使用全部 CPU 核数（默认: {DEFAULT_JOBS}）",
     )
     segment_parser.add_argument(
         "--overwrite",
@@ -1,5 +1,7 @@
 """配置文件支持模块（R11）"""
 
+import copy
+import hashlib
 import json
 import logging
 import sys
@@ -190,7 +192,6 @@ def merge_configs(
         合并后的配置字典
     """
     # 深拷贝默认配置
-    import copy
     merged = copy.deepcopy(defaults)
     
     # 合并文件配置
@@ -302,8 +303,6 @@ def compute_config_hash(config: dict[str, Any]) -> str:
     Returns:
         SHA256 哈希值（十六进制字符串）
     """
-    import hashlib
-    
     # 使用 sort_keys=True 和紧凑格式确保稳定性
     config_json = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
     hash_obj = hashlib.sha256(config_json.encode("utf-8"))
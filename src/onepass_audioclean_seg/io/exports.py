@@ -7,6 +7,7 @@ import math
 from pathlib import Path
 from typing import Any, Optional
 
+from onepass_audioclean_seg.io.jsonfile import write_json_atomic
 from onepass_audioclean_seg.io.segments import SegmentRecord
 
 logger = logging.getLogger(__name__)
@@ -76,9 +77,8 @@ def export_timeline_json(
     # items 必须按 start_sec 排序
     timeline["tracks"][0]["items"].sort(key=lambda x: x["start_sec"])
     
-    # 写入文件
-    with open(timeline_path, "w", encoding="utf-8") as f:
-        json.dump(timeline, f, ensure_ascii=False, indent=2)
+    # 写入文件（整体编码后原子写入）
+    write_json_atomic(timeline_path, timeline)
     
     logger.info(f"导出 timeline.json: {timeline_path}")
     return timeline_path
@@ -292,9 +292,8 @@ def export_mask_json(
         },
     }
     
-    # 写入文件
-    with open(mask_path, "w", encoding="utf-8") as f:
-        json.dump(mask, f, ensure_ascii=False, indent=2)
+    # 写入文件（整体编码后原子写入）
+    write_json_atomic(mask_path, mask)
     
     logger.info(f"导出 mask.json: {mask_path}")
     return mask_path
@@ -0,0 +1,109 @@
+"""JSON / 文本文件的原子写入与 JSON 解析"""
+
+import json
+import math
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson  # 可选依赖：pip install -e ".[json]"
+except ImportError:
+    orjson = None
+
+
+def write_text_atomic(path: Path, text: str) -> Path:
+    """原子写入文本文件（先写同目录临时文件，再 os.replace 覆盖目标）
+    
+    写入过程中中断不会留下半截的目标文件：读者要么看到旧内容，要么看到完整的新内容。
+    
+    Args:
+        path: 目标文件路径（父目录需已存在）
+        text: 要写入的文本（UTF-8）
+    
+    Returns:
+        写入的文件路径
+    """
+    return write_lines_atomic(path, (text,))
+
+
+def write_lines_atomic(path: Path, chunks: Iterable[str]) -> Path:
+    """原子写入逐块生成的文本（边生成边写入临时文件，不在内存中拼接整个文件）
+    
+    生成过程中抛出异常时临时文件会被删除，目标文件保持原内容。
+    
+    Args:
+        path: 目标文件路径（父目录需已存在）
+        chunks: 依次写入的文本块（UTF-8，需自带换行）
+    
+    Returns:
+        写入的文件路径
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    
+    return path
+
+
+def _has_non_finite(data: Any) -> bool:
+    """数据中是否含有 NaN / Infinity 浮点数"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+def dumps_json_indented(data: Any) -> str:
+    """编码为缩进 2 空格、不转义非 ASCII 字符的 JSON 文本
+    
+    安装了 orjson 时使用其 C 实现（布局与 json.dumps(indent=2) 相同，仅极小/极大浮点数的
+    指数写法不同，解析结果一致）；否则使用标准库 json。
+    orjson 会把 NaN / Infinity 静默写成 null，因此数据中含有非有限浮点数时改用标准库 json，
+    保证两种环境写出的 NaN / Infinity 一致（只有输出中出现 null 时才需要检查数据）。
+    """
+    if orjson is not None:
+        text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        if "null" not in text or not _has_non_finite(data):
+            return text
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """解析一段 JSON 文本（如 JSONL 的一行）
+    
+    安装了 orjson 时使用其 C 实现，可直接解析 bytes 而无需先解码；否则使用标准库 json。
+    orjson 不接受 NaN/Infinity 字面量，解析失败时再交给标准库 json 重试，
+    因此两种环境能读取的内容一致。JSON 非法时抛出 json.JSONDecodeError，
+    bytes 不是合法 UTF-8 时抛出 UnicodeDecodeError（两者都是 ValueError 的子类）。
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def write_json_atomic(path: Path, data: Any) -> Path:
+    """原子写入 JSON 文件（ensure_ascii=False, indent=2）
+    
+    先完整编码再写入，编码失败时目标文件保持不变。
+    
+    Args:
+        path: 目标文件路径（父目录需已存在）
+        data: 要写入的数据
+    
+    Returns:
+        写入的文件路径
+    """
+    return write_text_atomic(path, dumps_json_indented(data))
@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Any, Optional
 
 from onepass_audioclean_seg import __version__
+from onepass_audioclean_seg.audio.fingerprint import fingerprint_audio_wav
+from onepass_audioclean_seg.io.jsonfile import write_json_atomic
 
 
 def read_seg_report(report_path: Path) -> Optional[dict[str, Any]]:
@@ -27,31 +29,26 @@ def read_seg_report(report_path: Path) -> Optional[dict[str, Any]]:
         return None
 
 
-def write_seg_report(
-    out_dir: Path,
+def build_seg_report(
     params: dict[str, Any],
     audio_path: Path,
     meta_path: Optional[Path] = None,
     config_hash: Optional[str] = None,
-) -> Path:
-    """写入最小 seg_report.json 文件
+) -> dict[str, Any]:
+    """构建最小 seg_report 字典（不写盘）
     
     Args:
-        out_dir: 输出目录
         params: 参数字典（包含 strategy、min_seg_sec 等）
         audio_path: 音频文件路径
         meta_path: meta.json 路径（可选）
         config_hash: 配置哈希值（R11，可选）
     
     Returns:
-        seg_report.json 的路径
+        报告字典
     """
-    out_dir.mkdir(parents=True, exist_ok=True)
-    
     # R11: 计算音频指纹
     audio_fingerprint = None
     try:
-        from onepass_audioclean_seg.audio.fingerprint import fingerprint_audio_wav
         audio_fingerprint = fingerprint_audio_wav(audio_path)
     except Exception:
         pass  # 忽略错误
@@ -76,13 +73,108 @@ def write_seg_report(
     if audio_fingerprint:
         report["audio_fingerprint"] = audio_fingerprint
     
+    return report
+
+
+def write_seg_report(
+    out_dir: Path,
+    params: dict[str, Any],
+    audio_path: Path,
+    meta_path: Optional[Path] = None,
+    config_hash: Optional[str] = None,
+) -> Path:
+    """写入最小 seg_report.json 文件
+    
+    Args:
+        out_dir: 输出目录
+        params: 参数字典（包含 strategy、min_seg_sec 等）
+        audio_path: 音频文件路径
+        meta_path: meta.json 路径（可选）
+        config_hash: 配置哈希值（R11，可选）
+    
+    Returns:
+        seg_report.json 的路径
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report = build_seg_report(params, audio_path, meta_path=meta_path, config_hash=config_hash)
+    
     report_path = out_dir / "seg_report.json"
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    write_json_atomic(report_path, report)
     
     return report_path
 
 
+def _new_report() -> dict[str, Any]:
+    """报告不存在时使用的最小报告"""
+    return {
+        "version": "R11",
+        "created_at": datetime.now().isoformat(),
+        "tool": {
+            "name": "onepass-audioclean-seg",
+            "version": __version__,
+        },
+    }
+
+
+def _ensure_tool(report: dict[str, Any]) -> None:
+    """R11: 确保 tool 字段存在"""
+    if "tool" not in report:
+        report["tool"] = {
+            "name": "onepass-audioclean-seg",
+            "version": __version__,
+        }
+
+
+def merge_seg_report_analysis(
+    report: dict[str, Any],
+    analysis_data: dict[str, Any],
+) -> dict[str, Any]:
+    """把 analysis 数据合并进内存中的报告字典（原地修改，不写盘）
+    
+    Args:
+        report: 报告字典
+        analysis_data: 要添加的 analysis 数据（例如 {"silence": {...}}）
+    
+    Returns:
+        同一个报告字典
+    """
+    _ensure_tool(report)
+    report.setdefault("analysis", {}).update(analysis_data)
+    report["updated_at"] = datetime.now().isoformat()
+    return report
+
+
+def merge_seg_report_segments(
+    report: dict[str, Any],
+    segments_data: dict[str, Any],
+    audio_path: Optional[Path] = None,
+) -> dict[str, Any]:
+    """把 segments 数据合并进内存中的报告字典（原地修改，不写盘）
+    
+    Args:
+        report: 报告字典
+        segments_data: 要写入的 segments 数据（覆盖原有字段）
+        audio_path: 音频文件路径（R11，报告中还没有指纹时用于计算，可选）
+    
+    Returns:
+        同一个报告字典
+    """
+    _ensure_tool(report)
+    
+    # R11: 如果 audio_path 提供且 audio_fingerprint 不存在，计算指纹
+    if audio_path and "audio_fingerprint" not in report:
+        try:
+            audio_fingerprint = fingerprint_audio_wav(audio_path)
+            if audio_fingerprint:
+                report["audio_fingerprint"] = audio_fingerprint
+        except Exception:
+            pass  # 忽略错误
+    
+    report["segments"] = segments_data
+    report["updated_at"] = datetime.now().isoformat()
+    return report
+
+
 def update_seg_report_analysis(
     out_dir: Path,
     analysis_data: dict[str, Any],
@@ -99,37 +191,12 @@ def update_seg_report_analysis(
     out_dir.mkdir(parents=True, exist_ok=True)
     report_path = out_dir / "seg_report.json"
     
-    # 读取现有报告（如果存在）
     existing_report = read_seg_report(report_path)
-    
     if existing_report is None:
         # 如果报告不存在，创建一个最小报告
-        existing_report = {
-            "version": "R11",
-            "created_at": datetime.now().isoformat(),
-            "tool": {
-                "name": "onepass-audioclean-seg",
-                "version": __version__,
-            },
-        }
-    
-    # R11: 确保 tool 字段存在
-    if "tool" not in existing_report:
-        existing_report["tool"] = {
-            "name": "onepass-audioclean-seg",
-            "version": __version__,
-        }
-    
-    # 合并 analysis 字段
-    if "analysis" not in existing_report:
-        existing_report["analysis"] = {}
-    
-    existing_report["analysis"].update(analysis_data)
-    existing_report["updated_at"] = datetime.now().isoformat()
-    
-    # 写回
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(existing_report, f, ensure_ascii=False, indent=2)
+        existing_report = _new_report()
+    merge_seg_report_analysis(existing_report, analysis_data)
+    write_json_atomic(report_path, existing_report)
     
     return report_path
 
@@ -152,44 +219,11 @@ def update_seg_report_segments(
     out_dir.mkdir(parents=True, exist_ok=True)
     report_path = out_dir / "seg_report.json"
     
-    # 读取现有报告（如果存在）
     existing_report = read_seg_report(report_path)
-    
     if existing_report is None:
         # 如果报告不存在，创建一个最小报告
-        existing_report = {
-            "version": "R11",
-            "created_at": datetime.now().isoformat(),
-            "tool": {
-                "name": "onepass-audioclean-seg",
-                "version": __version__,
-            },
-        }
-    
-    # R11: 确保 tool 字段存在
-    if "tool" not in existing_report:
-        existing_report["tool"] = {
-            "name": "onepass-audioclean-seg",
-            "version": __version__,
-        }
-    
-    # R11: 如果 audio_path 提供且 audio_fingerprint 不存在，计算指纹
-    if audio_path and "audio_fingerprint" not in existing_report:
-        try:
-            from onepass_audioclean_seg.audio.fingerprint import fingerprint_audio_wav
-            audio_fingerprint = fingerprint_audio_wav(audio_path)
-            if audio_fingerprint:
-                existing_report["audio_fingerprint"] = audio_fingerprint
-        except Exception:
-            pass  # 忽略错误
-    
-    # 合并 segments 字段（覆盖）
-    existing_report["segments"] = segments_data
-    existing_report["updated_at"] = datetime.now().isoformat()
-    
-    # 写回
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(existing_report, f, ensure_ascii=False, indent=2)
+        existing_report = _new_report()
+    merge_seg_report_segments(existing_report, segments_data, audio_path=audio_path)
+    write_json_atomic(report_path, existing_report)
     
     return report_path
-
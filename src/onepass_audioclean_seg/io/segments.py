@@ -2,10 +2,13 @@
 
 import json
 import logging
-from dataclasses import asdict, dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from onepass_audioclean_seg.io.jsonfile import write_lines_atomic
+
 logger = logging.getLogger(__name__)
 
 # R10: flags 排序优先级（固定顺序，避免 diff 噪声）
@@ -15,11 +18,18 @@ FLAGS_ORDER = [
     "edge_clipped",
     "low_energy",
 ]
+_FLAGS_RANK = {flag: rank for rank, flag in enumerate(FLAGS_ORDER)}
+
+# 复用同一个 encoder：json.dumps 带非默认参数时每次调用都会新建 JSONEncoder
+_JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class SegmentRecord:
-    """片段记录数据类（R10：扩充 flags/source/quality）"""
+    """片段记录数据类（R10：扩充 flags/source/quality）
+    
+    使用 slots：每个 job 可能生成数千条记录，省去逐实例 __dict__ 的分配
+    """
     
     id: str
     start_sec: float
@@ -43,60 +53,65 @@ class SegmentRecord:
         
         注意：时间字段已 round(3)，rms 保留更高精度（round(6)），energy_db round(2)
         R10: flags 按固定顺序排序
-        """
-        data = asdict(self)
-        # 确保时间字段都是 round(3)
-        data["start_sec"] = round(data["start_sec"], 3)
-        data["end_sec"] = round(data["end_sec"], 3)
-        data["duration_sec"] = round(data["duration_sec"], 3)
-        data["pre_silence_sec"] = round(data["pre_silence_sec"], 3)
-        data["post_silence_sec"] = round(data["post_silence_sec"], 3)
-        
-        # rms 保留更高精度
-        if data.get("rms") is not None:
-            data["rms"] = round(data["rms"], 6)
-        
-        # energy_db 保留 2 位小数
-        if data.get("energy_db") is not None:
-            data["energy_db"] = round(data["energy_db"], 2)
-        
-        # R10: flags 按固定顺序排序（确定性输出）
-        if "flags" in data and isinstance(data["flags"], list):
-            flags = data["flags"]
-            # 按 FLAGS_ORDER 排序，未在列表中的排在最后
-            sorted_flags = sorted(
-                flags,
-                key=lambda f: (FLAGS_ORDER.index(f) if f in FLAGS_ORDER else len(FLAGS_ORDER), f)
-            )
-            data["flags"] = sorted_flags
         
-        # 移除 None 值（可选，但为了 JSON 简洁性）
-        # 这里保留 None 值，让调用方决定是否过滤
-        
-        return data
+        直接按字段顺序构建字典，不经过 dataclasses.asdict（后者会递归深拷贝
+        flags/source/quality/notes）；notes/source/quality 与记录共享同一对象，仅供序列化使用。
+        """
+        rms = self.rms
+        energy_db = self.energy_db
+        return {
+            "id": self.id,
+            # 确保时间字段都是 round(3)
+            "start_sec": round(self.start_sec, 3),
+            "end_sec": round(self.end_sec, 3),
+            "duration_sec": round(self.duration_sec, 3),
+            "source_audio": self.source_audio,
+            "pre_silence_sec": round(self.pre_silence_sec, 3),
+            "post_silence_sec": round(self.post_silence_sec, 3),
+            "is_speech": self.is_speech,
+            "strategy": self.strategy,
+            # rms 保留更高精度，energy_db 保留 2 位小数
+            "rms": round(rms, 6) if rms is not None else None,
+            "energy_db": round(energy_db, 2) if energy_db is not None else None,
+            "notes": self.notes,
+            # R10: flags 按固定顺序排序（确定性输出），未在 FLAGS_ORDER 中的排在最后
+            "flags": sorted(self.flags, key=_flag_sort_key),
+            "source": self.source,
+            "quality": self.quality,
+        }
+
+
+def _flag_sort_key(flag: str) -> tuple[int, str]:
+    """flags 排序键：按 FLAGS_ORDER 的位置，未知 flag 排在最后并按名称排序"""
+    return (_FLAGS_RANK.get(flag, len(FLAGS_ORDER)), flag)
 
 
 def write_segments_jsonl(
     path: Path,
-    segments_records: list[SegmentRecord],
+    segments_records: Iterable[SegmentRecord],
 ) -> Path:
     """写入 segments.jsonl 文件（JSONL 格式，一行一个片段）
     
     Args:
         path: 输出文件路径
-        segments_records: 片段记录列表（必须按 start_sec 升序）
+        segments_records: 片段记录（列表或生成器，必须按 start_sec 升序）
     
     Returns:
         写入的文件路径
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(path, "w", encoding="utf-8") as f:
+    # 逐条编码并流式写入临时文件，完成后原子替换（不拼接整个文件内容，也不会留下半截文件）
+    encode = _JSONL_ENCODER.encode
+    count = 0
+    
+    def _lines():
+        nonlocal count
         for record in segments_records:
-            data = record.to_dict()
-            json_line = json.dumps(data, ensure_ascii=False)
-            f.write(json_line + "\n")
+            count += 1
+            yield encode(record.to_dict()) + "\n"
+    
+    write_lines_atomic(path, _lines())
     
-    logger.info(f"写入 {len(segments_records)} 个片段到 {path}")
+    logger.info("写入 %d 个片段到 %s", count, path)
     return path
-
@@ -1,6 +1,7 @@
 """任务数据结构定义"""
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -26,4 +27,13 @@ class SegJob:
             raise ValueError("audio_path 不能为空")
         if not self.out_dir:
             raise ValueError("out_dir 不能为空")
-
+    
+    @cached_property
+    def audio_path_abs(self) -> str:
+        """音频文件的绝对路径字符串（首次访问时 resolve，之后复用，避免每次都走 realpath）"""
+        return str(self.audio_path.resolve())
+    
+    @cached_property
+    def out_dir_abs(self) -> Path:
+        """输出目录的绝对路径（首次访问时 resolve，之后复用）"""
+        return self.out_dir.resolve()
@@ -1,42 +1,124 @@
 """输出布局规划和执行计划"""
 
-import json
+import contextlib
+import importlib.metadata
+import importlib.util
+import io
 import logging
+import os
+import platform
 import sys
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
-from onepass_audioclean_seg.audio.ffmpeg import which
+from onepass_audioclean_seg import __version__
+from onepass_audioclean_seg.audio.extract import extract_wav_segments_batch
+from onepass_audioclean_seg.audio.features import compute_rms_batch, rms_to_db
+from onepass_audioclean_seg.audio.ffmpeg import get_ffmpeg_version, get_ffprobe_version, which
 from onepass_audioclean_seg.audio.probe import get_audio_duration_sec
+from onepass_audioclean_seg.io.exports import (
+    export_mask_json,
+    export_segments_csv,
+    export_timeline_json,
+)
+from onepass_audioclean_seg.io.jsonfile import write_json_atomic
 from onepass_audioclean_seg.io.report import (
+    build_seg_report,
+    merge_seg_report_analysis,
+    merge_seg_report_segments,
     read_seg_report,
     update_seg_report_analysis,
     update_seg_report_segments,
-    write_seg_report,
 )
 from onepass_audioclean_seg.io.segments import SegmentRecord, write_segments_jsonl
 from onepass_audioclean_seg.pipeline.jobs import SegJob
+from onepass_audioclean_seg.pipeline.segment_flags import (
+    RawIndexLookup,
+    build_quality_info,
+    build_source_info,
+    compute_flags_batch,
+    track_postprocess_history,
+)
 from onepass_audioclean_seg.pipeline.segments_from_silence import (
+    SilenceNeighborLookup,
     apply_padding_and_clip,
-    complement_to_speech_segments,
     enforce_max_duration_by_split,
     enforce_min_duration_by_merge,
     merge_overlaps,
-    normalize_intervals,
 )
 from onepass_audioclean_seg.constants import DEFAULT_AUTO_STRATEGY_MAX_SPEECH_RATIO
 from onepass_audioclean_seg.strategies.base import AnalysisResult, SegmentStrategy
 from onepass_audioclean_seg.strategies.energy_rms import EnergyStrategy
-from onepass_audioclean_seg.strategies.silence_ffmpeg import (
-    SilenceInterval,
-    SilenceStrategy,
-)
+from onepass_audioclean_seg.strategies.silence_ffmpeg import SilenceStrategy
 from onepass_audioclean_seg.strategies.vad_webrtc import VadStrategy
+from onepass_audioclean_seg.validate import validate_segments_jsonl
 
 logger = logging.getLogger(__name__)
 
+# 单个 job 内同时运行的 WAV 导出 ffmpeg 进程数上限
+WAV_EXTRACT_MAX_WORKERS = 4
+
+
+def _read_git_commit() -> Optional[str]:
+    """读取当前目录 .git/HEAD 指向的 ref 中的 commit（简化实现，不依赖 gitpython）
+    
+    直接读取文件并以异常判断缺失，不做逐级 exists 检查；非 ref 形式的 HEAD 或读取失败时返回 None。
+    """
+    try:
+        git_dir = Path.cwd() / ".git"
+        head_content = (git_dir / "HEAD").read_text().strip()
+        if not head_content.startswith("ref: "):
+            return None
+        return (git_dir / head_content[5:]).read_text().strip()[:40]  # 取前40字符
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass
+class _JobOutcome:
+    """单个 job 的执行结果（可跨进程传递）"""
+    
+    job_stat: dict[str, Any]
+    executed: bool = False
+    analyzed: bool = False
+    emitted: bool = False
+    failure: Optional[dict[str, Any]] = None
+    has_error: bool = False
+    report_totals: Optional[dict[str, Any]] = None  # 本次写入 seg_report 的汇总数据
+
+
+@dataclass
+class _PostprocessStages:
+    """postprocess 各阶段的片段列表（供 flags 历史跟踪复用，无需重跑 pad/merge/min/max）"""
+    
+    merged: list[tuple[float, float]]  # pad + merge_overlaps 之后
+    min_merged: list[tuple[float, float]]  # enforce_min_duration_by_merge 之后
+    final: list[tuple[float, float]]  # enforce_max_duration_by_split 之后（按 start 升序，round(3)）
+
+
+@dataclass(frozen=True, slots=True)
+class _AutoStrategyConfig:
+    """auto-strategy 参数（一次运行中只从 params 解析一次，随 planner 传给子进程）"""
+    
+    order: tuple[str, ...]
+    min_segments: int
+    min_speech_total_sec: float
+    max_speech_ratio: float
+    
+    @classmethod
+    def from_params(cls, params: dict[str, Any]) -> "_AutoStrategyConfig":
+        strategy_order_str = params.get("auto_strategy_order", "silence,vad,energy")
+        return cls(
+            order=tuple(s.strip() for s in strategy_order_str.split(",")),
+            min_segments=params.get("auto_strategy_min_segments", 2),
+            min_speech_total_sec=params.get("auto_strategy_min_speech_total_sec", 3.0),
+            max_speech_ratio=params.get("auto_strategy_max_speech_ratio", DEFAULT_AUTO_STRATEGY_MAX_SPEECH_RATIO),
+        )
+
 
 class SegmentPlanner:
     """分段计划器：处理输出布局、dry-run 输出、写入报告、静音分析"""
@@ -81,6 +163,19 @@ class SegmentPlanner:
         self.started_at = datetime.now().isoformat()
         self.has_any_error = False  # 记录是否有任何错误
         self._current_config_hash: Optional[str] = None  # R11: 当前配置哈希
+        self._created_dirs: set[Path] = set()  # 本次运行中已确认存在的目录
+        self._tool_paths: dict[str, Optional[str]] = {}  # 惰性解析的 ffmpeg/ffprobe 路径（含未找到的 None）
+        self._duration_cache: dict[Path, float] = {}  # audio_path -> 已得到的音频时长
+        # (job_id, strategy) -> 本次运行中 analyze 阶段的结果，供 emit 阶段直接复用
+        self._analysis_results: dict[tuple[str, str], AnalysisResult] = {}
+        # job_id -> 本次运行写入 seg_report.json 的汇总数据，供 run_summary 直接使用
+        self._report_totals: dict[str, dict[str, Any]] = {}
+        # job_id -> 执行中 job 的 seg_report（内存中累积，job 结束时一次性写盘）
+        self._job_reports: dict[str, dict[str, Any]] = {}
+        # job_id -> 所有 job 结束后读到的 seg_report.json（run_summary / run_manifest 共用）
+        self._final_reports: dict[str, Optional[dict[str, Any]]] = {}
+        self._auto_strategy_config: Optional[_AutoStrategyConfig] = None  # 由 plan_and_execute 解析
+        self._wav_extract_workers = 1  # 单个 job 内并发导出 WAV 的 ffmpeg 进程数（由 plan_and_execute 设定）
     
     def plan_and_execute(
         self,
@@ -111,13 +206,19 @@ class SegmentPlanner:
         jobs_failed: list[dict[str, Any]] = []
         jobs_skipped = 0
         
+        # --jobs > 1 时，未跳过的 job 交给进程池并行执行（dry-run 只打印计划，始终串行）
+        max_workers = 1 if self.dry_run else min(self._resolve_worker_count(params.get("jobs", 1)), len(jobs))
+        # (job_stats 中的占位下标, job, 排在该 job 之前的 SKIP 行)
+        pending: list[tuple[int, SegJob, str]] = []
+        if params.get("auto_strategy", False):
+            self._auto_strategy_config = _AutoStrategyConfig.from_params(params)
+        # job 已经并行时每个 job 内串行导出 WAV，避免 ffmpeg 进程数成倍增长
+        self._wav_extract_workers = 1 if max_workers > 1 else min(WAV_EXTRACT_MAX_WORKERS, os.cpu_count() or 1)
+        outcomes: list[tuple[int, _JobOutcome]] = []
+        # 连续跳过的 job 的 SKIP 行先攒起来，在下一个 job 输出前（或全部 job 结束时）一次写出
+        skip_lines: list[str] = []
+        
         for job in jobs:
-            job_stat = {
-                "job_id": job.job_id,
-                "status": "pending",
-                "error": None,
-            }
-            
             # 检查是否跳过（如果 overwrite=False 且输出已存在）
             # 对于 emit_segments，检查 segments.jsonl；对于 analyze，检查 silences.json
             skip_file = None
@@ -128,74 +229,69 @@ class SegmentPlanner:
             
             if skip_file and not self.overwrite and skip_file.exists():
                 warnings_str = f" warnings={len(job.warnings)}" if job.warnings else ""
-                print(f"SKIP {job.job_id} audio={job.audio_path} out={job.out_dir}{warnings_str}", file=sys.stdout)
+                skip_lines.append(f"SKIP {job.job_id} audio={job.audio_path} out={job.out_dir}{warnings_str}\n")
                 jobs_skipped += 1
-                job_stat["status"] = "skipped"
-                self.job_stats.append(job_stat)
+                self.job_stats.append({
+                    "job_id": job.job_id,
+                    "status": "skipped",
+                    "error": None,
+                })
                 continue
             
-            # 打印计划
-            self._print_plan(job)
+            slot = len(self.job_stats)
+            self.job_stats.append({})  # 占位，保持 job_stats 与输入顺序一致
+            if max_workers > 1:
+                pending.append((slot, job, "".join(skip_lines)))
+                skip_lines.clear()
+                continue
             
-            # 如果不是 dry-run，创建目录并写入最小报告
-            if not self.dry_run:
-                try:
-                    # R11: 从 plan_and_execute 的参数中获取 config_hash
-                    config_hash = getattr(self, "_current_config_hash", None)
-                    write_seg_report(
-                        out_dir=job.out_dir,
-                        params=params,
-                        audio_path=job.audio_path,
-                        meta_path=job.meta_path,
-                        config_hash=config_hash,
-                    )
-                    executed_count += 1
-                    
-                    # 如果启用 analyze，运行静音分析
-                    analyze_success = True
-                    if self.analyze:
-                        analyze_success = self._run_analyze(job, params)
-                        if analyze_success:
-                            jobs_analyzed += 1
-                            job_stat["status"] = "analyzed"
-                    
-                    # 如果启用 emit_segments，生成语音片段
-                    emit_success = True
-                    if self.emit_segments:
-                        emit_success = self._run_emit_segments(job, params)
-                        if emit_success:
-                            jobs_emitted += 1
-                            if job_stat["status"] == "pending":
-                                job_stat["status"] = "emitted"
-                    
-                    # 如果失败，记录错误
-                    if not analyze_success or not emit_success:
-                        job_stat["status"] = "failed"
-                        reasons = []
-                        if not analyze_success:
-                            reasons.append("analyze 失败")
-                        if not emit_success:
-                            reasons.append("emit_segments 失败")
-                        job_stat["error"] = "; ".join(reasons)
-                        jobs_failed.append({
-                            "job_id": job.job_id,
-                            "reason": job_stat["error"],
-                        })
-                        self.has_any_error = True
-                except Exception as e:
-                    logger.error(f"写入报告失败 {job.job_id}: {e}", exc_info=True)
-                    print(f"ERROR {job.job_id} failed to write report: {e}", file=sys.stderr)
-                    job_stat["status"] = "failed"
-                    job_stat["error"] = str(e)[:100]
-                    jobs_failed.append({
-                        "job_id": job.job_id,
-                        "reason": job_stat["error"],
-                    })
-            else:
+            if skip_lines:
+                self._write_stdout("".join(skip_lines))
+                skip_lines.clear()
+            # 打印计划并执行（stdout 按 job 缓冲，每个 job 结束后一次性写出）
+            outcomes.append((slot, self._execute_job_and_write(job, params)))
+        
+        if len(pending) > 1:
+            # 子进程的 stdout 被缓冲后按提交顺序输出，连同排在其前面的 SKIP 行一起写出，
+            # 保证与串行执行的输出顺序一致
+            pending_jobs = [job for _, job, _ in pending]
+            if params.get("emit_wav"):
+                # 在父进程中解析一次 ffmpeg 路径，随 self 一起传给子进程
+                self._get_ffmpeg()
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                results = executor.map(
+                    self._execute_job_buffered,
+                    pending_jobs,
+                    [params] * len(pending_jobs),
+                )
+                for (slot, _, skipped_output), (output, outcome) in zip(pending, results):
+                    self._write_stdout(skipped_output + output)
+                    outcomes.append((slot, outcome))
+        else:
+            for slot, job, skipped_output in pending:
+                self._write_stdout(skipped_output)
+                outcomes.append((slot, self._execute_job_and_write(job, params)))
+        
+        if skip_lines:
+            self._write_stdout("".join(skip_lines))
+        
+        for slot, outcome in outcomes:
+            self.job_stats[slot] = outcome.job_stat
+            if outcome.executed:
                 executed_count += 1
-                job_stat["status"] = "planned"
-            
-            self.job_stats.append(job_stat)
+            if outcome.analyzed:
+                jobs_analyzed += 1
+            if outcome.emitted:
+                jobs_emitted += 1
+            if outcome.failure is not None:
+                jobs_failed.append(outcome.failure)
+            if outcome.has_error:
+                self.has_any_error = True
+            if outcome.report_totals is not None:
+                self._report_totals[outcome.job_stat["job_id"]] = outcome.report_totals
+        
+        # run_summary.json 与 run_manifest.json 使用同一个结束时间
+        finished_at = datetime.now().isoformat()
         
         # 生成 run_summary.json
         self._write_run_summary(
@@ -206,6 +302,7 @@ class SegmentPlanner:
             jobs_emitted=jobs_emitted,
             jobs_failed=jobs_failed,
             jobs_skipped=jobs_skipped,
+            finished_at=finished_at,
         )
         
         # R11: 生成 run_manifest.json
@@ -215,10 +312,135 @@ class SegmentPlanner:
                 params=params,
                 effective_config=effective_config,
                 config_hash=config_hash,
+                finished_at=finished_at,
             )
         
         return executed_count
     
+    @staticmethod
+    def _resolve_worker_count(jobs_param: Any) -> int:
+        """解析 --jobs：0 表示自动使用全部 CPU 核数，否则按给定值（至少 1）"""
+        try:
+            requested = int(jobs_param)
+        except (TypeError, ValueError):
+            return 1
+        if requested == 0:
+            return os.cpu_count() or 1
+        return max(1, requested)
+    
+    def _execute_job(self, job: SegJob, params: dict[str, Any]) -> "_JobOutcome":
+        """执行单个 job：写入最小报告 → analyze → emit_segments
+        
+        Args:
+            job: 任务对象
+            params: 参数字典
+        
+        Returns:
+            _JobOutcome 对象（由调用方汇总到统计信息中）
+        """
+        outcome = _JobOutcome(job_stat={
+            "job_id": job.job_id,
+            "status": "pending",
+            "error": None,
+        })
+        job_stat = outcome.job_stat
+        
+        # 如果是 dry-run，只记录计划
+        if self.dry_run:
+            outcome.executed = True
+            job_stat["status"] = "planned"
+            return outcome
+        
+        # 创建目录并构建最小报告（analyze/emit 的结果在内存中合并，job 结束时只写一次 seg_report.json）
+        try:
+            # R11: 从 plan_and_execute 的参数中获取 config_hash
+            config_hash = getattr(self, "_current_config_hash", None)
+            report = build_seg_report(
+                params=params,
+                audio_path=job.audio_path,
+                meta_path=job.meta_path,
+                config_hash=config_hash,
+            )
+            self._ensure_dir(job.out_dir)
+            self._job_reports[job.job_id] = report
+            outcome.executed = True
+            # seg_report.json 将被重写为本次的报告，汇总数据随报告内容同步更新
+            outcome.report_totals = self._report_totals[job.job_id] = {
+                "speech_total_sec": 0.0,
+                "silences_total_sec": 0.0,
+                "exports_count": 0,
+                "strategy": "unknown",
+            }
+            
+            try:
+                # 如果启用 analyze，运行静音分析
+                analyze_success = True
+                if self.analyze:
+                    analyze_success = self._run_analyze(job, params)
+                    if analyze_success:
+                        outcome.analyzed = True
+                        job_stat["status"] = "analyzed"
+                
+                # 如果启用 emit_segments，生成语音片段
+                emit_success = True
+                if self.emit_segments:
+                    emit_success = self._run_emit_segments(job, params)
+                    if emit_success:
+                        outcome.emitted = True
+                        if job_stat["status"] == "pending":
+                            job_stat["status"] = "emitted"
+            finally:
+                # 无论成功与否都落盘（失败时也保留已完成阶段的信息）
+                self._job_reports.pop(job.job_id, None)
+                write_json_atomic(job.out_dir / "seg_report.json", report)
+            
+            # 如果失败，记录错误
+            if not analyze_success or not emit_success:
+                job_stat["status"] = "failed"
+                reasons = []
+                if not analyze_success:
+                    reasons.append("analyze 失败")
+                if not emit_success:
+                    reasons.append("emit_segments 失败")
+                job_stat["error"] = "; ".join(reasons)
+                outcome.failure = {
+                    "job_id": job.job_id,
+                    "reason": job_stat["error"],
+                }
+                outcome.has_error = True
+        except Exception as e:
+            logger.error("写入报告失败 %s: %s", job.job_id, e, exc_info=True)
+            print(f"ERROR {job.job_id} failed to write report: {e}", file=sys.stderr)
+            job_stat["status"] = "failed"
+            job_stat["error"] = str(e)[:100]
+            outcome.failure = {
+                "job_id": job.job_id,
+                "reason": job_stat["error"],
+            }
+        
+        return outcome
+    
+    def _execute_job_buffered(self, job: SegJob, params: dict[str, Any]) -> tuple[str, "_JobOutcome"]:
+        """打印计划并执行单个 job，捕获其 stdout 输出（子进程中由父进程按顺序打印）"""
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            self._print_plan(job)
+            outcome = self._execute_job(job, params)
+        return buffer.getvalue(), outcome
+    
+    def _execute_job_and_write(self, job: SegJob, params: dict[str, Any]) -> "_JobOutcome":
+        """串行执行单个 job，结束后一次性写出其 stdout 输出"""
+        output, outcome = self._execute_job_buffered(job, params)
+        self._write_stdout(output)
+        return outcome
+    
+    @staticmethod
+    def _write_stdout(output: str) -> None:
+        """写出一个 job 的全部 stdout 输出并 flush（每个 job 一次写入）"""
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+    
     def get_exit_code(self) -> int:
         """获取退出码
         
@@ -248,6 +470,58 @@ class SegmentPlanner:
         else:
             raise ValueError(f"不支持的策略: {strategy_name}")
     
+    def _get_tool(self, exe_name: str) -> Optional[str]:
+        """获取可执行文件路径（每个可执行文件在一次运行中只查找一次 PATH）"""
+        if exe_name not in self._tool_paths:
+            self._tool_paths[exe_name] = which(exe_name)
+        return self._tool_paths[exe_name]
+    
+    def _get_ffmpeg(self) -> Optional[str]:
+        """获取 ffmpeg 路径（一次运行中只查找一次 PATH）"""
+        return self._get_tool("ffmpeg")
+    
+    def _get_ffprobe(self) -> Optional[str]:
+        """获取 ffprobe 路径（一次运行中只查找一次 PATH）"""
+        return self._get_tool("ffprobe")
+    
+    def _analyze(self, strategy: SegmentStrategy, job: SegJob, params: dict[str, Any]) -> AnalysisResult:
+        """运行策略分析，并在同一音频的多次分析之间复用已得到的时长
+        
+        同一 job 可能被分析多次（analyze + emit、auto-strategy 依次尝试多个策略），
+        首次分析得到的 duration_sec 通过 params["duration_sec_hint"] 传给后续策略，
+        避免重复读取 meta.json 或调用 ffprobe；已解析的 ffmpeg/ffprobe 路径通过
+        params["ffmpeg_path_hint"] / params["ffprobe_path_hint"] 传入，策略无需每次分析都查找 PATH。
+        """
+        hints: dict[str, Any] = {}
+        cached_duration = self._duration_cache.get(job.audio_path)
+        if cached_duration is not None:
+            hints["duration_sec_hint"] = cached_duration
+        ffmpeg_path = self._get_ffmpeg()
+        if ffmpeg_path is not None:
+            hints["ffmpeg_path_hint"] = ffmpeg_path
+        ffprobe_path = self._get_ffprobe()
+        if ffprobe_path is not None:
+            hints["ffprobe_path_hint"] = ffprobe_path
+        if hints:
+            params = {**params, **hints}
+        
+        result = strategy.analyze(job, params)
+        if result.duration_sec:
+            self._duration_cache[job.audio_path] = result.duration_sec
+        return result
+    
+    def _record_report_totals(self, job: SegJob, **totals: Any) -> None:
+        """记录刚写入 seg_report.json 的汇总数据（与报告内容保持一致）"""
+        job_totals = self._report_totals.get(job.job_id)
+        if job_totals is not None:
+            job_totals.update(totals)
+    
+    def _ensure_dir(self, path: Path) -> None:
+        """确保目录存在（同一目录在一次运行中只 mkdir 一次）"""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+    
     def _run_analyze(self, job: SegJob, params: dict[str, Any]) -> bool:
         """运行分析（使用策略接口）
         
@@ -259,17 +533,22 @@ class SegmentPlanner:
         
         try:
             # 确保 out_dir 存在
-            job.out_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(job.out_dir)
             
             # 获取策略实例
             strategy = self._get_strategy(strategy_name)
             
             # 运行分析
-            result = strategy.analyze(job, params)
+            result = self._analyze(strategy, job, params)
+            if self.emit_segments and not params.get("auto_strategy", False):
+                # 保留在内存中，emit 阶段无需再读回 artifact
+                self._analysis_results[(job.job_id, strategy_name)] = result
             
             # 更新 seg_report.json（按策略区分）
             analysis_data = {strategy_name: result.stats}
-            update_seg_report_analysis(job.out_dir, analysis_data)
+            self._update_report_analysis(job, analysis_data)
+            if strategy_name == "silence":
+                self._record_report_totals(job, silences_total_sec=result.stats.get("silences_total_sec", 0.0))
             
             # 打印成功信息
             if strategy_name == "silence":
@@ -292,7 +571,7 @@ class SegmentPlanner:
             # 记录错误
             error_msg = str(e)[:100]  # 限制长度
             print(f"FAIL {job.job_id} error={error_msg}", file=sys.stdout)
-            logger.error(f"分析失败 {job.job_id}: {e}", exc_info=True)
+            logger.error("分析失败 %s: %s", job.job_id, e, exc_info=True)
             return False
     
     def _run_emit_segments(self, job: SegJob, params: dict[str, Any]) -> bool:
@@ -311,54 +590,31 @@ class SegmentPlanner:
         
         try:
             # 确保 out_dir 存在
-            job.out_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(job.out_dir)
             
             # 1. 获取策略实例并运行分析（如果 artifact 不存在则自动触发）
             strategy = self._get_strategy(strategy_name)
-            analysis_result: Optional[AnalysisResult] = None
             
-            # 尝试读取现有 artifact（兼容性）
-            artifact_path = None
-            if strategy_name == "silence":
-                artifact_path = job.out_dir / "silences.json"
-            elif strategy_name == "energy":
-                artifact_path = job.out_dir / "energy.json"
-            elif strategy_name == "vad":
-                artifact_path = job.out_dir / "vad.json"
+            # 优先复用同一次运行中 analyze 阶段的结果
+            analysis_result: Optional[AnalysisResult] = self._analysis_results.pop(
+                (job.job_id, strategy_name), None
+            )
             
-            if artifact_path and artifact_path.exists():
-                # 尝试从 artifact 重建 AnalysisResult（仅 silence 策略支持）
-                if strategy_name == "silence":
+            # 尝试从现有 artifact 重建（兼容性，如单独运行 emit 时），避免重新解码音频
+            if analysis_result is None and strategy.artifact_name:
+                artifact_path = job.out_dir / strategy.artifact_name
+                if artifact_path.exists():
                     try:
-                        with open(artifact_path, "r", encoding="utf-8") as f:
-                            silences_data = json.load(f)
-                        duration_sec = silences_data.get("duration_sec")
-                        if duration_sec:
-                            silence_intervals = [
-                                SilenceInterval(
-                                    start_sec=item["start_sec"],
-                                    end_sec=item["end_sec"],
-                                    duration_sec=item["duration_sec"],
-                                )
-                                for item in silences_data.get("silences", [])
-                            ]
-                            normalized_silences = normalize_intervals(silence_intervals, duration_sec)
-                            speech_segments_raw = complement_to_speech_segments(normalized_silences, duration_sec)
-                            analysis_result = AnalysisResult(
-                                strategy="silence",
-                                duration_sec=duration_sec,
-                                speech_segments_raw=speech_segments_raw,
-                                artifacts={"silences.json": artifact_path},
-                                stats=silences_data.get("params", {}),
-                            )
-                            logger.info(f"使用现有的 {artifact_path.name}")
+                        analysis_result = strategy.load_artifact(artifact_path, job, params)
+                        if analysis_result is not None:
+                            logger.info("使用现有的 %s", artifact_path.name)
                     except Exception as e:
-                        logger.warning(f"读取现有 artifact 失败: {e}，将重新分析")
+                        logger.warning("读取现有 artifact 失败: %s，将重新分析", e)
             
             # 如果无法从 artifact 重建，运行分析
             if analysis_result is None:
-                logger.info(f"运行策略分析: {strategy_name}")
-                analysis_result = strategy.analyze(job, params)
+                logger.info("运行策略分析: %s", strategy_name)
+                analysis_result = self._analyze(strategy, job, params)
             
             # 2. 获取 duration_sec
             duration_sec = analysis_result.duration_sec
@@ -376,36 +632,30 @@ class SegmentPlanner:
             # 8. R6: 通过合并短段来强制最小时长
             min_seg_sec = params.get("min_seg_sec", 1.0)
             max_seg_sec = params.get("max_seg_sec", 25.0)
-            # R10: 跟踪 merge 操作
-            segments_before_merge = merged_segments.copy()
-            merged_segments = enforce_min_duration_by_merge(merged_segments, min_seg_sec, max_seg_sec)
-            from onepass_audioclean_seg.pipeline.segment_flags import track_postprocess_history
-            merge_flags_map = track_postprocess_history(segments_before_merge, merged_segments, "merge")
+            # R10: 跟踪 merge 操作（enforce_* 返回新列表、不修改输入，无需先复制）
+            min_merged_segments = enforce_min_duration_by_merge(merged_segments, min_seg_sec, max_seg_sec)
+            merge_flags_map = track_postprocess_history(merged_segments, min_merged_segments, "merge")
             
             # 9. R6: 通过切分超长段来强制最大时长
             split_strategy = params.get("split_strategy", "equal")
             # R10: 跟踪 split 操作
-            segments_before_split = merged_segments.copy()
-            final_segments = enforce_max_duration_by_split(merged_segments, max_seg_sec, min_seg_sec, split_strategy)
-            split_flags_map = track_postprocess_history(segments_before_split, final_segments, "split")
+            final_segments = enforce_max_duration_by_split(min_merged_segments, max_seg_sec, min_seg_sec, split_strategy)
+            split_flags_map = track_postprocess_history(min_merged_segments, final_segments, "split")
             
-            # 最终排序和 round(3)
-            final_segments = sorted(final_segments, key=lambda x: x[0])
-            final_segments = [(round(s, 3), round(e, 3)) for s, e in final_segments]
+            # enforce_max_duration_by_split 的输出已按 start 升序且 round(3)，无需再次排序
             
-            # R10: 合并所有 flags
-            all_flags_map: dict[tuple[float, float], list[str]] = {}
-            for seg in final_segments:
-                flags = []
-                if seg in split_flags_map:
-                    flags.extend(split_flags_map[seg])
-                if seg in merge_flags_map:
-                    flags.extend(merge_flags_map[seg])
-                all_flags_map[seg] = flags
+            # R10: 合并所有 flags（按下标与 final_segments 对齐，循环中无需再哈希 (start, end)）
+            all_flags = [
+                split_flags_map.get(seg, []) + merge_flags_map.get(seg, [])
+                for seg in final_segments
+            ]
             
             # 10. R6: 构建 SegmentRecord 列表（计算 pre_silence_sec、post_silence_sec、rms、energy_db）
             segments_records = []
-            audio_path_abs = str(job.audio_path.resolve())
+            # 统计量在构建记录时顺带累计，避免写完后再多次遍历 segments_records
+            speech_total_sec = 0.0
+            rms_computed = False
+            audio_path_abs = job.audio_path_abs
             emit_wav = params.get("emit_wav", False)
             overwrite = params.get("overwrite", False)
             warnings_list = []
@@ -414,78 +664,58 @@ class SegmentPlanner:
             wav_dir = None
             if emit_wav:
                 wav_dir = job.out_dir / "segments"
-                wav_dir.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(wav_dir)
             
             if not final_segments:
-                logger.warning(f"规整后没有剩余片段")
+                logger.warning("规整后没有剩余片段")
                 # 仍然写入空的 segments.jsonl 和更新报告
             else:
                 
                 # 获取 ffmpeg 路径（用于 WAV 导出）
                 ffmpeg_path = None
                 if emit_wav:
-                    from onepass_audioclean_seg.audio.ffmpeg import which
-                    ffmpeg_path = which("ffmpeg")
+                    ffmpeg_path = self._get_ffmpeg()
                     if ffmpeg_path is None:
                         warnings_list.append("ffmpeg 未找到，无法导出 WAV 文件")
                         emit_wav = False
                 
+                # R6: 只打开一次音频，批量计算所有片段的 RMS
+                rms_values = compute_rms_batch(job.audio_path, final_segments)
+                wav_tasks: list[tuple[str, Path, float, float]] = []  # (seg_id, wav_path, start, end)
+                
+                # 前后静音时长（仅 silence 策略），循环前对所有片段一次性查找
+                pre_silence_values = post_silence_values = [0.0] * len(final_segments)
+                if strategy_name == "silence" and analysis_result.nonspeech_segments_raw:
+                    silence_lookup = SilenceNeighborLookup(analysis_result.nonspeech_segments_raw)
+                    pre_silence_values, post_silence_values = silence_lookup.lookup_segments(final_segments)
+                
+                low_energy_rms_threshold = params.get("low_energy_rms_threshold", 0.01)
+                flags_values = compute_flags_batch(
+                    final_segments,
+                    duration_sec,
+                    rms_values,
+                    low_energy_rms_threshold,
+                    history_flags=all_flags,
+                )
+                raw_index_lookup = RawIndexLookup(speech_segments)
                 for idx, (start, end) in enumerate(final_segments, start=1):
                     seg_id = f"seg_{idx:06d}"
                     duration = end - start
                     
-                    # 计算 pre_silence_sec 和 post_silence_sec（仅 silence 策略支持）
-                    pre_silence_sec = 0.0
-                    post_silence_sec = 0.0
+                    # pre_silence_sec 和 post_silence_sec（仅 silence 策略支持，已在循环前批量查找）
+                    pre_silence_sec = pre_silence_values[idx - 1]
+                    post_silence_sec = post_silence_values[idx - 1]
                     
-                    if strategy_name == "silence" and analysis_result.nonspeech_segments_raw:
-                        # 查找前一个静音区间
-                        for silence_start, silence_end in analysis_result.nonspeech_segments_raw:
-                            if abs(silence_end - start) <= 0.001:
-                                pre_silence_sec = silence_end - silence_start
-                                break
-                        
-                        # 查找后一个静音区间
-                        for silence_start, silence_end in analysis_result.nonspeech_segments_raw:
-                            if abs(silence_start - end) <= 0.001:
-                                post_silence_sec = silence_end - silence_start
-                                break
+                    # R6: 计算 energy_db（RMS 已在循环前批量计算）
+                    rms = rms_values[idx - 1]
+                    energy_db = rms_to_db(rms) if rms is not None else None
                     
-                    # R6: 计算 RMS 和 energy_db
-                    rms = None
-                    energy_db = None
-                    try:
-                        from onepass_audioclean_seg.audio.features import compute_rms, rms_to_db
-                        rms = compute_rms(job.audio_path, start, end)
-                        if rms is not None:
-                            energy_db = rms_to_db(rms)
-                    except Exception as e:
-                        logger.warning(f"计算 RMS 失败 {seg_id}: {e}")
-                        warnings_list.append(f"计算 RMS 失败 {seg_id}: {str(e)[:100]}")
-                    
-                    # R10: 计算 flags
-                    low_energy_rms_threshold = params.get("low_energy_rms_threshold", 0.01)
-                    history_flags = all_flags_map.get((start, end), [])
-                    from onepass_audioclean_seg.pipeline.segment_flags import (
-                        compute_flags_for_segment,
-                        build_source_info,
-                        build_quality_info,
-                    )
-                    flags = compute_flags_for_segment(
-                        segment=(start, end),
-                        duration_sec=duration_sec,
-                        rms=rms,
-                        low_energy_rms_threshold=low_energy_rms_threshold,
-                        history_flags=history_flags,
-                    )
+                    # R10: flags（已在循环前批量计算）
+                    flags = flags_values[idx - 1]
                     
                     # R10: 构建 source 信息
-                    # 尝试找到在 speech_segments_raw 中的原始索引
-                    raw_index = None
-                    for idx, (raw_start, raw_end) in enumerate(speech_segments):
-                        if abs(raw_start - start) < 0.01 and abs(raw_end - end) < 0.01:
-                            raw_index = idx
-                            break
+                    # 在 speech_segments_raw 中的原始索引（循环前已建立哈希索引）
+                    raw_index = raw_index_lookup.find(start, end)
                     source = build_source_info(
                         strategy=strategy_name,
                         auto_chosen=False,
@@ -495,29 +725,17 @@ class SegmentPlanner:
                     # R10: 构建 quality 信息
                     quality = build_quality_info(rms=rms, energy_db=energy_db)
                     
-                    # R6: 导出 WAV 文件（如果启用）
+                    # R6: 记录待导出的 WAV（循环结束后批量提取）
                     notes = None
                     if emit_wav and wav_dir:
                         wav_path = wav_dir / f"{seg_id}.wav"
                         
                         # 检查是否已存在且不需要覆盖
                         if not overwrite and wav_path.exists():
-                            logger.debug(f"跳过已存在的 WAV 文件: {wav_path}")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("跳过已存在的 WAV 文件: %s", wav_path)
                         else:
-                            try:
-                                from onepass_audioclean_seg.audio.extract import extract_wav_segment
-                                success = extract_wav_segment(
-                                    job.audio_path,
-                                    wav_path,
-                                    start,
-                                    end,
-                                    ffmpeg_path,
-                                )
-                                if not success:
-                                    warnings_list.append(f"导出 WAV 失败 {seg_id}")
-                            except Exception as e:
-                                logger.warning(f"导出 WAV 失败 {seg_id}: {e}")
-                                warnings_list.append(f"导出 WAV 失败 {seg_id}: {str(e)[:100]}")
+                            wav_tasks.append((seg_id, wav_path, start, end))
                     
                     record = SegmentRecord(
                         id=seg_id,
@@ -537,62 +755,42 @@ class SegmentPlanner:
                         quality=quality,
                     )
                     segments_records.append(record)
+                    speech_total_sec += record.duration_sec
+                    if rms is not None:
+                        rms_computed = True
+                
+                # R6: 一个 ffmpeg 进程批量导出 WAV（失败的批次回退为逐段提取）
+                if wav_tasks:
+                    try:
+                        wav_results = extract_wav_segments_batch(
+                            job.audio_path,
+                            [(wav_path, start, end) for _, wav_path, start, end in wav_tasks],
+                            ffmpeg_path,
+                            max_workers=self._wav_extract_workers,
+                        )
+                        for (seg_id, _, _, _), success in zip(wav_tasks, wav_results):
+                            if not success:
+                                warnings_list.append(f"导出 WAV 失败 {seg_id}")
+                    except Exception as e:
+                        logger.warning("导出 WAV 失败: %s", e)
+                        warnings_list.append(f"导出 WAV 失败: {str(e)[:100]}")
             
             # 9. 写入 segments.jsonl
             segments_path = job.out_dir / "segments.jsonl"
+            # 输出目录的绝对路径缓存在 job 上，后续路径都基于它拼接
+            out_dir_abs = job.out_dir_abs
             write_segments_jsonl(segments_path, segments_records)
             
             # R10: 导出可视化友好文件
-            exports = {}
-            if self.export_timeline:
-                from onepass_audioclean_seg.io.exports import export_timeline_json
-                from onepass_audioclean_seg.io.report import read_seg_report
-                report = read_seg_report(job.out_dir / "seg_report.json")
-                auto_strategy = report.get("auto_strategy") if report else None
-                timeline_path = export_timeline_json(
-                    out_dir=job.out_dir,
-                    segments_records=segments_records,
-                    audio_path=job.audio_path,
-                    duration_sec=duration_sec,
-                    strategy=strategy_name,
-                    auto_strategy=auto_strategy,
-                    params=params,
-                )
-                exports["timeline_json"] = str(timeline_path.resolve())
-            
-            if self.export_csv:
-                from onepass_audioclean_seg.io.exports import export_segments_csv
-                csv_path = export_segments_csv(
-                    out_dir=job.out_dir,
-                    segments_records=segments_records,
-                )
-                exports["segments_csv"] = str(csv_path.resolve())
-            
-            if self.export_mask != "none":
-                from onepass_audioclean_seg.io.exports import export_mask_json
-                mask_strategy = self.export_mask
-                if mask_strategy == "auto":
-                    mask_strategy = strategy_name
-                mask_path = export_mask_json(
-                    out_dir=job.out_dir,
-                    duration_sec=duration_sec,
-                    strategy=mask_strategy,
-                    bin_ms=self.mask_bin_ms,
-                    analysis_result=analysis_result,
-                    segments_records=segments_records,
-                )
-                if mask_path:
-                    exports["mask_json"] = str(mask_path.resolve())
+            exports = self._write_exports(
+                job, segments_records, duration_sec, strategy_name, analysis_result, params
+            )
             
             # 10. 如果启用 validate_output，立即验证
             if self.validate_output:
                 self._validate_job_output(job, segments_path)
             
             # 11. R6: 更新 seg_report.json（包含新的统计信息）
-            speech_total_sec = sum(record.duration_sec for record in segments_records)
-            min_duration = min((r.duration_sec for r in segments_records), default=0.0)
-            max_duration = max((r.duration_sec for r in segments_records), default=0.0)
-            
             segments_report_data = {
                 "count": len(segments_records),
                 "speech_total_sec": round(speech_total_sec, 3),
@@ -602,7 +800,7 @@ class SegmentPlanner:
                 "merge_overlaps": True,
                 "min_merge": True,
                 "max_split": split_strategy,
-                "rms_computed": any(r.rms is not None for r in segments_records),
+                "rms_computed": rms_computed,
                 "strategy": strategy_name,
             }
             
@@ -611,29 +809,35 @@ class SegmentPlanner:
                 segments_report_data["warnings"] = warnings_list
             
             outputs = {
-                "segments_jsonl": str((job.out_dir / "segments.jsonl").resolve()),
+                "segments_jsonl": str(out_dir_abs / "segments.jsonl"),
             }
             # 根据策略添加 artifact
             if strategy_name == "silence":
                 silences_path = job.out_dir / "silences.json"
                 if silences_path.exists():
-                    outputs["silences_json"] = str(silences_path.resolve())
+                    outputs["silences_json"] = str(out_dir_abs / "silences.json")
             elif strategy_name == "energy":
                 energy_path = job.out_dir / "energy.json"
                 if energy_path.exists():
-                    outputs["energy_json"] = str(energy_path.resolve())
+                    outputs["energy_json"] = str(out_dir_abs / "energy.json")
             elif strategy_name == "vad":
                 vad_path = job.out_dir / "vad.json"
                 if vad_path.exists():
-                    outputs["vad_json"] = str(vad_path.resolve())
+                    outputs["vad_json"] = str(out_dir_abs / "vad.json")
             if wav_dir and wav_dir.exists():
-                outputs["segments_wav_dir"] = str(wav_dir.resolve())
+                outputs["segments_wav_dir"] = str(out_dir_abs / "segments")
             # R10: 添加 exports
             if exports:
                 outputs["exports"] = exports
             segments_report_data["outputs"] = outputs
             
-            update_seg_report_segments(job.out_dir, segments_report_data, audio_path=job.audio_path)
+            self._update_report_segments(job, segments_report_data)
+            self._record_report_totals(
+                job,
+                speech_total_sec=segments_report_data["speech_total_sec"],
+                exports_count=len(exports),
+                strategy=segments_report_data["strategy"],
+            )
             
             # 11. 打印成功信息
             print(f"EMIT {job.job_id} segments={len(segments_records)} out={job.out_dir}", file=sys.stdout)
@@ -643,7 +847,7 @@ class SegmentPlanner:
             # 记录错误
             error_msg = str(e)[:100]  # 限制长度
             print(f"FAIL {job.job_id} error={error_msg}", file=sys.stdout)
-            logger.error(f"生成片段失败 {job.job_id}: {e}", exc_info=True)
+            logger.error("生成片段失败 %s: %s", job.job_id, e, exc_info=True)
             return False
     
     def _run_auto_strategy_emit_segments(self, job: SegJob, params: dict[str, Any]) -> bool:
@@ -653,16 +857,14 @@ class SegmentPlanner:
             job: 任务对象
             params: 参数字典
         """
-        # 获取参数
-        strategy_order_str = params.get("auto_strategy_order", "silence,vad,energy")
-        strategy_order = [s.strip() for s in strategy_order_str.split(",")]
-        min_segments = params.get("auto_strategy_min_segments", 2)
-        min_speech_total_sec = params.get("auto_strategy_min_speech_total_sec", 3.0)
-        max_speech_ratio = params.get("auto_strategy_max_speech_ratio", DEFAULT_AUTO_STRATEGY_MAX_SPEECH_RATIO)
+        # 获取参数（plan_and_execute 已解析时直接复用）
+        config = self._auto_strategy_config or _AutoStrategyConfig.from_params(params)
+        strategy_order = list(config.order)
         
         attempts = []
         chosen_strategy = None
         chosen_result = None
+        chosen_stages: Optional[_PostprocessStages] = None
         
         # 依次尝试每个策略
         for strategy_name in strategy_order:
@@ -676,14 +878,15 @@ class SegmentPlanner:
             try:
                 # 尝试运行策略
                 strategy = self._get_strategy(strategy_name)
-                analysis_result = strategy.analyze(job, params)
+                analysis_result = self._analyze(strategy, job, params)
                 
-                # 运行 postprocess 得到最终 segments
-                final_segments = self._postprocess_segments(
+                # 运行 postprocess 得到最终 segments（各阶段结果保留给选中的策略复用）
+                stages = self._postprocess_segments(
                     analysis_result.speech_segments_raw,
                     analysis_result.duration_sec,
                     params,
                 )
+                final_segments = stages.final
                 
                 # 评估质量
                 speech_total_sec = sum(e - s for s, e in final_segments)
@@ -692,17 +895,18 @@ class SegmentPlanner:
                 
                 # 质量门槛判断
                 reason = None
-                if segments_count < min_segments:
+                if segments_count < config.min_segments:
                     reason = "too_few_segments"
-                elif speech_total_sec < min_speech_total_sec:
+                elif speech_total_sec < config.min_speech_total_sec:
                     reason = "too_short_speech"
-                elif speech_ratio >= max_speech_ratio:
+                elif speech_ratio >= config.max_speech_ratio:
                     reason = "full_span"
                 
                 if reason is None:
                     # 通过质量门槛，使用该策略
                     chosen_strategy = strategy_name
                     chosen_result = analysis_result
+                    chosen_stages = stages
                     attempt_info["ok"] = True
                     attempt_info["stats"] = {
                         "segments_count": segments_count,
@@ -731,7 +935,7 @@ class SegmentPlanner:
                 attempt_info["reason"] = "error"
                 attempt_info["error"] = str(e)[:100]
                 attempts.append(attempt_info)
-                logger.warning(f"策略 {strategy_name} 尝试失败: {e}")
+                logger.warning("策略 %s 尝试失败: %s", strategy_name, e)
         
         # 如果所有策略都失败
         if chosen_strategy is None:
@@ -742,61 +946,47 @@ class SegmentPlanner:
                 "chosen": None,
                 "attempts": attempts,
             }
-            self._update_seg_report_auto_strategy(job.out_dir, auto_strategy_data)
+            self._update_report_auto_strategy(job, auto_strategy_data)
             
             error_msg = "所有策略都未通过质量门槛"
             print(f"FAIL {job.job_id} error={error_msg}", file=sys.stdout)
-            logger.error(f"Auto-strategy 失败 {job.job_id}: {error_msg}")
+            logger.error("Auto-strategy 失败 %s: %s", job.job_id, error_msg)
             return False
         
         # 使用选中的策略生成最终输出
-        params_with_chosen_strategy = params.copy()
-        params_with_chosen_strategy["strategy"] = chosen_strategy
-        
         # 调用单策略版本的 _run_emit_segments（但跳过 auto-strategy 检查）
         try:
-            job.out_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(job.out_dir)
             strategy = self._get_strategy(chosen_strategy)
             analysis_result = chosen_result
             
-            # 运行 postprocess 并生成输出（复用现有逻辑）
+            # 复用质量评估时的 postprocess 结果，不再重跑 pad/merge/min/max
             duration_sec = analysis_result.duration_sec
             speech_segments = analysis_result.speech_segments_raw
             
             pad_sec = params.get("pad_sec", 0.1)
-            padded_segments = apply_padding_and_clip(speech_segments, pad_sec, duration_sec)
-            merged_segments = merge_overlaps(padded_segments, gap_merge_sec=0.0, overlap_tolerance=1e-3)
-            
             min_seg_sec = params.get("min_seg_sec", 1.0)
             max_seg_sec = params.get("max_seg_sec", 25.0)
-            # R10: 跟踪 merge 操作
-            segments_before_merge = merged_segments.copy()
-            merged_segments = enforce_min_duration_by_merge(merged_segments, min_seg_sec, max_seg_sec)
-            from onepass_audioclean_seg.pipeline.segment_flags import track_postprocess_history
-            merge_flags_map = track_postprocess_history(segments_before_merge, merged_segments, "merge")
-            
             split_strategy = params.get("split_strategy", "equal")
-            # R10: 跟踪 split 操作
-            segments_before_split = merged_segments.copy()
-            final_segments = enforce_max_duration_by_split(merged_segments, max_seg_sec, min_seg_sec, split_strategy)
-            split_flags_map = track_postprocess_history(segments_before_split, final_segments, "split")
+            # R10: 跟踪 merge / split 操作
+            merge_flags_map = track_postprocess_history(chosen_stages.merged, chosen_stages.min_merged, "merge")
+            final_segments = chosen_stages.final
+            split_flags_map = track_postprocess_history(chosen_stages.min_merged, final_segments, "split")
             
-            final_segments = sorted(final_segments, key=lambda x: x[0])
-            final_segments = [(round(s, 3), round(e, 3)) for s, e in final_segments]
+            # enforce_max_duration_by_split 的输出已按 start 升序且 round(3)，无需再次排序
             
-            # R10: 合并所有 flags
-            all_flags_map: dict[tuple[float, float], list[str]] = {}
-            for seg in final_segments:
-                flags = []
-                if seg in split_flags_map:
-                    flags.extend(split_flags_map[seg])
-                if seg in merge_flags_map:
-                    flags.extend(merge_flags_map[seg])
-                all_flags_map[seg] = flags
+            # R10: 合并所有 flags（按下标与 final_segments 对齐，循环中无需再哈希 (start, end)）
+            all_flags = [
+                split_flags_map.get(seg, []) + merge_flags_map.get(seg, [])
+                for seg in final_segments
+            ]
             
             # 构建 SegmentRecord 列表（复用现有逻辑）
             segments_records = []
-            audio_path_abs = str(job.audio_path.resolve())
+            # 统计量在构建记录时顺带累计，避免写完后再多次遍历 segments_records
+            speech_total_sec = 0.0
+            rms_computed = False
+            audio_path_abs = job.audio_path_abs
             emit_wav = params.get("emit_wav", False)
             overwrite = params.get("overwrite", False)
             warnings_list = []
@@ -804,68 +994,51 @@ class SegmentPlanner:
             wav_dir = None
             if emit_wav:
                 wav_dir = job.out_dir / "segments"
-                wav_dir.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(wav_dir)
             
             if not final_segments:
-                logger.warning(f"规整后没有剩余片段")
+                logger.warning("规整后没有剩余片段")
             else:
                 ffmpeg_path = None
                 if emit_wav:
-                    from onepass_audioclean_seg.audio.ffmpeg import which
-                    ffmpeg_path = which("ffmpeg")
+                    ffmpeg_path = self._get_ffmpeg()
                     if ffmpeg_path is None:
                         warnings_list.append("ffmpeg 未找到，无法导出 WAV 文件")
                         emit_wav = False
                 
+                rms_values = compute_rms_batch(job.audio_path, final_segments)
+                wav_tasks: list[tuple[str, Path, float, float]] = []  # (seg_id, wav_path, start, end)
+                
+                pre_silence_values = post_silence_values = [0.0] * len(final_segments)
+                if chosen_strategy == "silence" and analysis_result.nonspeech_segments_raw:
+                    silence_lookup = SilenceNeighborLookup(analysis_result.nonspeech_segments_raw)
+                    pre_silence_values, post_silence_values = silence_lookup.lookup_segments(final_segments)
+                
+                low_energy_rms_threshold = params.get("low_energy_rms_threshold", 0.01)
+                flags_values = compute_flags_batch(
+                    final_segments,
+                    duration_sec,
+                    rms_values,
+                    low_energy_rms_threshold,
+                    history_flags=all_flags,
+                )
+                raw_index_lookup = RawIndexLookup(speech_segments)
                 for idx, (start, end) in enumerate(final_segments, start=1):
                     seg_id = f"seg_{idx:06d}"
                     duration = end - start
                     
-                    pre_silence_sec = 0.0
-                    post_silence_sec = 0.0
-                    if chosen_strategy == "silence" and analysis_result.nonspeech_segments_raw:
-                        for silence_start, silence_end in analysis_result.nonspeech_segments_raw:
-                            if abs(silence_end - start) <= 0.001:
-                                pre_silence_sec = silence_end - silence_start
-                                break
-                        for silence_start, silence_end in analysis_result.nonspeech_segments_raw:
-                            if abs(silence_start - end) <= 0.001:
-                                post_silence_sec = silence_end - silence_start
-                                break
+                    pre_silence_sec = pre_silence_values[idx - 1]
+                    post_silence_sec = post_silence_values[idx - 1]
                     
-                    rms = None
-                    energy_db = None
-                    try:
-                        from onepass_audioclean_seg.audio.features import compute_rms, rms_to_db
-                        rms = compute_rms(job.audio_path, start, end)
-                        if rms is not None:
-                            energy_db = rms_to_db(rms)
-                    except Exception as e:
-                        logger.warning(f"计算 RMS 失败 {seg_id}: {e}")
-                        warnings_list.append(f"计算 RMS 失败 {seg_id}: {str(e)[:100]}")
+                    rms = rms_values[idx - 1]
+                    energy_db = rms_to_db(rms) if rms is not None else None
                     
-                    # R10: 计算 flags
-                    low_energy_rms_threshold = params.get("low_energy_rms_threshold", 0.01)
-                    history_flags = all_flags_map.get((start, end), [])
-                    from onepass_audioclean_seg.pipeline.segment_flags import (
-                        compute_flags_for_segment,
-                        build_source_info,
-                        build_quality_info,
-                    )
-                    flags = compute_flags_for_segment(
-                        segment=(start, end),
-                        duration_sec=duration_sec,
-                        rms=rms,
-                        low_energy_rms_threshold=low_energy_rms_threshold,
-                        history_flags=history_flags,
-                    )
+                    # R10: flags（已在循环前批量计算）
+                    flags = flags_values[idx - 1]
                     
                     # R10: 构建 source 信息
-                    raw_index = None
-                    for idx, (raw_start, raw_end) in enumerate(speech_segments):
-                        if abs(raw_start - start) < 0.01 and abs(raw_end - end) < 0.01:
-                            raw_index = idx
-                            break
+                    # 在 speech_segments_raw 中的原始索引（循环前已建立哈希索引）
+                    raw_index = raw_index_lookup.find(start, end)
                     source = build_source_info(
                         strategy=chosen_strategy,
                         auto_chosen=True,
@@ -879,22 +1052,10 @@ class SegmentPlanner:
                     if emit_wav and wav_dir:
                         wav_path = wav_dir / f"{seg_id}.wav"
                         if not overwrite and wav_path.exists():
-                            logger.debug(f"跳过已存在的 WAV 文件: {wav_path}")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("跳过已存在的 WAV 文件: %s", wav_path)
                         else:
-                            try:
-                                from onepass_audioclean_seg.audio.extract import extract_wav_segment
-                                success = extract_wav_segment(
-                                    job.audio_path,
-                                    wav_path,
-                                    start,
-                                    end,
-                                    ffmpeg_path,
-                                )
-                                if not success:
-                                    warnings_list.append(f"导出 WAV 失败 {seg_id}")
-                            except Exception as e:
-                                logger.warning(f"导出 WAV 失败 {seg_id}: {e}")
-                                warnings_list.append(f"导出 WAV 失败 {seg_id}: {str(e)[:100]}")
+                            wav_tasks.append((seg_id, wav_path, start, end))
                     
                     record = SegmentRecord(
                         id=seg_id,
@@ -914,62 +1075,42 @@ class SegmentPlanner:
                         quality=quality,
                     )
                     segments_records.append(record)
+                    speech_total_sec += record.duration_sec
+                    if rms is not None:
+                        rms_computed = True
+                
+                # R6: 一个 ffmpeg 进程批量导出 WAV（失败的批次回退为逐段提取）
+                if wav_tasks:
+                    try:
+                        wav_results = extract_wav_segments_batch(
+                            job.audio_path,
+                            [(wav_path, start, end) for _, wav_path, start, end in wav_tasks],
+                            ffmpeg_path,
+                            max_workers=self._wav_extract_workers,
+                        )
+                        for (seg_id, _, _, _), success in zip(wav_tasks, wav_results):
+                            if not success:
+                                warnings_list.append(f"导出 WAV 失败 {seg_id}")
+                    except Exception as e:
+                        logger.warning("导出 WAV 失败: %s", e)
+                        warnings_list.append(f"导出 WAV 失败: {str(e)[:100]}")
             
             # 写入 segments.jsonl
             segments_path = job.out_dir / "segments.jsonl"
+            # 输出目录的绝对路径缓存在 job 上，后续路径都基于它拼接
+            out_dir_abs = job.out_dir_abs
             write_segments_jsonl(segments_path, segments_records)
             
             # R10: 导出可视化友好文件
-            exports = {}
-            if self.export_timeline:
-                from onepass_audioclean_seg.io.exports import export_timeline_json
-                from onepass_audioclean_seg.io.report import read_seg_report
-                report = read_seg_report(job.out_dir / "seg_report.json")
-                auto_strategy = report.get("auto_strategy") if report else None
-                timeline_path = export_timeline_json(
-                    out_dir=job.out_dir,
-                    segments_records=segments_records,
-                    audio_path=job.audio_path,
-                    duration_sec=duration_sec,
-                    strategy=chosen_strategy,
-                    auto_strategy=auto_strategy,
-                    params=params,
-                )
-                exports["timeline_json"] = str(timeline_path.resolve())
-            
-            if self.export_csv:
-                from onepass_audioclean_seg.io.exports import export_segments_csv
-                csv_path = export_segments_csv(
-                    out_dir=job.out_dir,
-                    segments_records=segments_records,
-                )
-                exports["segments_csv"] = str(csv_path.resolve())
-            
-            if self.export_mask != "none":
-                from onepass_audioclean_seg.io.exports import export_mask_json
-                mask_strategy = self.export_mask
-                if mask_strategy == "auto":
-                    mask_strategy = chosen_strategy
-                mask_path = export_mask_json(
-                    out_dir=job.out_dir,
-                    duration_sec=duration_sec,
-                    strategy=mask_strategy,
-                    bin_ms=self.mask_bin_ms,
-                    analysis_result=chosen_result,
-                    segments_records=segments_records,
-                )
-                if mask_path:
-                    exports["mask_json"] = str(mask_path.resolve())
+            exports = self._write_exports(
+                job, segments_records, duration_sec, chosen_strategy, chosen_result, params
+            )
             
             # 验证输出
             if self.validate_output:
                 self._validate_job_output(job, segments_path)
             
             # 更新报告
-            speech_total_sec = sum(record.duration_sec for record in segments_records)
-            min_duration = min((r.duration_sec for r in segments_records), default=0.0)
-            max_duration = max((r.duration_sec for r in segments_records), default=0.0)
-            
             segments_report_data = {
                 "count": len(segments_records),
                 "speech_total_sec": round(speech_total_sec, 3),
@@ -979,7 +1120,7 @@ class SegmentPlanner:
                 "merge_overlaps": True,
                 "min_merge": True,
                 "max_split": split_strategy,
-                "rms_computed": any(r.rms is not None for r in segments_records),
+                "rms_computed": rms_computed,
                 "strategy": chosen_strategy,
             }
             
@@ -987,28 +1128,34 @@ class SegmentPlanner:
                 segments_report_data["warnings"] = warnings_list
             
             outputs = {
-                "segments_jsonl": str(segments_path.resolve()),
+                "segments_jsonl": str(out_dir_abs / "segments.jsonl"),
             }
             if chosen_strategy == "silence":
                 silences_path = job.out_dir / "silences.json"
                 if silences_path.exists():
-                    outputs["silences_json"] = str(silences_path.resolve())
+                    outputs["silences_json"] = str(out_dir_abs / "silences.json")
             elif chosen_strategy == "energy":
                 energy_path = job.out_dir / "energy.json"
                 if energy_path.exists():
-                    outputs["energy_json"] = str(energy_path.resolve())
+                    outputs["energy_json"] = str(out_dir_abs / "energy.json")
             elif chosen_strategy == "vad":
                 vad_path = job.out_dir / "vad.json"
                 if vad_path.exists():
-                    outputs["vad_json"] = str(vad_path.resolve())
+                    outputs["vad_json"] = str(out_dir_abs / "vad.json")
             if wav_dir and wav_dir.exists():
-                outputs["segments_wav_dir"] = str(wav_dir.resolve())
+                outputs["segments_wav_dir"] = str(out_dir_abs / "segments")
             # R10: 添加 exports
             if exports:
                 outputs["exports"] = exports
             segments_report_data["outputs"] = outputs
             
-            update_seg_report_segments(job.out_dir, segments_report_data, audio_path=job.audio_path)
+            self._update_report_segments(job, segments_report_data)
+            self._record_report_totals(
+                job,
+                speech_total_sec=segments_report_data["speech_total_sec"],
+                exports_count=len(exports),
+                strategy=segments_report_data["strategy"],
+            )
             
             # 写入 auto-strategy 信息
             auto_strategy_data = {
@@ -1017,7 +1164,7 @@ class SegmentPlanner:
                 "chosen": chosen_strategy,
                 "attempts": attempts,
             }
-            self._update_seg_report_auto_strategy(job.out_dir, auto_strategy_data)
+            self._update_report_auto_strategy(job, auto_strategy_data)
             
             # 打印成功信息
             print(f"EMIT {job.job_id} segments={len(segments_records)} strategy={chosen_strategy} out={job.out_dir}", file=sys.stdout)
@@ -1026,7 +1173,7 @@ class SegmentPlanner:
         except Exception as e:
             error_msg = str(e)[:100]
             print(f"FAIL {job.job_id} error={error_msg}", file=sys.stdout)
-            logger.error(f"Auto-strategy 生成片段失败 {job.job_id}: {e}", exc_info=True)
+            logger.error("Auto-strategy 生成片段失败 %s: %s", job.job_id, e, exc_info=True)
             return False
     
     def _postprocess_segments(
@@ -1034,7 +1181,7 @@ class SegmentPlanner:
         speech_segments_raw: list[tuple[float, float]],
         duration_sec: float,
         params: dict[str, Any],
-    ) -> list[tuple[float, float]]:
+    ) -> _PostprocessStages:
         """对 speech_segments_raw 进行后处理（复用现有逻辑）
         
         Args:
@@ -1043,7 +1190,7 @@ class SegmentPlanner:
             params: 参数字典
         
         Returns:
-            后处理后的片段列表
+            各阶段的片段列表（final 为后处理后的片段列表）
         """
         pad_sec = params.get("pad_sec", 0.1)
         min_seg_sec = params.get("min_seg_sec", 1.0)
@@ -1051,16 +1198,121 @@ class SegmentPlanner:
         
         padded_segments = apply_padding_and_clip(speech_segments_raw, pad_sec, duration_sec)
         merged_segments = merge_overlaps(padded_segments, gap_merge_sec=0.0, overlap_tolerance=1e-3)
-        merged_segments = enforce_min_duration_by_merge(merged_segments, min_seg_sec, max_seg_sec)
+        min_merged_segments = enforce_min_duration_by_merge(merged_segments, min_seg_sec, max_seg_sec)
         split_strategy = params.get("split_strategy", "equal")
-        final_segments = enforce_max_duration_by_split(merged_segments, max_seg_sec, min_seg_sec, split_strategy)
-        final_segments = sorted(final_segments, key=lambda x: x[0])
-        final_segments = [(round(s, 3), round(e, 3)) for s, e in final_segments]
-        return final_segments
+        final_segments = enforce_max_duration_by_split(min_merged_segments, max_seg_sec, min_seg_sec, split_strategy)
+        # 输出已按 start 升序且 round(3)
+        return _PostprocessStages(merged=merged_segments, min_merged=min_merged_segments, final=final_segments)
     
-    def _update_seg_report_auto_strategy(self, out_dir: Path, auto_strategy_data: dict[str, Any]) -> None:
-        """更新 seg_report.json 的 auto_strategy 字段"""
-        report_path = out_dir / "seg_report.json"
+    def _write_exports(
+        self,
+        job: SegJob,
+        segments_records: list[SegmentRecord],
+        duration_sec: float,
+        strategy_name: str,
+        analysis_result: AnalysisResult,
+        params: dict[str, Any],
+    ) -> dict[str, str]:
+        """写入 R10 导出文件（timeline.json / segments.csv / mask.json）
+        
+        各导出文件互相独立，启用多个时用线程池并发写入，让一个文件的编码与另一个文件的落盘重叠。
+        
+        Returns:
+            导出文件的绝对路径字典（键顺序固定为 timeline_json、segments_csv、mask_json）
+        """
+        tasks: list[tuple[str, Any, dict[str, Any]]] = []
+        if self.export_timeline:
+            # 报告在提交任务前读取一次，导出线程中不访问报告
+            report = self._read_report(job)
+            auto_strategy = report.get("auto_strategy") if report else None
+            tasks.append((
+                "timeline_json",
+                export_timeline_json,
+                {
+                    "out_dir": job.out_dir,
+                    "segments_records": segments_records,
+                    "audio_path": job.audio_path,
+                    "duration_sec": duration_sec,
+                    "strategy": strategy_name,
+                    "auto_strategy": auto_strategy,
+                    "params": params,
+                },
+            ))
+        if self.export_csv:
+            tasks.append((
+                "segments_csv",
+                export_segments_csv,
+                {"out_dir": job.out_dir, "segments_records": segments_records},
+            ))
+        if self.export_mask != "none":
+            mask_strategy = self.export_mask
+            if mask_strategy == "auto":
+                mask_strategy = strategy_name
+            tasks.append((
+                "mask_json",
+                export_mask_json,
+                {
+                    "out_dir": job.out_dir,
+                    "duration_sec": duration_sec,
+                    "strategy": mask_strategy,
+                    "bin_ms": self.mask_bin_ms,
+                    "analysis_result": analysis_result,
+                    "segments_records": segments_records,
+                },
+            ))
+        
+        if len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = [executor.submit(func, **kwargs) for _, func, kwargs in tasks]
+                paths = [future.result() for future in futures]
+        else:
+            paths = [func(**kwargs) for _, func, kwargs in tasks]
+        
+        out_dir_abs = job.out_dir_abs
+        exports: dict[str, str] = {}
+        for (key, _, _), path in zip(tasks, paths):
+            # export_mask_json 在无法生成掩码时返回 None
+            if path:
+                exports[key] = str(out_dir_abs / path.name)
+        return exports
+    
+    def _read_report(self, job: SegJob) -> Optional[dict[str, Any]]:
+        """读取 job 的报告：执行中的 job 直接返回内存中的报告，否则读盘"""
+        report = self._job_reports.get(job.job_id)
+        if report is not None:
+            return report
+        return read_seg_report(job.out_dir / "seg_report.json")
+    
+    def _read_final_report(self, job: SegJob) -> Optional[dict[str, Any]]:
+        """读取 job 最终落盘的 seg_report.json（仅在所有 job 结束后调用，每个 job 只解析一次）"""
+        if job.job_id not in self._final_reports:
+            self._final_reports[job.job_id] = read_seg_report(job.out_dir / "seg_report.json")
+        return self._final_reports[job.job_id]
+    
+    def _update_report_analysis(self, job: SegJob, analysis_data: dict[str, Any]) -> None:
+        """更新报告的 analysis 字段（执行中的 job 只合并到内存，否则直接更新文件）"""
+        report = self._job_reports.get(job.job_id)
+        if report is None:
+            update_seg_report_analysis(job.out_dir, analysis_data)
+        else:
+            merge_seg_report_analysis(report, analysis_data)
+    
+    def _update_report_segments(self, job: SegJob, segments_data: dict[str, Any]) -> None:
+        """更新报告的 segments 字段（执行中的 job 只合并到内存，否则直接更新文件）"""
+        report = self._job_reports.get(job.job_id)
+        if report is None:
+            update_seg_report_segments(job.out_dir, segments_data, audio_path=job.audio_path)
+        else:
+            merge_seg_report_segments(report, segments_data, audio_path=job.audio_path)
+    
+    def _update_report_auto_strategy(self, job: SegJob, auto_strategy_data: dict[str, Any]) -> None:
+        """更新报告的 auto_strategy 字段（执行中的 job 只合并到内存，否则直接更新文件）"""
+        report = self._job_reports.get(job.job_id)
+        if report is not None:
+            report["auto_strategy"] = auto_strategy_data
+            return
+        
+        report_path = job.out_dir / "seg_report.json"
         existing_report = read_seg_report(report_path)
         
         if existing_report is None:
@@ -1071,8 +1323,7 @@ class SegmentPlanner:
         
         existing_report["auto_strategy"] = auto_strategy_data
         
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(existing_report, f, ensure_ascii=False, indent=2)
+        write_json_atomic(report_path, existing_report)
     
     def _print_plan(self, job: SegJob) -> None:
         """打印单个 job 的计划行"""
@@ -1092,8 +1343,6 @@ class SegmentPlanner:
             segments_path: segments.jsonl 文件路径
         """
         try:
-            from onepass_audioclean_seg.validate import validate_segments_jsonl
-            
             result = validate_segments_jsonl(segments_path, strict=False)
             
             errors_count = len(result.errors)
@@ -1112,10 +1361,29 @@ class SegmentPlanner:
                 for error in result.errors[:3]:
                     print(f"  VALIDATE ERROR: {error}", file=sys.stderr)
         except Exception as e:
-            logger.warning(f"验证输出失败 {job.job_id}: {e}", exc_info=True)
+            logger.warning("验证输出失败 %s: %s", job.job_id, e, exc_info=True)
             print(f"VALIDATE {job.job_id} ok=false errors=1 warnings=0 (验证过程异常: {str(e)[:50]})", file=sys.stdout)
             self.has_any_error = True
     
+    @staticmethod
+    def _compute_summary_dir(jobs: list[SegJob], params: dict[str, Any]) -> Path:
+        """确定 run_summary.json / run_manifest.json 的输出目录
+        
+        取所有 out_dir 父目录的最长公共路径；找不到（如绝对/相对路径混用）时使用第一个 job 的 out_dir 的父目录。
+        out_mode=out_root 且 out_dir 名称是 "seg" 时，使用父目录的父目录。
+        """
+        out_dirs = [job.out_dir for job in jobs]
+        try:
+            common_path = os.path.commonpath([str(out_dir.parent) for out_dir in out_dirs])
+        except ValueError:
+            common_path = ""
+        common_parent = Path(common_path) if common_path else out_dirs[0].parent
+        
+        out_mode = params.get("out_mode", "in_place")
+        if out_mode == "out_root" and out_dirs[0].name == "seg":
+            return common_parent.parent if common_parent.name != "seg" else common_parent
+        return common_parent
+    
     def _write_run_summary(
         self,
         jobs: list[SegJob],
@@ -1125,6 +1393,7 @@ class SegmentPlanner:
         jobs_emitted: int,
         jobs_failed: list[dict[str, Any]],
         jobs_skipped: int,
+        finished_at: Optional[str] = None,
     ) -> None:
         """写入 run_summary.json
         
@@ -1136,46 +1405,13 @@ class SegmentPlanner:
             jobs_emitted: 生成片段的任务数
             jobs_failed: 失败的任务列表
             jobs_skipped: 跳过的任务数
+            finished_at: 运行结束时间（ISO 格式，可选，默认取当前时间）
         """
         if not jobs:
             return
         
         # 确定输出目录
-        # 找到所有 jobs 的 out_dir 的共同父目录
-        out_dirs = [job.out_dir for job in jobs]
-        common_parent = out_dirs[0].parent
-        
-        # 如果所有 out_dir 都在同一个父目录下，使用该父目录
-        # 否则使用第一个 job 的 out_dir 的父目录
-        for out_dir in out_dirs[1:]:
-            try:
-                # 尝试找到共同父目录
-                if out_dir.parent != common_parent:
-                    # 如果不在同一个父目录，尝试找到更上层的共同目录
-                    common_parts = []
-                    parts1 = common_parent.parts
-                    parts2 = out_dir.parent.parts
-                    for p1, p2 in zip(parts1, parts2):
-                        if p1 == p2:
-                            common_parts.append(p1)
-                        else:
-                            break
-                    if common_parts:
-                        common_parent = Path(*common_parts)
-                    else:
-                        # 如果找不到共同目录，使用第一个 job 的 out_dir 的父目录
-                        common_parent = out_dirs[0].parent
-                        break
-            except Exception:
-                common_parent = out_dirs[0].parent
-                break
-        
-        # 如果 out_mode=out_root，且 out_dir 名称是 "seg"，则使用父目录的父目录
-        out_mode = params.get("out_mode", "in_place")
-        if out_mode == "out_root" and out_dirs[0].name == "seg":
-            summary_dir = common_parent.parent if common_parent.name != "seg" else common_parent
-        else:
-            summary_dir = common_parent
+        summary_dir = self._compute_summary_dir(jobs, params)
         
         # 计算 totals
         speech_total_sec = 0.0
@@ -1184,13 +1420,21 @@ class SegmentPlanner:
         per_strategy_exports_count: dict[str, int] = {}
         
         for job in jobs:
-            # 读取 seg_report.json 获取统计信息
-            report_path = job.out_dir / "seg_report.json"
-            if report_path.exists():
+            # 本次运行执行过的 job 直接使用内存中的汇总数据
+            job_totals = self._report_totals.get(job.job_id)
+            if job_totals is not None:
+                speech_total_sec += job_totals["speech_total_sec"]
+                silences_total_sec += job_totals["silences_total_sec"]
+                if job_totals["exports_count"]:
+                    exports_written_total += job_totals["exports_count"]
+                    strategy = job_totals["strategy"]
+                    per_strategy_exports_count[strategy] = per_strategy_exports_count.get(strategy, 0) + job_totals["exports_count"]
+                continue
+            
+            # 其余 job（如被跳过）读取已有的 seg_report.json 获取统计信息
+            report_data = self._read_final_report(job)
+            if report_data is not None:
                 try:
-                    with open(report_path, "r", encoding="utf-8") as f:
-                        report_data = json.load(f)
-                    
                     # 累加 speech_total_sec
                     segments_data = report_data.get("segments", {})
                     if isinstance(segments_data, dict):
@@ -1215,7 +1459,8 @@ class SegmentPlanner:
                     pass  # 读取失败，跳过
         
         # 构建 run_summary
-        finished_at = datetime.now().isoformat()
+        if finished_at is None:
+            finished_at = datetime.now().isoformat()
         run_id = str(uuid.uuid4())
         
         summary = {
@@ -1250,11 +1495,10 @@ class SegmentPlanner:
         summary_path = summary_dir / "run_summary.json"
         try:
             summary_dir.mkdir(parents=True, exist_ok=True)
-            with open(summary_path, "w", encoding="utf-8") as f:
-                json.dump(summary, f, ensure_ascii=False, indent=2)
-            logger.info(f"写入 run_summary.json: {summary_path}")
+            write_json_atomic(summary_path, summary)
+            logger.info("写入 run_summary.json: %s", summary_path)
         except Exception as e:
-            logger.warning(f"写入 run_summary.json 失败: {e}", exc_info=True)
+            logger.warning("写入 run_summary.json 失败: %s", e, exc_info=True)
     
     def _write_run_manifest(
         self,
@@ -1262,6 +1506,7 @@ class SegmentPlanner:
         params: dict[str, Any],
         effective_config: Optional[dict[str, Any]] = None,
         config_hash: Optional[str] = None,
+        finished_at: Optional[str] = None,
     ) -> None:
         """写入 run_manifest.json（R11：可复现实验快照）
         
@@ -1270,71 +1515,23 @@ class SegmentPlanner:
             params: 参数字典
             effective_config: 合并后的最终配置（可选）
             config_hash: 配置哈希值（可选）
+            finished_at: 运行结束时间（ISO 格式，可选，默认取当前时间）
         """
         if not jobs:
             return
         
         # 确定输出目录（与 run_summary.json 相同）
-        out_dirs = [job.out_dir for job in jobs]
-        common_parent = out_dirs[0].parent
-        
-        for out_dir in out_dirs[1:]:
-            try:
-                if out_dir.parent != common_parent:
-                    common_parts = []
-                    parts1 = common_parent.parts
-                    parts2 = out_dir.parent.parts
-                    for p1, p2 in zip(parts1, parts2):
-                        if p1 == p2:
-                            common_parts.append(p1)
-                        else:
-                            break
-                    if common_parts:
-                        common_parent = Path(*common_parts)
-                    else:
-                        common_parent = out_dirs[0].parent
-                        break
-            except Exception:
-                common_parent = out_dirs[0].parent
-                break
-        
-        out_mode = params.get("out_mode", "in_place")
-        if out_mode == "out_root" and out_dirs[0].name == "seg":
-            manifest_dir = common_parent.parent if common_parent.name != "seg" else common_parent
-        else:
-            manifest_dir = common_parent
-        
-        # 获取工具版本
-        from onepass_audioclean_seg import __version__
+        manifest_dir = self._compute_summary_dir(jobs, params)
         
         # 获取 git commit（可选）
         git_commit = None
-        import os
         git_commit_env = os.environ.get("GIT_COMMIT")
         if git_commit_env:
             git_commit = git_commit_env
         else:
-            # 尝试从 .git 读取（简化实现，不依赖 gitpython）
-            try:
-                git_dir = Path.cwd() / ".git"
-                if git_dir.exists():
-                    # 尝试读取 HEAD
-                    head_file = git_dir / "HEAD"
-                    if head_file.exists():
-                        with open(head_file, "r") as f:
-                            head_content = f.read().strip()
-                            if head_content.startswith("ref: "):
-                                ref_path = git_dir / head_content[5:]
-                                if ref_path.exists():
-                                    with open(ref_path, "r") as rf:
-                                        git_commit = rf.read().strip()[:40]  # 取前40字符
-            except Exception:
-                pass  # 忽略错误
+            git_commit = _read_git_commit()
         
         # 获取环境信息
-        import platform
-        import sys
-        
         environment = {
             "python_version": sys.version.split()[0],
             "platform": platform.platform(),
@@ -1342,30 +1539,25 @@ class SegmentPlanner:
         }
         
         # 获取依赖版本
-        from onepass_audioclean_seg.audio.ffmpeg import get_ffmpeg_version, get_ffprobe_version, which
-        
-        ffmpeg_path = which("ffmpeg")
+        ffmpeg_path = self._get_ffmpeg()
         if ffmpeg_path:
             ffmpeg_version = get_ffmpeg_version(ffmpeg_path)
             if ffmpeg_version:
                 environment["deps"]["ffmpeg_version"] = ffmpeg_version
         
-        ffprobe_path = which("ffprobe")
+        ffprobe_path = self._get_ffprobe()
         if ffprobe_path:
             ffprobe_version = get_ffprobe_version(ffprobe_path)
             if ffprobe_version:
                 environment["deps"]["ffprobe_version"] = ffprobe_version
         
-        try:
-            import webrtcvad
+        # 可选依赖只查找模块/读取安装元数据，不为写 manifest 而导入（webrtcvad 需加载 C 扩展）
+        if importlib.util.find_spec("webrtcvad") is not None:
             environment["deps"]["webrtcvad_version"] = "available"  # webrtcvad 没有版本 API
-        except ImportError:
-            pass
         
         try:
-            import yaml
-            environment["deps"]["pyyaml_version"] = getattr(yaml, "__version__", "unknown")
-        except ImportError:
+            environment["deps"]["pyyaml_version"] = importlib.metadata.version("PyYAML")
+        except importlib.metadata.PackageNotFoundError:
             pass
         
         # 构建 jobs 列表
@@ -1373,18 +1565,15 @@ class SegmentPlanner:
         for job, job_stat in zip(jobs, self.job_stats):
             job_info = {
                 "job_id": job.job_id,
-                "audio_path": str(job.audio_path.resolve()),
-                "out_dir": str(job.out_dir.resolve()),
+                "audio_path": job.audio_path_abs,
+                "out_dir": str(job.out_dir_abs),
                 "status": job_stat["status"],
             }
             
-            # 读取 seg_report.json 获取额外信息
-            report_path = job.out_dir / "seg_report.json"
-            if report_path.exists():
+            # 读取 seg_report.json 获取额外信息（与 run_summary 共用同一次解析结果）
+            report_data = self._read_final_report(job)
+            if report_data is not None:
                 try:
-                    with open(report_path, "r", encoding="utf-8") as f:
-                        report_data = json.load(f)
-                    
                     # 获取 chosen_strategy
                     segments_data = report_data.get("segments", {})
                     if isinstance(segments_data, dict):
@@ -1407,7 +1596,8 @@ class SegmentPlanner:
             manifest_jobs.append(job_info)
         
         # 构建 run_manifest
-        finished_at = datetime.now().isoformat()
+        if finished_at is None:
+            finished_at = datetime.now().isoformat()
         
         manifest = {
             "tool": "onepass-audioclean-seg",
@@ -1425,9 +1615,8 @@ class SegmentPlanner:
         manifest_path = manifest_dir / "run_manifest.json"
         try:
             manifest_dir.mkdir(parents=True, exist_ok=True)
-            with open(manifest_path, "w", encoding="utf-8") as f:
-                json.dump(manifest, f, ensure_ascii=False, indent=2)
-            logger.info(f"写入 run_manifest.json: {manifest_path}")
+            write_json_atomic(manifest_path, manifest)
+            logger.info("写入 run_manifest.json: %s", manifest_path)
         except Exception as e:
-            logger.warning(f"写入 run_manifest.json 失败: {e}", exc_info=True)
+            logger.warning("写入 run_manifest.json 失败: %s", e, exc_info=True)
 
@@ -1,15 +1,112 @@
 """输入解析器：从各种输入形态解析出任务列表"""
 
-import json
+import fnmatch
 import logging
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from onepass_audioclean_seg.io.jsonfile import loads_json
 from onepass_audioclean_seg.pipeline.jobs import SegJob
 from onepass_audioclean_seg.utils.paths import get_rel_key, sanitize_path_component, stable_hash
 
 logger = logging.getLogger(__name__)
 
+# manifest 行数达到该值时并发检查文件是否存在（行数少时线程池开销不划算）
+MANIFEST_PROBE_PARALLEL_MIN_ROWS = 64
+# 并发检查的线程数上限（stat 主要等待 I/O，线程数可高于 CPU 核数）
+MANIFEST_PROBE_MAX_WORKERS = 32
+# fnmatch 通配符；pattern 不含这些字符时按文件名精确匹配
+_GLOB_MAGIC_CHARS = frozenset("*?[")
+
+
+def _scandir_matches(directory: str, pattern: str) -> Iterator[str]:
+    """递归扫描目录，返回文件名匹配 pattern 的条目路径（与 Path.rglob(pattern) 结果一致）
+    
+    直接使用 os.scandir 的 DirEntry 缓存类型信息，不为未匹配的条目创建 Path；
+    与 rglob 相同，不进入指向目录的符号链接，无权限读取的目录直接跳过。
+    pattern 不含通配符（如默认的 "audio.wav"）时直接比较文件名，不走 fnmatch。
+    """
+    if _GLOB_MAGIC_CHARS.isdisjoint(pattern):
+        literal = os.path.normcase(pattern)
+        return _scandir_walk(directory, lambda name: os.path.normcase(name) == literal)
+    return _scandir_walk(directory, lambda name: fnmatch.fnmatch(name, pattern))
+
+
+def _scandir_walk(directory: str, match: Callable[[str], bool]) -> Iterator[str]:
+    """_scandir_matches 的递归实现，match 判断文件名是否命中"""
+    try:
+        with os.scandir(directory) as entries:
+            subdirs: list[str] = []
+            for entry in entries:
+                if match(entry.name):
+                    yield entry.path
+                try:
+                    if entry.is_dir() and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+    except PermissionError:
+        return
+    for subdir in subdirs:
+        yield from _scandir_walk(subdir, match)
+
+
+def _path_sort_key(path: str) -> list[str]:
+    """路径字符串的排序键，排序结果与对应 Path 对象排序一致（按路径组件逐个比较）
+    
+    直接按字符串排序会把 "a-b/x" 排在 "a/x" 之前，与 Path 不同；
+    对字符串按组件切分后由 C 层比较 list，省去逐次调用 Path.__lt__。
+    """
+    return os.path.normcase(path).split(os.sep)
+
+
+# manifest 行中各路径字段的查找顺序：先查 obj["output"] 下的键，再查顶层键
+_WORKDIR_OUTPUT_KEYS = ("workdir", "dir")
+_WORKDIR_KEYS = ("workdir", "output_dir")
+_AUDIO_OUTPUT_KEYS = ("audio_wav", "audio_path")
+_AUDIO_KEYS = ("audio_wav", "audio_path")
+_META_OUTPUT_KEYS = ("meta_json", "meta_json_path")
+_META_KEYS = ("meta_json_path",)
+_SUCCESS_STATUSES = frozenset({"success", "ok", "done"})
+
+
+def _lookup_manifest_path(obj: dict, output_keys: tuple[str, ...], keys: tuple[str, ...]) -> Optional[Path]:
+    """按查找顺序返回 manifest 行中第一个存在的路径字段，都不存在时返回 None
+    
+    obj["output"] 只取一次并检查一次类型，不在每个键上重复判断。
+    """
+    output = obj.get("output")
+    if isinstance(output, dict):
+        for key in output_keys:
+            if key in output:
+                return Path(output[key])
+    for key in keys:
+        if key in obj:
+            return Path(obj[key])
+    return None
+
+
+def _probe_manifest_paths(
+    paths: tuple[Optional[Path], Optional[Path]],
+) -> tuple[Optional[Path], Optional[Path]]:
+    """检查 manifest 一行的音频与 meta.json 是否存在
+    
+    Args:
+        paths: (audio_path, meta_path)，均可为 None
+    
+    Returns:
+        (resolve 后的音频路径，不存在时为 None；meta_path，不存在时为 None)
+    """
+    audio_path, meta_path = paths
+    if audio_path is None or not audio_path.exists():
+        return None, None
+    if meta_path is not None and not meta_path.exists():
+        meta_path = None
+    return audio_path.resolve(), meta_path
+
 
 class InputResolver:
     """输入解析器：支持 file/workdir/root/manifest 四种输入类型"""
@@ -62,7 +159,7 @@ class InputResolver:
         # 生成 job_id 和 rel_key
         stem = audio_path.stem
         rel_key = stem
-        job_id = f"job_{stable_hash(str(audio_path.resolve()))}"
+        job_id = f"job_{stable_hash(str(audio_path))}"  # audio_path 已 resolve
         
         # 确定输出目录
         if out_mode == "in_place":
@@ -97,7 +194,7 @@ class InputResolver:
         
         # 生成 job_id 和 rel_key
         rel_key = str(workdir.name)
-        job_id = f"job_{stable_hash(str(workdir.resolve()))}"
+        job_id = f"job_{stable_hash(str(workdir))}"  # workdir 已 resolve
         
         # 确定输出目录
         if out_mode == "in_place":
@@ -126,8 +223,12 @@ class InputResolver:
         root = root.resolve()
         jobs = []
         
-        # 递归查找所有匹配的文件
-        audio_files = sorted(root.rglob(self.pattern))
+        # 递归查找所有匹配的文件（pattern 为单个文件名模式时用 scandir 遍历，含路径分隔符时仍交给 rglob）
+        if "/" in self.pattern or os.sep in self.pattern:
+            audio_files = sorted(root.rglob(self.pattern))
+        else:
+            matches = sorted(_scandir_matches(str(root), self.pattern), key=_path_sort_key)
+            audio_files = [Path(p) for p in matches]
         
         if not audio_files:
             logger.warning(f"在根目录中未找到任何 {self.pattern} 文件: {root}")
@@ -153,7 +254,7 @@ class InputResolver:
             except ValueError:
                 rel_key = audio_path.stem
             
-            job_id = f"job_{stable_hash(str(audio_path.resolve()))}"
+            job_id = f"job_{stable_hash(str(audio_path))}"  # audio_path 已 resolve
             
             # 确定输出目录
             if out_mode == "in_place" and workdir:
@@ -184,82 +285,106 @@ class InputResolver:
         return jobs
     
     def _resolve_manifest(self, manifest_path: Path, out_root: Path, out_mode: str) -> list[SegJob]:
-        """解析 manifest.jsonl 文件"""
+        """解析 manifest.jsonl 文件
+        
+        分三步：先逐行解析 JSON 得到候选路径；再检查音频 / meta.json 是否存在（行数较多时
+        用线程池并发 stat，网络盘上可明显缩短耗时）；最后按原行序生成任务并输出告警。
+        """
         manifest_path = manifest_path.resolve()
         jobs = []
-        
-        with open(manifest_path, "r", encoding="utf-8") as f:
+        # workdir -> resolve 结果：多行共享同一 workdir 时只调用一次 realpath
+        resolved_workdirs: dict[Path, Path] = {}
+        
+        # 第一步：逐行解析。每项为 (行号, workdir, audio_path, meta_path)，
+        # audio_path 为 None 表示该行无法解析音频路径
+        rows: list[tuple[int, Optional[Path], Optional[Path], Optional[Path]]] = []
+        # 以二进制逐行读取，交给 loads_json 直接解析 bytes（安装 orjson 时省去逐行解码）
+        with open(manifest_path, "rb") as f:
             for line_num, line in enumerate(f, 1):
                 line = line.strip()
                 if not line:
                     continue
                 
                 try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError as e:
+                    obj = loads_json(line)
+                except ValueError as e:  # JSONDecodeError，或 bytes 不是合法 UTF-8
                     logger.warning(f"manifest.jsonl 第 {line_num} 行 JSON 解析失败: {e}")
                     continue
                 
+                if not isinstance(obj, dict):
+                    logger.warning(f"manifest.jsonl 第 {line_num} 行不是 JSON 对象，跳过")
+                    continue
+                
                 # 判断是否成功
                 is_success = self._check_success(obj)
                 if not is_success:
                     logger.debug(f"manifest.jsonl 第 {line_num} 行标记为失败，跳过")
                     continue
                 
-                # 解析 workdir
+                # 解析 workdir、音频路径、meta.json 路径
                 workdir = self._extract_workdir(obj)
-                
-                # 解析音频路径
                 audio_path = self._extract_audio_path(obj, workdir)
-                if audio_path is None:
-                    logger.warning(f"manifest.jsonl 第 {line_num} 行无法解析音频路径，跳过")
-                    continue
-                
-                if not audio_path.exists():
-                    logger.warning(f"manifest.jsonl 第 {line_num} 行音频文件不存在: {audio_path}，跳过")
-                    continue
-                
-                audio_path = audio_path.resolve()
-                
-                # 解析 meta.json 路径
-                meta_path = self._extract_meta_path(obj, workdir)
-                if meta_path and not meta_path.exists():
-                    meta_path = None
-                
-                # 生成 job_id 和 rel_key
+                meta_path = self._extract_meta_path(obj, workdir) if audio_path is not None else None
+                rows.append((line_num, workdir, audio_path, meta_path))
+        
+        # 第二步：检查文件是否存在（结果与 rows 一一对应）
+        probes = [(audio_path, meta_path) for _, _, audio_path, meta_path in rows]
+        if len(probes) >= MANIFEST_PROBE_PARALLEL_MIN_ROWS:
+            max_workers = min(MANIFEST_PROBE_MAX_WORKERS, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                probed = list(executor.map(_probe_manifest_paths, probes))
+        else:
+            probed = [_probe_manifest_paths(probe) for probe in probes]
+        
+        # 第三步：按原行序生成任务
+        for (line_num, workdir, audio_path, _), (resolved_audio, meta_path) in zip(rows, probed):
+            if audio_path is None:
+                logger.warning(f"manifest.jsonl 第 {line_num} 行无法解析音频路径，跳过")
+                continue
+            
+            if resolved_audio is None:
+                logger.warning(f"manifest.jsonl 第 {line_num} 行音频文件不存在: {audio_path}，跳过")
+                continue
+            
+            audio_path = resolved_audio
+            
+            # 生成 job_id 和 rel_key
+            if workdir:
+                rel_key = str(workdir.name)
+                resolved_workdir = resolved_workdirs.get(workdir)
+                if resolved_workdir is None:
+                    resolved_workdir = resolved_workdirs[workdir] = workdir.resolve()
+                job_id = f"job_{stable_hash(str(resolved_workdir))}"
+            else:
+                rel_key = audio_path.stem
+                job_id = f"job_{stable_hash(str(audio_path))}"  # audio_path 已 resolve
+            
+            # 确定输出目录
+            warnings = []
+            if out_mode == "in_place" and workdir:
+                out_dir = workdir / "seg"
+            else:  # out_root 模式
                 if workdir:
-                    rel_key = str(workdir.name)
-                    job_id = f"job_{stable_hash(str(workdir.resolve()))}"
+                    out_dir = out_root / sanitize_path_component(workdir.name) / "seg"
                 else:
-                    rel_key = audio_path.stem
-                    job_id = f"job_{stable_hash(str(audio_path.resolve()))}"
-                
-                # 确定输出目录
-                warnings = []
-                if out_mode == "in_place" and workdir:
-                    out_dir = workdir / "seg"
-                else:  # out_root 模式
-                    if workdir:
-                        out_dir = out_root / sanitize_path_component(workdir.name) / "seg"
-                    else:
-                        out_dir = out_root / sanitize_path_component(audio_path.stem) / "seg"
-                
-                if meta_path is None and workdir:
-                    warnings.append("meta.json 不存在")
-                if workdir is None:
-                    warnings.append("无法解析 workdir，使用音频文件名作为键")
-                
-                job = SegJob(
-                    job_id=job_id,
-                    input_type="manifest",
-                    workdir=workdir,
-                    audio_path=audio_path,
-                    meta_path=meta_path,
-                    out_dir=out_dir,
-                    rel_key=rel_key,
-                    warnings=warnings,
-                )
-                jobs.append(job)
+                    out_dir = out_root / sanitize_path_component(audio_path.stem) / "seg"
+            
+            if meta_path is None and workdir:
+                warnings.append("meta.json 不存在")
+            if workdir is None:
+                warnings.append("无法解析 workdir，使用音频文件名作为键")
+            
+            job = SegJob(
+                job_id=job_id,
+                input_type="manifest",
+                workdir=workdir,
+                audio_path=audio_path,
+                meta_path=meta_path,
+                out_dir=out_dir,
+                rel_key=rel_key,
+                warnings=warnings,
+            )
+            jobs.append(job)
         
         return jobs
     
@@ -273,10 +398,7 @@ class InputResolver:
         """
         # 检查 status 字段
         if "status" in obj:
-            status = str(obj["status"]).lower()
-            if status in ["success", "ok", "done"]:
-                return True
-            return False
+            return str(obj["status"]).lower() in _SUCCESS_STATUSES
         
         # 检查 ok 字段
         if "ok" in obj:
@@ -291,34 +413,14 @@ class InputResolver:
     def _extract_workdir(self, obj: dict) -> Optional[Path]:
         """从 JSON 对象中提取 workdir 路径"""
         # 优先读取 obj["output"]["workdir"] 或 obj["workdir"]
-        if "output" in obj and isinstance(obj["output"], dict):
-            if "workdir" in obj["output"]:
-                return Path(obj["output"]["workdir"])
-            if "dir" in obj["output"]:
-                return Path(obj["output"]["dir"])
-        
-        if "workdir" in obj:
-            return Path(obj["workdir"])
-        
-        if "output_dir" in obj:
-            return Path(obj["output_dir"])
-        
-        return None
+        return _lookup_manifest_path(obj, _WORKDIR_OUTPUT_KEYS, _WORKDIR_KEYS)
     
     def _extract_audio_path(self, obj: dict, workdir: Optional[Path]) -> Optional[Path]:
         """从 JSON 对象中提取音频路径"""
         # 优先 obj["output"]["audio_wav"] 或 obj["audio_wav"] 或 obj["audio_path"]
-        if "output" in obj and isinstance(obj["output"], dict):
-            if "audio_wav" in obj["output"]:
-                return Path(obj["output"]["audio_wav"])
-            if "audio_path" in obj["output"]:
-                return Path(obj["output"]["audio_path"])
-        
-        if "audio_wav" in obj:
-            return Path(obj["audio_wav"])
-        
-        if "audio_path" in obj:
-            return Path(obj["audio_path"])
+        audio_path = _lookup_manifest_path(obj, _AUDIO_OUTPUT_KEYS, _AUDIO_KEYS)
+        if audio_path is not None:
+            return audio_path
         
         # 否则若有 workdir：用 workdir/audio.wav
         if workdir:
@@ -329,14 +431,9 @@ class InputResolver:
     def _extract_meta_path(self, obj: dict, workdir: Optional[Path]) -> Optional[Path]:
         """从 JSON 对象中提取 meta.json 路径"""
         # 优先 obj["output"]["meta_json"] 或 obj["meta_json_path"]
-        if "output" in obj and isinstance(obj["output"], dict):
-            if "meta_json" in obj["output"]:
-                return Path(obj["output"]["meta_json"])
-            if "meta_json_path" in obj["output"]:
-                return Path(obj["output"]["meta_json_path"])
-        
-        if "meta_json_path" in obj:
-            return Path(obj["meta_json_path"])
+        meta_path = _lookup_manifest_path(obj, _META_OUTPUT_KEYS, _META_KEYS)
+        if meta_path is not None:
+            return meta_path
         
         # 否则 workdir/meta.json
         if workdir:
@@ -1,6 +1,9 @@
 """R10: 片段 flags 生成辅助模块"""
 
 import logging
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -13,40 +16,64 @@ def track_postprocess_history(
 ) -> dict[tuple[float, float], list[str]]:
     """跟踪后处理操作历史
     
+    before 段按 start 排序后若 end 也单调不减（后处理各阶段的输出都满足），
+    对每个 after 段用二分查找定位可能包含 / 重叠它的 before 段，复杂度 O((N+M)·log M)；
+    否则退回逐对比较。两种路径结果一致。
+    
     Args:
         segments_before: 操作前的段列表
         segments_after: 操作后的段列表
         operation: 操作名称（"split" 或 "merge"）
     
     Returns:
-        字典：{(start, end): [flags]}，记录每个段对应的 flags
+        字典：{(start, end): [flags]}，记录每个段对应的 flags（defaultdict(list)，
+        未记录的段取值为空列表）
     """
-    flags_map: dict[tuple[float, float], list[str]] = {}
+    flags_map: dict[tuple[float, float], list[str]] = defaultdict(list)
+    if operation not in ("split", "merge"):
+        return flags_map
+    
+    sorted_before = sorted(segments_before)
+    before_starts = [seg[0] for seg in sorted_before]
+    before_ends = [seg[1] for seg in sorted_before]
+    ends_monotonic = all(a <= b for a, b in zip(before_ends, before_ends[1:]))
     
     if operation == "split":
         # 对于 split：如果 after 中的段在 before 中找不到完全匹配的，且 before 中有更长的段包含它，则标记为 split_from_long
         for seg_after in segments_after:
-            flags_map[seg_after] = []
+            seg_flags = flags_map[seg_after] = []
+            after_start, after_end = seg_after
+            if ends_monotonic:
+                # 满足 start <= after_start 的是前缀 [0, hi)，满足 end >= after_end 的是后缀 [lo, M)
+                candidates = sorted_before[bisect_left(before_ends, after_end):bisect_right(before_starts, after_start)]
+            else:
+                candidates = sorted_before
             # 检查是否由 split 产生
-            for seg_before in segments_before:
+            for seg_before in candidates:
                 # 如果 after 段完全在 before 段内，且 before 段更长，则可能是 split 产生的
-                if (seg_before[0] <= seg_after[0] < seg_after[1] <= seg_before[1] and
-                    (seg_before[1] - seg_before[0]) > (seg_after[1] - seg_after[0])):
-                    flags_map[seg_after].append("split_from_long")
+                if (seg_before[0] <= after_start < after_end <= seg_before[1] and
+                    (seg_before[1] - seg_before[0]) > (after_end - after_start)):
+                    seg_flags.append("split_from_long")
                     break
-    elif operation == "merge":
+    else:
         # 对于 merge：如果 after 中的段覆盖了多个 before 段，则标记为 merged_short
         for seg_after in segments_after:
-            flags_map[seg_after] = []
-            # 检查是否由 merge 产生
-            covered_before = []
-            for seg_before in segments_before:
-                # 如果 before 段与 after 段有重叠
-                if not (seg_before[1] <= seg_after[0] or seg_after[1] <= seg_before[0]):
-                    covered_before.append(seg_before)
+            seg_flags = flags_map[seg_after] = []
+            after_start, after_end = seg_after
+            if ends_monotonic:
+                # 与 after 段重叠 ⇔ start < after_end（前缀 [0, hi)）且 end > after_start（去掉前缀 [0, lo)）
+                hi = bisect_left(before_starts, after_end)
+                lo = min(bisect_right(before_ends, after_start), hi)
+                covered_count = hi - lo
+            else:
+                covered_count = 0
+                for seg_before in sorted_before:
+                    # 如果 before 段与 after 段有重叠
+                    if not (seg_before[1] <= after_start or after_end <= seg_before[0]):
+                        covered_count += 1
             
-            if len(covered_before) > 1:
-                flags_map[seg_after].append("merged_short")
+            if covered_count > 1:
+                seg_flags.append("merged_short")
     
     return flags_map
 
@@ -89,6 +116,42 @@ def compute_flags_for_segment(
     return flags
 
 
+def compute_flags_batch(
+    segments: list[tuple[float, float]],
+    duration_sec: float,
+    rms_values: list[Optional[float]],
+    low_energy_rms_threshold: float,
+    history_flags: Optional[list[list[str]]] = None,
+) -> list[list[str]]:
+    """批量计算所有段的 flags（结果与逐段调用 compute_flags_for_segment 一致）
+    
+    阈值、容差等标量在循环外只取一次，按 zip 并行遍历各列，省去逐段函数调用与下标访问的开销。
+    
+    Args:
+        segments: 段列表，每个元素为 (start, end)
+        duration_sec: 音频总时长
+        rms_values: 与 segments 一一对应的 RMS 值（元素可为 None）
+        low_energy_rms_threshold: 低能量阈值
+        history_flags: 与 segments 一一对应的处理历史 flags（可选）
+    
+    Returns:
+        与 segments 一一对应的 flags 列表
+    """
+    tolerance = 1e-3
+    if history_flags is None:
+        history_flags = [()] * len(segments)
+    results: list[list[str]] = []
+    for (start, end), rms, history in zip(segments, rms_values, history_flags):
+        flags = list(history)
+        # abs(start - 0.0) < tolerance 即 -tolerance < start < tolerance，省去一次 abs 调用
+        if -tolerance < start < tolerance or abs(end - duration_sec) < tolerance:
+            flags.append("edge_clipped")
+        if rms is not None and rms < low_energy_rms_threshold:
+            flags.append("low_energy")
+        results.append(flags)
+    return results
+
+
 def build_source_info(
     strategy: str,
     auto_chosen: bool,
@@ -117,6 +180,40 @@ def build_source_info(
     return source
 
 
+class RawIndexLookup:
+    """按 (start, end) 查找片段在 speech_segments_raw 中的序号
+    
+    匹配规则：start 与 end 均相差小于 tolerance，多个命中时取最小序号。
+    按 start 分桶（桶宽 2 × tolerance）建立哈希索引，每次查询只需检查相邻 3 个桶，
+    替代对全部原始片段的线性扫描。
+    """
+    
+    def __init__(self, speech_segments: list[tuple[float, float]], tolerance: float = 0.01):
+        self._segments = speech_segments
+        self._tolerance = tolerance
+        self._bucket_width = 2 * tolerance
+        self._buckets: dict[int, list[int]] = {}
+        for i, (raw_start, _) in enumerate(speech_segments):
+            self._buckets.setdefault(self._bucket(raw_start), []).append(i)
+    
+    def _bucket(self, t: float) -> int:
+        return math.floor(t / self._bucket_width)
+    
+    def find(self, start: float, end: float) -> Optional[int]:
+        """返回匹配的原始片段序号，找不到返回 None"""
+        key = self._bucket(start)
+        best: Optional[int] = None
+        for k in (key - 1, key, key + 1):
+            for i in self._buckets.get(k, ()):
+                if best is not None and i >= best:
+                    break
+                raw_start, raw_end = self._segments[i]
+                if abs(raw_start - start) < self._tolerance and abs(raw_end - end) < self._tolerance:
+                    best = i
+                    break
+        return best
+
+
 def build_quality_info(
     rms: Optional[float],
     energy_db: Optional[float],
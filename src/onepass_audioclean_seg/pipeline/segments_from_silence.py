@@ -1,12 +1,30 @@
 """从静音区间生成语音片段的核心算法模块"""
 
 import logging
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
 from typing import Optional
 
-from onepass_audioclean_seg.strategies.silence_ffmpeg import SilenceInterval
-
 logger = logging.getLogger(__name__)
 
+# 排序键用 C 实现的 getter，避免每个元素调用一次 Python lambda（仍按 start 稳定排序）
+_START_KEY = itemgetter(0)
+_START_SEC_KEY = attrgetter("start_sec")
+
+
+@dataclass(frozen=True, slots=True)
+class SilenceInterval:
+    """静音区间
+    
+    使用 slots：长音频可能检出数千个静音区间，省去逐实例 __dict__ 的分配
+    """
+    
+    start_sec: float
+    end_sec: float
+    duration_sec: float
+
 
 def normalize_intervals(
     silences: list[SilenceInterval],
@@ -31,41 +49,35 @@ def normalize_intervals(
         return []
     
     # 1. 按 start 排序
-    sorted_silences = sorted(silences, key=lambda x: x.start_sec)
+    sorted_silences = sorted(silences, key=_START_SEC_KEY)
     
     # 2. 合并重叠或相邻区间（gap <= 0.001）
-    merged: list[SilenceInterval] = []
-    for interval in sorted_silences:
-        if not merged:
-            merged.append(interval)
-            continue
-        
-        last = merged[-1]
-        gap = interval.start_sec - last.end_sec
+    # 合并过程只维护 (start, end) 浮点数，不为每次合并构造中间 SilenceInterval
+    merged: list[tuple[float, float]] = []
+    last_start = sorted_silences[0].start_sec
+    last_end = sorted_silences[0].end_sec
+    for interval in sorted_silences[1:]:
+        start_sec = interval.start_sec
+        end_sec = interval.end_sec
+        gap = start_sec - last_end
         
         # 如果重叠（gap < 0）或相邻（gap <= 0.001），合并
         if gap <= 0.001:
             # 合并：取 start 的最小值和 end 的最大值
-            new_start = min(last.start_sec, interval.start_sec)
-            new_end = max(last.end_sec, interval.end_sec)
-            new_duration = new_end - new_start
-            merged[-1] = SilenceInterval(
-                start_sec=round(new_start, 3),
-                end_sec=round(new_end, 3),
-                duration_sec=round(new_duration, 3),
-            )
+            last_start = round(min(last_start, start_sec), 3)
+            last_end = round(max(last_end, end_sec), 3)
         else:
-            merged.append(interval)
+            merged.append((last_start, last_end))
+            last_start, last_end = start_sec, end_sec
+    merged.append((last_start, last_end))
     
     # 3. clip 到 [0, duration_sec] 并过滤异常区间
     result: list[SilenceInterval] = []
-    for interval in merged:
-        start_sec = max(0.0, interval.start_sec)
+    for start_sec, end_sec in merged:
+        start_sec = max(0.0, start_sec)
         if duration_sec is not None:
             start_sec = min(start_sec, duration_sec)
-            end_sec = min(interval.end_sec, duration_sec)
-        else:
-            end_sec = interval.end_sec
+            end_sec = min(end_sec, duration_sec)
         
         # 过滤 end <= start 的异常区间
         if end_sec <= start_sec:
@@ -102,34 +114,28 @@ def complement_to_speech_segments(
     Returns:
         语音段列表，每个元素为 (start, end) 元组（按 start 升序）
     """
-    segments: list[tuple[float, float]] = []
-    
     if not silences:
         # 如果没有静音，整个音频都是语音段
         if duration_sec > 0:
-            segments.append((round(0.0, 3), round(duration_sec, 3)))
-        return segments
-    
-    # 开头：如果第一个静音区间不在 0，则 0 -> first.start 是语音段
-    first_silence = silences[0]
-    if first_silence.start_sec > 0:
-        segments.append((round(0.0, 3), round(first_silence.start_sec, 3)))
-    
-    # 中间：两个静音之间的 gap
-    for i in range(len(silences) - 1):
-        prev_end = silences[i].end_sec
-        next_start = silences[i + 1].start_sec
-        gap = next_start - prev_end
-        if gap > 0:
-            segments.append((round(prev_end, 3), round(next_start, 3)))
-    
-    # 结尾：如果最后一个静音区间结束时间 < duration，则 last.end -> duration 是语音段
-    last_silence = silences[-1]
-    if last_silence.end_sec < duration_sec:
-        segments.append((round(last_silence.end_sec, 3), round(duration_sec, 3)))
-    
-    # 过滤掉 duration <= 0 的段（理论上不应该出现，但保险起见）
-    segments = [(s, e) for s, e in segments if e > s]
+            return [(round(0.0, 3), round(duration_sec, 3))]
+        return []
+    
+    # 按列计算补集：语音段起点列为 [0, silence.end...]，终点列为 [silence.start..., duration]
+    # 首、中、尾三类 gap 统一为相邻两列配对，一次遍历完成
+    # round 单调不减，因此在 round 后过滤 e > s 即同时排除了 gap <= 0 的情况
+    speech_starts = [0.0]
+    speech_starts.extend(silence.end_sec for silence in silences)
+    speech_ends = [silence.start_sec for silence in silences]
+    speech_ends.append(duration_sec)
+    
+    segments = [
+        (s, e)
+        for s, e in zip(
+            [round(v, 3) for v in speech_starts],
+            [round(v, 3) for v in speech_ends],
+        )
+        if e > s
+    ]
     
     return segments
 
@@ -164,7 +170,7 @@ def apply_padding_and_clip(
             logger.warning(f"填充后段无效（start >= end）: start={new_start}, end={new_end}")
     
     # 按 start 排序（虽然输入应该已排序，但保险起见）
-    result.sort(key=lambda x: x[0])
+    result.sort(key=_START_KEY)
     
     return result
 
@@ -189,7 +195,7 @@ def filter_min_duration(
         if duration >= min_seg_sec:
             result.append((round(start, 3), round(end, 3)))
         else:
-            logger.debug(f"过滤短段: start={start}, end={end}, duration={duration:.3f} < {min_seg_sec}")
+            logger.debug("过滤短段: start=%s, end=%s, duration=%.3f < %s", start, end, duration, min_seg_sec)
     
     return result
 
@@ -212,24 +218,21 @@ def merge_overlaps(
     if not segments:
         return []
     
-    # 确保已排序
-    sorted_segments = sorted(segments, key=lambda x: x[0])
-    merged: list[tuple[float, float]] = []
+    # 排序后单次扫描：只需与结果栈顶比较
+    sorted_segments = sorted(segments, key=_START_KEY)
+    merge_threshold = max(overlap_tolerance, gap_merge_sec)
     
-    for start, end in sorted_segments:
-        if not merged:
-            merged.append((round(start, 3), round(end, 3)))
-            continue
-        
+    first_start, first_end = sorted_segments[0]
+    merged: list[tuple[float, float]] = [(round(first_start, 3), round(first_end, 3))]
+    
+    for start, end in sorted_segments[1:]:
         last_start, last_end = merged[-1]
-        gap = start - last_end
         
         # 如果重叠（gap < 0）或粘连（gap <= overlap_tolerance）或 gap <= gap_merge_sec，合并
-        if gap <= max(overlap_tolerance, gap_merge_sec):
-            # 合并：取 start 的最小值和 end 的最大值
-            new_start = min(last_start, start)
-            new_end = max(last_end, end)
-            merged[-1] = (round(new_start, 3), round(new_end, 3))
+        if start - last_end <= merge_threshold:
+            # 按 start 升序，合并后的 start 即栈顶 start；只有 end 更大时才需要更新
+            if end > last_end:
+                merged[-1] = (last_start, round(end, 3))
         else:
             merged.append((round(start, 3), round(end, 3)))
     
@@ -263,75 +266,85 @@ def enforce_min_duration_by_merge(
     if not segments:
         return []
     
-    # 确保已排序
-    sorted_segments = sorted(segments, key=lambda x: x[0])
-    result = sorted_segments.copy()
-    
-    # 持续处理直到没有短段需要合并
-    changed = True
-    while changed:
-        changed = False
+    # 确保已排序（sorted 返回新列表，不修改调用方的输入）
+    result = sorted(segments, key=_START_KEY)
+    
+    # 持续处理直到没有短段需要合并。每一轮只在短段处执行 Python 逻辑，
+    # 两个短段之间的合格段整块复制（第一轮复制时 round，之后已是 round 后的值）。
+    # 第一轮 round 可能使恰好达标的段变短，因此前两轮全量扫描短段；
+    # 此后合格段不再变化，只有本轮合并产生的段可能仍 < min，下一轮只需检查它们。
+    pass_index = 0
+    merged_indices: list[int] = []  # 上一轮合并产生的段在 result 中的下标
+    while True:
+        if pass_index < 2:
+            short_indices = [k for k, (start, end) in enumerate(result) if end - start < min_seg_sec]
+        else:
+            short_indices = [k for k in merged_indices if result[k][1] - result[k][0] < min_seg_sec]
+        
+        if not short_indices:
+            if pass_index == 0:
+                result = [(round(start, 3), round(end, 3)) for start, end in result]
+            break
+        
         new_result: list[tuple[float, float]] = []
+        merged_indices = []
         i = 0
         
-        while i < len(result):
-            start, end = result[i]
-            duration = end - start
+        for j in short_indices:
+            if j < i:
+                continue  # 已作为右邻被合并
             
-            if duration >= min_seg_sec:
-                # 已经满足最小时长，保留
-                new_result.append((round(start, 3), round(end, 3)))
-                i += 1
-                continue
+            # 复制两个短段之间已满足最小时长的段
+            if pass_index == 0:
+                new_result.extend([(round(start, 3), round(end, 3)) for start, end in result[i:j]])
+            else:
+                new_result.extend(result[i:j])
             
-            # 需要合并：查找左右邻段
-            left_neighbor = new_result[-1] if new_result else None
-            right_neighbor = result[i + 1] if i + 1 < len(result) else None
+            start, end = result[j]
+            duration = end - start
             
-            # 决定与哪个邻段合并
-            merge_with = None
-            merge_left = False
+            # 需要合并：查找左右邻段（解包为局部变量，后续比较不再按下标取元组元素）
+            has_left = bool(new_result)
+            has_right = j + 1 < len(result)
+            if has_left:
+                left_start, left_end = new_result[-1]
+            if has_right:
+                right_start, right_end = result[j + 1]
             
-            if left_neighbor is not None and right_neighbor is not None:
+            # 决定与哪个邻段合并
+            if has_left and has_right:
                 # 左右邻都存在：选择 gap 更小的，若 gap 相等则与右邻合并
-                left_gap = start - left_neighbor[1]
-                right_gap = right_neighbor[0] - end
-                
-                if left_gap < right_gap:
-                    merge_with = left_neighbor
-                    merge_left = True
-                else:
-                    merge_with = right_neighbor
-                    merge_left = False
-            elif left_neighbor is not None:
-                merge_with = left_neighbor
-                merge_left = True
-            elif right_neighbor is not None:
-                merge_with = right_neighbor
-                merge_left = False
+                merge_left = start - left_end < right_start - end
+            elif has_left or has_right:
+                merge_left = has_left
             else:
                 # 没有邻段可合并，丢弃（记录 warning）
                 logger.warning(f"丢弃孤立短段（无邻可合并）: start={start}, end={end}, duration={duration:.3f} < {min_seg_sec}")
-                i += 1
+                i = j + 1
                 continue
             
             # 执行合并
             if merge_left:
                 # 与左邻合并：更新左邻的 end
-                new_start = merge_with[0]
-                new_end = max(merge_with[1], end)
-                new_result[-1] = (round(new_start, 3), round(new_end, 3))
-                i += 1
+                new_result[-1] = (round(left_start, 3), round(max(left_end, end), 3))
+                i = j + 1
             else:
                 # 与右邻合并：合并当前段和右邻
-                new_start = min(start, merge_with[0])
-                new_end = max(end, merge_with[1])
-                new_result.append((round(new_start, 3), round(new_end, 3)))
-                i += 2  # 跳过当前段和右邻（都已合并）
+                new_result.append((round(min(start, right_start), 3), round(max(end, right_end), 3)))
+                i = j + 2  # 跳过当前段和右邻（都已合并）
             
-            changed = True
+            merged_index = len(new_result) - 1
+            if not merged_indices or merged_indices[-1] != merged_index:
+                merged_indices.append(merged_index)
+        
+        # 复制最后一个短段之后的段
+        if pass_index == 0:
+            new_result.extend([(round(start, 3), round(end, 3)) for start, end in result[i:]])
+        else:
+            new_result.extend(result[i:])
         
         result = new_result
+        pass_index += 1
     
     return result
 
@@ -372,23 +385,19 @@ def enforce_max_duration_by_split(
         # 需要切分
         if split_strategy == "equal":
             # 等长切分
-            k = int((duration + max_seg_sec - 1e-6) // max_seg_sec) + 1  # ceil(duration / max_seg_sec)
-            if k < 1:
-                k = 1
+            # duration > max_seg_sec，故 k >= 2；用 math.ceil 直接取上整，不再手工拼接容差
+            k = max(1, math.ceil(duration / max_seg_sec))
             
-            segment_length = duration / k
-            
-            for i in range(k):
-                seg_start = start + i * segment_length
-                seg_end = start + (i + 1) * segment_length
-                
-                # 最后一段确保不超过 end
-                if i == k - 1:
-                    seg_end = end
+            # 每个切点都由 start + duration * i / k 直接算出，不累加 segment_length，
+            # 避免浮点误差逐段累积；末段终点直接取 end
+            seg_start = start
+            for i in range(1, k + 1):
+                seg_end = start + duration * i / k if i < k else end
                 
                 # 确保 seg_end > seg_start（考虑 round 误差）
                 if seg_end > seg_start:
                     result.append((round(seg_start, 3), round(seg_end, 3)))
+                seg_start = seg_end
         else:
             # 其他策略暂不支持
             logger.warning(f"不支持的切分策略: {split_strategy}，跳过切分")
@@ -402,3 +411,101 @@ def enforce_max_duration_by_split(
     
     return result
 
+
+class SilenceNeighborLookup:
+    """查找与语音段首尾相接的静音区间（用于 pre_silence_sec / post_silence_sec）
+    
+    静音端点预先排序，每次查找用二分定位候选，复杂度 O(log N)。
+    匹配条件与逐个扫描一致：|端点 - 目标| <= tolerance，多个匹配时取列表中靠前者。
+    """
+    
+    def __init__(
+        self,
+        silences: list[tuple[float, float]],
+        tolerance: float = 1e-3,
+    ):
+        """
+        Args:
+            silences: 静音区间列表，每个元素为 (start, end)
+            tolerance: 端点匹配容差（秒，默认 1e-3）
+        """
+        self.tolerance = tolerance
+        # (端点, 原始下标, 静音时长)，按端点排序
+        self._by_end = sorted((end, i, end - start) for i, (start, end) in enumerate(silences))
+        self._by_start = sorted((start, i, end - start) for i, (start, end) in enumerate(silences))
+        self._end_keys = [item[0] for item in self._by_end]
+        self._start_keys = [item[0] for item in self._by_start]
+    
+    def _find(
+        self,
+        keys: list[float],
+        entries: list[tuple[float, int, float]],
+        target: float,
+    ) -> float:
+        # 二分定位到 target - 2*tolerance，再用原始条件精确判定（避免浮点边界差异）
+        return self._scan(entries, target, bisect_left(keys, target - 2 * self.tolerance))
+    
+    def _scan(
+        self,
+        entries: list[tuple[float, int, float]],
+        target: float,
+        lo: int,
+    ) -> float:
+        # 从下标 lo 起扫描窗口内的候选，多个匹配时取原始下标最小者
+        window = 2 * self.tolerance
+        best: Optional[tuple[int, float]] = None
+        for j in range(lo, len(entries)):
+            key, index, silence_duration = entries[j]
+            if key > target + window:
+                break
+            if abs(key - target) <= self.tolerance and (best is None or index < best[0]):
+                best = (index, silence_duration)
+        return best[1] if best is not None else 0.0
+    
+    def _find_many(
+        self,
+        keys: list[float],
+        entries: list[tuple[float, int, float]],
+        targets: list[float],
+    ) -> list[float]:
+        # targets 非递减时窗口起点单调右移，用指针推进代替逐个二分；乱序时退回二分
+        window = 2 * self.tolerance
+        results: list[float] = []
+        lo = 0
+        prev_target: Optional[float] = None
+        for target in targets:
+            if prev_target is None or target < prev_target:
+                lo = bisect_left(keys, target - window)
+            else:
+                bound = target - window
+                while lo < len(keys) and keys[lo] < bound:
+                    lo += 1
+            prev_target = target
+            results.append(self._scan(entries, target, lo))
+        return results
+    
+    def pre_silence_sec(self, segment_start: float) -> float:
+        """返回结束于 segment_start 的静音时长（没有则为 0.0）"""
+        return self._find(self._end_keys, self._by_end, segment_start)
+    
+    def post_silence_sec(self, segment_end: float) -> float:
+        """返回开始于 segment_end 的静音时长（没有则为 0.0）"""
+        return self._find(self._start_keys, self._by_start, segment_end)
+    
+    def lookup_segments(
+        self,
+        segments: list[tuple[float, float]],
+    ) -> tuple[list[float], list[float]]:
+        """批量查找一组语音段的前后静音时长
+        
+        segments 按 start 升序时为单次线性扫描，复杂度 O(S + N)。
+        
+        Args:
+            segments: 语音段列表，每个元素为 (start, end)
+        
+        Returns:
+            (pre_silence_sec 列表, post_silence_sec 列表)，与 segments 一一对应
+        """
+        pre_values = self._find_many(self._end_keys, self._by_end, [start for start, _ in segments])
+        post_values = self._find_many(self._start_keys, self._by_start, [end for _, end in segments])
+        return pre_values, post_values
@@ -1,11 +1,11 @@
 """策略基类：统一策略接口定义"""
 
-import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+from onepass_audioclean_seg.io.jsonfile import write_json_atomic
 from onepass_audioclean_seg.pipeline.jobs import SegJob
 
 
@@ -36,6 +36,8 @@ class SegmentStrategy(ABC):
     所有策略必须实现 analyze 方法，返回 AnalysisResult。
     """
     
+    artifact_name: Optional[str] = None  # analyze 写出的中间产物文件名（如 "silences.json"）
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -52,13 +54,33 @@ class SegmentStrategy(ABC):
         
         Args:
             job: 分段任务对象
-            params: 参数字典（包含策略相关参数）
+            params: 参数字典（包含策略相关参数；可含 duration_sec_hint，即调用方已知的音频时长；
+                ffmpeg_path_hint / ffprobe_path_hint，即调用方已解析的 ffmpeg / ffprobe 路径）
         
         Returns:
             AnalysisResult 对象，包含 speech_segments_raw 等信息
         """
         pass
     
+    @classmethod
+    def load_artifact(
+        cls,
+        artifact_path: Path,
+        job: SegJob,
+        params: dict[str, Any],
+    ) -> Optional[AnalysisResult]:
+        """从已有的中间产物重建 AnalysisResult（避免重新解码音频）
+        
+        Args:
+            artifact_path: 中间产物路径（如 out_dir / "energy.json"）
+            job: 分段任务对象
+            params: 当前参数字典（策略可据此判断 artifact 是否仍然适用）
+        
+        Returns:
+            AnalysisResult；不支持重建或 artifact 不适用时返回 None（调用方应回退到 analyze）
+        """
+        return None
+    
     def write_artifact(
         self,
         out_dir: Path,
@@ -78,8 +100,8 @@ class SegmentStrategy(ABC):
         out_dir.mkdir(parents=True, exist_ok=True)
         artifact_path = out_dir / artifact_name
         
-        with open(artifact_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 先整体编码再一次性原子写入（不会留下半截的 artifact）
+        write_json_atomic(artifact_path, data)
         
         return artifact_path
 
@@ -1,28 +1,75 @@
 """Energy 策略：基于 RMS 能量的语音/非语音检测"""
 
-import array
 import json
 import logging
-import math
 import wave
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from onepass_audioclean_seg.audio.features import (
+    BATCH_FULL_READ_MAX_BYTES,
+    rms_series_from_pcm16,
+)
 from onepass_audioclean_seg.audio.probe import get_audio_duration_sec
 from onepass_audioclean_seg.pipeline.jobs import SegJob
 from onepass_audioclean_seg.strategies.base import AnalysisResult, SegmentStrategy
-from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# 流式计算 RMS 序列时每块读取的 PCM 字节数（约值，仅在超过整文件读入上限时使用）
+RMS_STREAM_CHUNK_BYTES = 16 * 1024 * 1024
+
 
 class EnergyStrategy(SegmentStrategy):
     """Energy 策略：基于短帧 RMS（能量）判定语音/非语音"""
     
+    artifact_name = "energy.json"
+    
     @property
     def name(self) -> str:
         return "energy"
     
+    @staticmethod
+    def _resolve_params(params: dict[str, Any]) -> dict[str, Any]:
+        """从参数字典取出 energy 策略参数（补齐默认值，键名与 energy.json 的 params 一致）"""
+        return {
+            "frame_ms": params.get("energy_frame_ms", 30.0),
+            "hop_ms": params.get("energy_hop_ms", 10.0),
+            "smooth_ms": params.get("energy_smooth_ms", 100.0),
+            "threshold_rms": params.get("energy_threshold_rms", 0.02),
+            "min_speech_sec": params.get("energy_min_speech_sec", 0.20),
+            "min_silence_sec": params.get("min_silence_sec", 0.35),  # 复用全局参数
+        }
+    
+    @classmethod
+    def load_artifact(
+        cls,
+        artifact_path: Path,
+        job: SegJob,
+        params: dict[str, Any],
+    ) -> Optional[AnalysisResult]:
+        """从 energy.json 重建 AnalysisResult（直接读取其中的 speech_segments_raw）
+        
+        artifact 中记录的参数与当前参数不一致时返回 None，由调用方重新分析。
+        """
+        with open(artifact_path, "r", encoding="utf-8") as f:
+            energy_data = json.load(f)
+        duration_sec = energy_data.get("duration_sec")
+        if not duration_sec or energy_data.get("params") != cls._resolve_params(params):
+            return None
+        
+        speech_segments_raw = [(s, e) for s, e in energy_data.get("speech_segments_raw", [])]
+        stats = dict(energy_data.get("stats", {}))
+        stats["speech_raw_count"] = len(speech_segments_raw)
+        stats["speech_raw_total_sec"] = round(sum(e - s for s, e in speech_segments_raw), 3)
+        return AnalysisResult(
+            strategy="energy",
+            duration_sec=duration_sec,
+            speech_segments_raw=speech_segments_raw,
+            artifacts={"energy.json": artifact_path},
+            stats=stats,
+        )
+    
     def analyze(
         self,
         job: SegJob,
@@ -39,18 +86,22 @@ class EnergyStrategy(SegmentStrategy):
             AnalysisResult 对象
         """
         # 获取参数
-        frame_ms = params.get("energy_frame_ms", 30.0)
-        hop_ms = params.get("energy_hop_ms", 10.0)
-        smooth_ms = params.get("energy_smooth_ms", 100.0)
-        threshold_rms = params.get("energy_threshold_rms", 0.02)
-        min_speech_sec = params.get("energy_min_speech_sec", 0.20)
-        min_silence_sec = params.get("min_silence_sec", 0.35)  # 复用全局参数
-        
-        # 获取音频时长（优先 meta.json，其次 ffprobe，最后从 WAV 文件计算）
-        duration_sec = get_audio_duration_sec(
-            audio_path=job.audio_path,
-            meta_path=job.meta_path,
-        )
+        energy_params = self._resolve_params(params)
+        frame_ms = energy_params["frame_ms"]
+        hop_ms = energy_params["hop_ms"]
+        smooth_ms = energy_params["smooth_ms"]
+        threshold_rms = energy_params["threshold_rms"]
+        min_speech_sec = energy_params["min_speech_sec"]
+        min_silence_sec = energy_params["min_silence_sec"]
+        
+        # 获取音频时长（优先调用方已知的时长，其次 meta.json / ffprobe，最后从 WAV 文件计算）
+        duration_sec = params.get("duration_sec_hint")
+        if duration_sec is None:
+            duration_sec = get_audio_duration_sec(
+                audio_path=job.audio_path,
+                meta_path=job.meta_path,
+                ffprobe_path=params.get("ffprobe_path_hint"),
+            )
         if duration_sec is None:
             # 尝试从 WAV 文件直接计算（energy 策略的备用方案）
             duration_sec = self._get_duration_from_wav(job.audio_path)
@@ -95,16 +146,9 @@ class EnergyStrategy(SegmentStrategy):
         # D) 构建 artifacts（写入 energy.json）
         speech_frames = sum(speech_mask)
         energy_data = {
-            "audio_path": str(job.audio_path.resolve()),
+            "audio_path": job.audio_path_abs,
             "strategy": "energy",
-            "params": {
-                "frame_ms": frame_ms,
-                "hop_ms": hop_ms,
-                "smooth_ms": smooth_ms,
-                "threshold_rms": threshold_rms,
-                "min_speech_sec": min_speech_sec,
-                "min_silence_sec": min_silence_sec,
-            },
+            "params": energy_params,
             "duration_sec": round(duration_sec, 3),
             "speech_segments_raw": [[round(s, 3), round(e, 3)] for s, e in speech_segments_raw],
             "stats": {
@@ -141,7 +185,11 @@ class EnergyStrategy(SegmentStrategy):
         hop_ms: float,
         duration_sec: float,
     ) -> tuple[list[float], list[float]]:
-        """流式计算 RMS 序列
+        """计算 RMS 序列
+        
+        PCM 数据不超过 BATCH_FULL_READ_MAX_BYTES 时整文件读入一次，由 rms_series_from_pcm16
+        按帧移分块累加（重叠帧不重复计算）；否则按约 RMS_STREAM_CHUNK_BYTES 的块顺序读取，
+        逐块交给 rms_series_from_pcm16。两种方式结果一致。
         
         Args:
             audio_path: 音频文件路径
@@ -175,52 +223,36 @@ class EnergyStrategy(SegmentStrategy):
                     logger.warning(f"帧长度或帧移过小: frame_samples={frame_samples}, hop_samples={hop_samples}")
                     return [], []
                 
-                # 流式读取并计算 RMS
-                current_pos = 0
                 total_samples = int(duration_sec * sample_rate)
                 
-                while current_pos < total_samples:
-                    # 计算当前帧的结束位置
-                    frame_end = min(current_pos + frame_samples, total_samples)
-                    n_samples = frame_end - current_pos
-                    
-                    if n_samples <= 0:
-                        break
-                    
-                    # 定位到当前帧
-                    wf.setpos(current_pos)
-                    
-                    # 读取帧数据
-                    frames = wf.readframes(n_samples)
-                    
-                    if len(frames) == 0:
-                        break
-                    
-                    # 转换为 array（int16）
-                    audio_data = array.array("h", frames)
-                    
-                    # 如果是多声道，取平均值
-                    if n_channels > 1:
-                        n_samples_mono = len(audio_data) // n_channels
-                        mono_data = []
-                        for i in range(n_samples_mono):
-                            sample_sum = sum(audio_data[i * n_channels + ch] for ch in range(n_channels))
-                            mono_data.append(sample_sum / n_channels)
-                        audio_data = array.array("h", [int(x) for x in mono_data])
-                    
-                    # 计算 RMS（归一化到 [0, 1]）
-                    if len(audio_data) > 0:
-                        sum_squares = sum(float(x) ** 2 for x in audio_data)
-                        mean_square = sum_squares / len(audio_data)
-                        rms = math.sqrt(mean_square) / 32768.0
-                        rms_series.append(float(rms))
-                        
-                        # 记录帧起始时间
-                        frame_time = current_pos / sample_rate
-                        frame_times.append(frame_time)
-                    
-                    # 移动到下一帧（hop）
-                    current_pos += hop_samples
+                # 整文件一次读入，省去逐帧的 seek 与重叠区间的重复读取
+                if wf.getnframes() * sample_width * n_channels <= BATCH_FULL_READ_MAX_BYTES:
+                    pcm = wf.readframes(wf.getnframes())
+                    rms_series, frame_starts = rms_series_from_pcm16(
+                        pcm, n_channels, frame_samples, hop_samples, total_samples
+                    )
+                    return rms_series, [pos / sample_rate for pos in frame_starts]
+                
+                # 超过整文件读入上限：按块顺序读取，每块覆盖 hops_per_chunk 个帧起点。
+                # 块窗口延伸到最后一帧的结束位置（帧长小于帧移时延伸到下一块起点），
+                # 窗口中未被本块消费的尾部字节留给下一块，全程顺序 readframes，不再 setpos
+                n_file_frames = wf.getnframes()
+                frame_bytes = sample_width * n_channels
+                hops_per_chunk = max(1, RMS_STREAM_CHUNK_BYTES // (hop_samples * frame_bytes))
+                consumed_samples = hops_per_chunk * hop_samples
+                window_samples = consumed_samples + max(0, frame_samples - hop_samples)
+                chunk_start = 0
+                buffer = b""
+                
+                while chunk_start < min(total_samples, n_file_frames):
+                    buffer += wf.readframes(window_samples - len(buffer) // frame_bytes)
+                    chunk_series, chunk_starts = rms_series_from_pcm16(
+                        buffer, n_channels, frame_samples, hop_samples, total_samples - chunk_start
+                    )
+                    rms_series.extend(chunk_series[:hops_per_chunk])
+                    frame_times.extend((chunk_start + pos) / sample_rate for pos in chunk_starts[:hops_per_chunk])
+                    buffer = buffer[consumed_samples * frame_bytes:]
+                    chunk_start += consumed_samples
                 
         except wave.Error as e:
             logger.warning(f"wave 库读取失败: {e}")
@@ -242,6 +274,9 @@ class EnergyStrategy(SegmentStrategy):
     ) -> list[float]:
         """平滑 RMS 序列（简单滑动平均）
         
+        窗口完整的中间帧用一个列表推导批量计算（窗口长度固定，省去逐帧的边界计算），
+        只有两端不足一个窗口的帧单独处理；各帧仍对原窗口切片求和，结果与逐帧计算一致。
+        
         Args:
             rms_series: 原始 RMS 序列
             smooth_ms: 平滑窗口长度（毫秒）
@@ -255,19 +290,21 @@ class EnergyStrategy(SegmentStrategy):
         
         # 计算窗口大小（帧数）
         window_frames = max(1, int(smooth_ms / hop_ms))
-        
-        smoothed = []
+        half = window_frames // 2
+        full = 2 * half + 1  # 完整窗口的帧数
         n = len(rms_series)
         
-        for i in range(n):
-            # 计算窗口范围
-            start_idx = max(0, i - window_frames // 2)
-            end_idx = min(n, i + window_frames // 2 + 1)
-            
-            # 计算平均值
-            window_values = rms_series[start_idx:end_idx]
-            avg = sum(window_values) / len(window_values) if window_values else rms_series[i]
-            smoothed.append(avg)
+        # 开头：窗口被 0 截断
+        head_end = min(half, n)
+        smoothed = [sum(rms_series[:i + half + 1]) / min(n, i + half + 1) for i in range(head_end)]
+        
+        # 中间：完整窗口 [i - half, i + half]
+        if n >= full:
+            smoothed.extend([sum(rms_series[start:start + full]) / full for start in range(n - full + 1)])
+        
+        # 结尾：窗口被 n 截断
+        tail_start = max(head_end, n - half)
+        smoothed.extend(sum(rms_series[i - half:]) / (n - i + half) for i in range(tail_start, n))
         
         return smoothed
     
@@ -301,70 +338,44 @@ class EnergyStrategy(SegmentStrategy):
         if not speech_mask or not frame_times:
             return []
         
-        # 将 mask 转为区间列表（runs）
-        runs = []  # [(start_idx, end_idx, is_speech), ...]
-        current_run_start = 0
-        current_value = speech_mask[0]
-        
-        for i in range(1, len(speech_mask)):
-            if speech_mask[i] != current_value:
-                # 结束当前 run
-                runs.append((current_run_start, i - 1, current_value))
-                current_run_start = i
-                current_value = speech_mask[i]
+        # 将 mask 转为区间列表（runs）：转成 bytes 后用 bytes.find 跳到下一个取值变化处，
+        # Python 层只按 run 循环，不逐帧比较
+        n = len(speech_mask)
+        mask_bytes = bytes(speech_mask)
+        boundaries = [0]
+        pos = 0
+        while True:
+            pos = mask_bytes.find(b"\x00" if mask_bytes[pos] else b"\x01", pos)
+            if pos < 0:
+                break
+            boundaries.append(pos)
+        boundaries.append(n)
         
-        # 添加最后一个 run
-        runs.append((current_run_start, len(speech_mask) - 1, current_value))
-        
-        # 步骤 1: 删除极短 speech runs（< min_speech_sec）
         frame_sec = frame_ms / 1000.0
-        hop_sec = hop_ms / 1000.0
         
-        filtered_runs = []
-        for start_idx, end_idx, is_speech in runs:
+        # 逐 run 一次遍历完成：
+        # 步骤 1: 删除极短 speech runs（< min_speech_sec）
+        # 步骤 2: 填平短 silence gaps（< min_silence_sec），翻转为 speech
+        # 步骤 3: 合并连续的相同类型 runs
+        merged_runs = []  # [(start_idx, end_idx, is_speech), ...]
+        for start_idx, next_start in zip(boundaries, boundaries[1:]):
+            end_idx = next_start - 1
+            is_speech = speech_mask[start_idx]
+            
+            # 计算 run 的时长
+            run_duration = frame_times[end_idx] + frame_sec - frame_times[start_idx]
             if is_speech:
-                # 计算 run 的时长
-                run_start_time = frame_times[start_idx]
-                run_end_time = frame_times[end_idx] + frame_sec
-                run_duration = run_end_time - run_start_time
-                
-                if run_duration >= min_speech_sec:
-                    filtered_runs.append((start_idx, end_idx, is_speech))
-                # 否则丢弃（标记为非语音）
-            else:
-                filtered_runs.append((start_idx, end_idx, is_speech))
-        
-        # 步骤 2: 填平短 silence gaps（< min_silence_sec）
-        filled_runs = []
-        for i, (start_idx, end_idx, is_speech) in enumerate(filtered_runs):
-            if not is_speech:
-                # 计算 silence run 的时长
-                run_start_time = frame_times[start_idx]
-                run_end_time = frame_times[end_idx] + frame_sec
-                run_duration = run_end_time - run_start_time
-                
-                if run_duration < min_silence_sec:
-                    # 填平：翻转为 speech
-                    filled_runs.append((start_idx, end_idx, True))
-                else:
-                    filled_runs.append((start_idx, end_idx, False))
+                if run_duration < min_speech_sec:
+                    continue  # 丢弃（标记为非语音）
+            elif run_duration < min_silence_sec:
+                is_speech = True  # 填平
+            
+            if merged_runs and merged_runs[-1][2] == is_speech:
+                merged_runs[-1] = (merged_runs[-1][0], end_idx, is_speech)
             else:
-                filled_runs.append((start_idx, end_idx, is_speech))
-        
-        # 合并连续的相同类型 runs
-        merged_runs = []
-        for start_idx, end_idx, is_speech in filled_runs:
-            if not merged_runs:
                 merged_runs.append((start_idx, end_idx, is_speech))
-            else:
-                last_start, last_end, last_is_speech = merged_runs[-1]
-                if is_speech == last_is_speech:
-                    # 合并
-                    merged_runs[-1] = (last_start, end_idx, is_speech)
-                else:
-                    merged_runs.append((start_idx, end_idx, is_speech))
-        
-        # 提取 speech segments
+        
+        # 提取 speech segments（merged_runs 按帧序排列，结果已按 start 升序）
         segments = []
         for start_idx, end_idx, is_speech in merged_runs:
             if is_speech:
@@ -373,9 +384,6 @@ class EnergyStrategy(SegmentStrategy):
                 if seg_end > seg_start:
                     segments.append((round(seg_start, 3), round(seg_end, 3)))
         
-        # 按 start 排序
-        segments.sort(key=lambda x: x[0])
-        
         return segments
     
     def _get_duration_from_wav(self, audio_path: Path) -> Optional[float]:
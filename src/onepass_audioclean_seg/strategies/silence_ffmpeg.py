@@ -3,28 +3,22 @@
 import json
 import logging
 import re
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
 from onepass_audioclean_seg.audio.ffmpeg import run_cmd, which
-from onepass_audioclean_seg.audio.probe import get_audio_duration_sec
+from onepass_audioclean_seg.audio.probe import get_audio_duration_sec, read_duration_from_meta
 from onepass_audioclean_seg.pipeline.jobs import SegJob
-from onepass_audioclean_seg.pipeline.segments_from_silence import complement_to_speech_segments, normalize_intervals
+from onepass_audioclean_seg.pipeline.segments_from_silence import (
+    SilenceInterval,
+    complement_to_speech_segments,
+    normalize_intervals,
+)
 from onepass_audioclean_seg.strategies.base import AnalysisResult, SegmentStrategy
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
-class SilenceInterval:
-    """静音区间"""
-    
-    start_sec: float
-    end_sec: float
-    duration_sec: float
-
-
 def build_silencedetect_cmd(
     ffmpeg_path: str,
     audio_path: Path,
@@ -41,15 +35,30 @@ def build_silencedetect_cmd(
     
     Returns:
         命令列表
+    
+    Note:
+        -vn/-sn/-dn 跳过视频、字幕、数据流，避免对带封面或视频轨的输入做无用解码。
+        不能使用 -loglevel error：silencedetect 的结果以 info 级别输出到 stderr。
+        -progress pipe:1 在 stdout 输出 out_time_us，用于在同一次解码中得到音频时长
+        （见 parse_progress_duration），省去单独的 ffprobe 调用。
+        -c:a pcm_s16le 显式固定 null 输出的编码器，与 Repo1 输出的 16-bit PCM 一致，
+        滤镜链无需做采样格式转换。
     """
     return [
         ffmpeg_path,
         "-hide_banner",
         "-nostats",
+        "-progress",
+        "pipe:1",
         "-i",
         str(audio_path),
+        "-vn",
+        "-sn",
+        "-dn",
         "-af",
         f"silencedetect=noise={threshold_db}dB:d={min_silence_sec}",
+        "-c:a",
+        "pcm_s16le",
         "-f",
         "null",
         "-",
@@ -104,6 +113,33 @@ def run_silencedetect(
         raise RuntimeError(f"运行 silencedetect 时发生未预期错误: {e}") from e
 
 
+_SILENCE_START_RE = re.compile(r"silence_start:\s*([\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*([\d.]+)")
+_SILENCE_DURATION_RE = re.compile(r"silence_duration:\s*([\d.]+)")
+_PROGRESS_OUT_TIME_RE = re.compile(r"^out_time_us=(\d+)\s*$", re.MULTILINE)
+
+
+def parse_progress_duration(text: str) -> Optional[float]:
+    """从 -progress 输出中解析已解码的音频时长
+    
+    取最后一个 out_time_us（即解码结束时的输出时间戳），对 PCM WAV 与 ffprobe
+    的 format=duration 一致。
+    
+    Args:
+        text: ffmpeg 输出文本（stdout + stderr 合并）
+    
+    Returns:
+        音频时长（秒），若未找到有效的 out_time_us 则返回 None
+    """
+    matches = _PROGRESS_OUT_TIME_RE.findall(text)
+    if not matches:
+        return None
+    duration_us = int(matches[-1])
+    if duration_us <= 0:
+        return None
+    return duration_us / 1_000_000
+
+
 def parse_silencedetect_output(
     text: str,
     audio_duration_sec: Optional[float] = None,
@@ -120,14 +156,13 @@ def parse_silencedetect_output(
     intervals = []
     pending_start: Optional[float] = None
     
-    # 按行解析
+    # 按行解析（绝大多数行是流信息 / progress 输出，先用子串判断跳过，不走正则）
     for line in text.splitlines():
-        line = line.strip()
-        if not line:
+        if "silence_" not in line:
             continue
         
         # 匹配 silence_start
-        start_match = re.search(r"silence_start:\s*([\d.]+)", line)
+        start_match = _SILENCE_START_RE.search(line)
         if start_match:
             start_sec = float(start_match.group(1))
             # 如果已有 pending_start，记录警告但继续
@@ -137,12 +172,12 @@ def parse_silencedetect_output(
             continue
         
         # 匹配 silence_end
-        end_match = re.search(r"silence_end:\s*([\d.]+)", line)
+        end_match = _SILENCE_END_RE.search(line)
         if end_match:
             end_sec = float(end_match.group(1))
             if pending_start is not None:
                 # 尝试从同一行提取 duration（如果有）
-                duration_match = re.search(r"silence_duration:\s*([\d.]+)", line)
+                duration_match = _SILENCE_DURATION_RE.search(line)
                 if duration_match:
                     duration_sec = float(duration_match.group(1))
                 else:
@@ -207,10 +242,48 @@ def parse_silencedetect_output(
 class SilenceStrategy(SegmentStrategy):
     """Silence 策略：基于 ffmpeg silencedetect 的静音检测"""
     
+    artifact_name = "silences.json"
+    
     @property
     def name(self) -> str:
         return "silence"
     
+    @classmethod
+    def load_artifact(
+        cls,
+        artifact_path: Path,
+        job: SegJob,
+        params: dict[str, Any],
+    ) -> Optional[AnalysisResult]:
+        """从 silences.json 重建 AnalysisResult（静音区间 -> 规范化 -> 补集）
+        
+        兼容单独运行 emit 的场景：直接使用已有的静音区间，不比对当前参数。
+        """
+        with open(artifact_path, "r", encoding="utf-8") as f:
+            silences_data = json.load(f)
+        duration_sec = silences_data.get("duration_sec")
+        if not duration_sec:
+            return None
+        
+        silence_intervals = [
+            SilenceInterval(
+                start_sec=item["start_sec"],
+                end_sec=item["end_sec"],
+                duration_sec=item["duration_sec"],
+            )
+            for item in silences_data.get("silences", [])
+        ]
+        normalized_silences = normalize_intervals(silence_intervals, duration_sec)
+        speech_segments_raw = complement_to_speech_segments(normalized_silences, duration_sec)
+        return AnalysisResult(
+            strategy="silence",
+            duration_sec=duration_sec,
+            speech_segments_raw=speech_segments_raw,
+            nonspeech_segments_raw=[(s.start_sec, s.end_sec) for s in normalized_silences],
+            artifacts={"silences.json": artifact_path},
+            stats=silences_data.get("params", {}),
+        )
+    
     def analyze(
         self,
         job: SegJob,
@@ -229,19 +302,11 @@ class SilenceStrategy(SegmentStrategy):
         threshold_db = params.get("silence_threshold_db", -35.0)
         min_silence_sec = params.get("min_silence_sec", 0.35)
         
-        # 获取 ffmpeg 路径
-        ffmpeg_path = which("ffmpeg")
+        # 获取 ffmpeg 路径（优先调用方已解析的路径）
+        ffmpeg_path = params.get("ffmpeg_path_hint") or which("ffmpeg")
         if ffmpeg_path is None:
             raise RuntimeError("ffmpeg 未找到，无法运行 silence 策略")
         
-        # 获取音频时长
-        duration_sec = get_audio_duration_sec(
-            audio_path=job.audio_path,
-            meta_path=job.meta_path,
-        )
-        if duration_sec is None:
-            raise RuntimeError("无法获取音频时长（需要 meta.json 或 ffprobe）")
-        
         # 运行 silencedetect
         output_text = run_silencedetect(
             ffmpeg_path=ffmpeg_path,
@@ -250,6 +315,20 @@ class SilenceStrategy(SegmentStrategy):
             min_silence_sec=min_silence_sec,
         )
         
+        # 获取音频时长（优先调用方已知的时长 / meta.json，其次同一次 ffmpeg 的解码时长，最后 ffprobe）
+        duration_sec = params.get("duration_sec_hint")
+        if duration_sec is None:
+            duration_sec = read_duration_from_meta(job.meta_path)
+        if duration_sec is None:
+            duration_sec = parse_progress_duration(output_text)
+        if duration_sec is None:
+            duration_sec = get_audio_duration_sec(
+                audio_path=job.audio_path,
+                ffprobe_path=params.get("ffprobe_path_hint"),
+            )
+        if duration_sec is None:
+            raise RuntimeError("无法获取音频时长（需要 meta.json 或 ffprobe）")
+        
         # 解析输出
         silence_intervals = parse_silencedetect_output(output_text, duration_sec)
         
@@ -261,7 +340,7 @@ class SilenceStrategy(SegmentStrategy):
         
         # 构建 artifacts（写入 silences.json）
         silences_data = {
-            "audio_path": str(job.audio_path.resolve()),
+            "audio_path": job.audio_path_abs,
             "strategy": "silence",
             "params": {
                 "silence_threshold_db": threshold_db,
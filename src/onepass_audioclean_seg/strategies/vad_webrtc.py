@@ -3,7 +3,7 @@
 import json
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from onepass_audioclean_seg.audio.ffmpeg import which
 from onepass_audioclean_seg.audio.probe import get_audio_duration_sec
@@ -35,10 +35,59 @@ def _import_webrtcvad():
 class VadStrategy(SegmentStrategy):
     """VAD 策略：基于 webrtcvad 的语音活动检测"""
     
+    artifact_name = "vad.json"
+    
     @property
     def name(self) -> str:
         return "vad"
     
+    @staticmethod
+    def _resolve_params(params: dict[str, Any]) -> dict[str, Any]:
+        """从参数字典取出 vad 策略参数（补齐默认值，键名与 vad.json 的 params 一致）"""
+        return {
+            "vad_aggressiveness": params.get("vad_aggressiveness", 2),
+            "vad_frame_ms": params.get("vad_frame_ms", 30),
+            "vad_sample_rate": params.get("vad_sample_rate", 16000),
+            "vad_min_speech_sec": params.get("vad_min_speech_sec", 0.20),
+            "min_silence_sec": params.get("min_silence_sec", 0.35),  # 复用全局参数
+        }
+    
+    @classmethod
+    def load_artifact(
+        cls,
+        artifact_path: Path,
+        job: SegJob,
+        params: dict[str, Any],
+    ) -> Optional[AnalysisResult]:
+        """从 vad.json 重建 AnalysisResult（直接读取其中的 speech_segments_raw，无需 webrtcvad）
+        
+        artifact 中记录的参数与当前参数不一致时返回 None，由调用方重新分析。
+        """
+        with open(artifact_path, "r", encoding="utf-8") as f:
+            vad_data = json.load(f)
+        duration_sec = vad_data.get("duration_sec")
+        vad_params = cls._resolve_params(params)
+        if not duration_sec or vad_data.get("params") != vad_params:
+            return None
+        
+        speech_segments_raw = [(s, e) for s, e in vad_data.get("speech_segments_raw", [])]
+        stats = {
+            "frames": vad_data.get("frames", 0),
+            "speech_frames": vad_data.get("speech_frames", 0),
+            "aggressiveness": vad_params["vad_aggressiveness"],
+            "frame_ms": vad_params["vad_frame_ms"],
+            "sample_rate": vad_params["vad_sample_rate"],
+            "speech_raw_count": len(speech_segments_raw),
+            "speech_raw_total_sec": round(sum(e - s for s, e in speech_segments_raw), 3),
+        }
+        return AnalysisResult(
+            strategy="vad",
+            duration_sec=duration_sec,
+            speech_segments_raw=speech_segments_raw,
+            artifacts={"vad.json": artifact_path},
+            stats=stats,
+        )
+    
     def analyze(
         self,
         job: SegJob,
@@ -61,11 +110,12 @@ class VadStrategy(SegmentStrategy):
         webrtcvad = _import_webrtcvad()
         
         # 获取参数
-        aggressiveness = params.get("vad_aggressiveness", 2)
-        frame_ms = params.get("vad_frame_ms", 30)
-        sample_rate = params.get("vad_sample_rate", 16000)
-        min_speech_sec = params.get("vad_min_speech_sec", 0.20)
-        min_silence_sec = params.get("min_silence_sec", 0.35)  # 复用全局参数
+        vad_params = self._resolve_params(params)
+        aggressiveness = vad_params["vad_aggressiveness"]
+        frame_ms = vad_params["vad_frame_ms"]
+        sample_rate = vad_params["vad_sample_rate"]
+        min_speech_sec = vad_params["vad_min_speech_sec"]
+        min_silence_sec = vad_params["min_silence_sec"]
         
         # 参数验证
         if aggressiveness not in [0, 1, 2, 3]:
@@ -75,16 +125,19 @@ class VadStrategy(SegmentStrategy):
         if sample_rate not in [8000, 16000, 32000, 48000]:
             raise ValueError(f"vad_sample_rate 必须是 8000/16000/32000/48000，当前值: {sample_rate}")
         
-        # 获取音频时长
-        duration_sec = get_audio_duration_sec(
-            audio_path=job.audio_path,
-            meta_path=job.meta_path,
-        )
+        # 获取音频时长（优先调用方已知的时长）
+        duration_sec = params.get("duration_sec_hint")
+        if duration_sec is None:
+            duration_sec = get_audio_duration_sec(
+                audio_path=job.audio_path,
+                meta_path=job.meta_path,
+                ffprobe_path=params.get("ffprobe_path_hint"),
+            )
         if duration_sec is None:
             raise RuntimeError("无法获取音频时长（需要 meta.json 或 ffprobe）")
         
-        # 获取 ffmpeg 路径（用于音频转换）
-        ffmpeg_path = which("ffmpeg")
+        # 获取 ffmpeg 路径（用于音频转换；优先调用方已解析的路径）
+        ffmpeg_path = params.get("ffmpeg_path_hint") or which("ffmpeg")
         
         # 获取 PCM16 mono frames
         try:
@@ -143,15 +196,9 @@ class VadStrategy(SegmentStrategy):
         # 构建 artifacts（写入 vad.json）
         speech_frames = sum(speech_mask)
         vad_data = {
-            "audio_path": str(job.audio_path.resolve()),
+            "audio_path": job.audio_path_abs,
             "strategy": "vad",
-            "params": {
-                "vad_aggressiveness": aggressiveness,
-                "vad_frame_ms": frame_ms,
-                "vad_sample_rate": sample_rate,
-                "vad_min_speech_sec": min_speech_sec,
-                "min_silence_sec": min_silence_sec,
-            },
+            "params": vad_params,
             "duration_sec": round(duration_sec, 3),
             "frame_ms": frame_ms,
             "frames": frame_count,
@@ -42,11 +42,12 @@ def get_rel_key(path: Path, base: Optional[Path] = None) -> str:
     return str(path.resolve())
 
 
+# 不安全字符 -> "_" 的转换表（str.translate 一次遍历完成全部替换）
+_UNSAFE_PATH_CHARS_TABLE = str.maketrans({char: "_" for char in '/\\:*?"<>|'})
+
+
 def sanitize_path_component(component: str) -> str:
     """清理路径组件，移除不安全字符"""
-    # 移除或替换不安全字符
-    unsafe_chars = ["/", "\\", ":", "*", "?", '"', "<", ">", "|"]
-    for char in unsafe_chars:
-        component = component.replace(char, "_")
-    return component
+    # 将不安全字符替换为 "_"
+    return component.translate(_UNSAFE_PATH_CHARS_TABLE)
 
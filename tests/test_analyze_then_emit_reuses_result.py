@@ -0,0 +1,72 @@
+"""测试 --analyze --emit-segments 复用 analyze 结果，输出与单独 emit 一致"""
+
+import array
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import pytest
+
+from onepass_audioclean_seg.audio.ffmpeg import which
+
+
+def create_test_wav(path: Path, sample_rate: int = 16000):
+    """创建测试 WAV 文件（语音 - 静音 - 语音 - 静音 - 语音）"""
+    second = sample_rate
+    audio_data = array.array(
+        "h",
+        [8000] * second + [0] * second + [8000] * second + [0] * second + [8000] * second,
+    )
+    
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+
+
+def run_segment(in_root: Path, out_root: Path, extra_args: list[str]) -> subprocess.CompletedProcess:
+    """运行 segment 命令（silence 策略）"""
+    return subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "onepass_audioclean_seg",
+            "segment",
+            "--in",
+            str(in_root),
+            "--out",
+            str(out_root),
+            "--out-mode",
+            "out_root",
+            "--strategy",
+            "silence",
+            "--emit-segments",
+        ] + extra_args,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_analyze_then_emit_matches_emit_only():
+    """测试 --analyze --emit-segments 与仅 --emit-segments 生成相同的 segments.jsonl"""
+    if which("ffmpeg") is None:
+        pytest.skip("ffmpeg 不存在，跳过 silence 策略测试")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        workdir = tmpdir_path / "in" / "a"
+        workdir.mkdir(parents=True)
+        create_test_wav(workdir / "audio.wav")
+        
+        emit_only = run_segment(tmpdir_path / "in", tmpdir_path / "out_emit", [])
+        with_analyze = run_segment(tmpdir_path / "in", tmpdir_path / "out_analyze", ["--analyze"])
+        
+        assert emit_only.returncode == 0, emit_only.stderr
+        assert with_analyze.returncode == 0, with_analyze.stderr
+        
+        emit_path = tmpdir_path / "out_emit" / "a" / "seg" / "segments.jsonl"
+        analyze_path = tmpdir_path / "out_analyze" / "a" / "seg" / "segments.jsonl"
+        assert analyze_path.read_text(encoding="utf-8") == emit_path.read_text(encoding="utf-8")
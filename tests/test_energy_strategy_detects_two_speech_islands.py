@@ -116,3 +116,46 @@ def test_energy_strategy_detects_two_speech_islands():
         assert "frames" in result.stats
         assert result.stats["frames"] > 0
 
+
+def test_energy_strategy_load_artifact_reuses_energy_json():
+    """测试 energy.json 可重建 AnalysisResult；参数变化时不复用"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        audio_path = tmpdir_path / "test.wav"
+        out_dir = tmpdir_path / "out"
+        create_test_wav(audio_path, [(0.0, 0.5, 0.0), (0.5, 1.0, 0.5), (1.0, 1.5, 0.0), (1.5, 2.0, 0.5)])
+        job = SegJob(
+            job_id="test_job",
+            input_type="file",
+            workdir=None,
+            audio_path=audio_path,
+            meta_path=None,
+            out_dir=out_dir,
+            rel_key="test",
+        )
+        params = {"energy_threshold_rms": 0.02}
+        
+        result = EnergyStrategy().analyze(job, params)
+        loaded = EnergyStrategy.load_artifact(out_dir / EnergyStrategy.artifact_name, job, params)
+        
+        assert loaded is not None
+        assert loaded.speech_segments_raw == [(round(s, 3), round(e, 3)) for s, e in result.speech_segments_raw]
+        assert loaded.duration_sec == result.duration_sec
+        assert loaded.stats == result.stats
+        
+        # 阈值变化后 artifact 不再适用
+        assert EnergyStrategy.load_artifact(out_dir / "energy.json", job, {"energy_threshold_rms": 0.05}) is None
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 4, 5, 6, 40])
+@pytest.mark.parametrize("smooth_ms", [10.0, 30.0, 50.0, 60.0])
+def test_smooth_rms_matches_per_frame_window(n, smooth_ms):
+    """测试滑动平均（含两端截断窗口）与逐帧按窗口切片求平均的结果逐位一致"""
+    rms_series = [((i * 37) % 11) / 7.0 for i in range(n)]
+    half = max(1, int(smooth_ms / 10.0)) // 2
+    expected = []
+    for i in range(n):
+        window = rms_series[max(0, i - half):min(n, i + half + 1)]
+        expected.append(sum(window) / len(window))
+    
+    assert EnergyStrategy()._smooth_rms(rms_series, smooth_ms, 10.0) == expected
@@ -0,0 +1,50 @@
+"""测试批量导出 WAV 片段"""
+
+import array
+import wave
+from pathlib import Path
+
+import pytest
+
+from onepass_audioclean_seg.audio.extract import extract_wav_segment, extract_wav_segments_batch
+from onepass_audioclean_seg.audio.ffmpeg import which
+
+
+def create_test_wav(path: Path, duration_sec: float = 3.0, sample_rate: int = 16000):
+    """创建测试 WAV 文件（锯齿波，保证各片段内容不同）"""
+    n_samples = int(duration_sec * sample_rate)
+    audio_data = array.array("h", [(i % 2000) * 10 - 10000 for i in range(n_samples)])
+    
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_extract_wav_segments_batch_matches_single(tmp_path, max_workers):
+    """测试批量导出（含多批并发）与逐段导出的 WAV 逐字节一致，无效片段判失败"""
+    if which("ffmpeg") is None:
+        pytest.skip("ffmpeg 不存在，跳过 WAV 导出测试")
+    
+    audio_path = tmp_path / "audio.wav"
+    create_test_wav(audio_path)
+    
+    segments = [(0.0, 0.5), (0.123, 1.456), (2.0, 3.0), (1.0, 1.0)]
+    batch_dir = tmp_path / "batch"
+    single_dir = tmp_path / "single"
+    batch_dir.mkdir()
+    single_dir.mkdir()
+    
+    # batch_size=2 覆盖多批次
+    items = [(batch_dir / f"seg_{i:06d}.wav", start, end) for i, (start, end) in enumerate(segments, start=1)]
+    results = extract_wav_segments_batch(audio_path, items, batch_size=2, max_workers=max_workers)
+    
+    assert results == [True, True, True, False]
+    for i, (start, end) in enumerate(segments[:3], start=1):
+        single_path = single_dir / f"seg_{i:06d}.wav"
+        assert extract_wav_segment(audio_path, single_path, start, end)
+        assert (batch_dir / f"seg_{i:06d}.wav").read_bytes() == single_path.read_bytes()
+    
+    assert extract_wav_segments_batch(audio_path, []) == []
@@ -7,6 +7,8 @@ import pytest
 
 from onepass_audioclean_seg.io.segments import SegmentRecord, write_segments_jsonl
 from onepass_audioclean_seg.pipeline.segment_flags import (
+    RawIndexLookup,
+    compute_flags_batch,
     compute_flags_for_segment,
     track_postprocess_history,
 )
@@ -122,3 +124,70 @@ def test_segment_record_flags_serialization():
         expected_order = ["split_from_long", "merged_short", "edge_clipped", "low_energy"]
         assert data["flags"] == expected_order
 
+
+def test_raw_index_lookup_matches_linear_scan():
+    """测试 RawIndexLookup 与原线性扫描结果一致（容差内匹配，取最小序号）"""
+    speech_segments = [(0.0, 1.0), (1.5, 2.0), (1.505, 2.004), (3.0199, 4.0), (5.0, 6.0)]
+    queries = [
+        (0.0, 1.0), (0.009, 0.991), (1.5, 2.0), (1.509, 2.009),
+        (3.01, 4.0), (3.03, 4.0), (5.0, 6.02), (7.0, 8.0),
+    ]
+    
+    def linear(start, end):
+        for i, (raw_start, raw_end) in enumerate(speech_segments):
+            if abs(raw_start - start) < 0.01 and abs(raw_end - end) < 0.01:
+                return i
+        return None
+    
+    lookup = RawIndexLookup(speech_segments)
+    for start, end in queries:
+        assert lookup.find(start, end) == linear(start, end)
+
+
+def test_compute_flags_batch_matches_per_segment():
+    """测试批量计算 flags 与逐段调用 compute_flags_for_segment 结果一致"""
+    duration_sec = 10.0
+    segments = [(0.0, 2.0), (2.5, 4.0), (4.5, 7.0), (8.0, 10.0)]
+    rms_values = [0.5, 0.005, None, 0.001]
+    history_flags = [["merged_short"], [], ["split_from_long"], []]
+    
+    batch = compute_flags_batch(segments, duration_sec, rms_values, 0.01, history_flags=history_flags)
+    expected = [
+        compute_flags_for_segment(seg, duration_sec, rms, 0.01, history_flags=history)
+        for seg, rms, history in zip(segments, rms_values, history_flags)
+    ]
+    assert batch == expected
+    # 不修改传入的历史 flags
+    assert history_flags == [["merged_short"], [], ["split_from_long"], []]
+    
+    assert compute_flags_batch(segments, duration_sec, rms_values, 0.01) == [
+        compute_flags_for_segment(seg, duration_sec, rms, 0.01) for seg, rms in zip(segments, rms_values)
+    ]
+
+
+def test_track_postprocess_history_matches_pairwise_scan():
+    """测试二分查找路径与逐对比较结果一致（含 before 段相互嵌套、end 不单调的情况）"""
+    def pairwise(segments_before, segments_after, operation):
+        expected = {}
+        for seg_after in segments_after:
+            if operation == "split":
+                hit = any(
+                    b[0] <= seg_after[0] < seg_after[1] <= b[1] and (b[1] - b[0]) > (seg_after[1] - seg_after[0])
+                    for b in segments_before
+                )
+                expected[seg_after] = ["split_from_long"] if hit else []
+            else:
+                covered = sum(1 for b in segments_before if not (b[1] <= seg_after[0] or seg_after[1] <= b[0]))
+                expected[seg_after] = ["merged_short"] if covered > 1 else []
+        return expected
+    
+    cases = [
+        # 后处理输出：按 start 升序且不重叠
+        ([(0.0, 0.3), (0.5, 2.0), (2.0, 2.4), (3.0, 10.0)], [(0.0, 2.4), (3.0, 6.0), (6.0, 10.0), (12.0, 13.0)]),
+        # before 段嵌套（end 不单调），退回逐对比较
+        ([(0.0, 10.0), (1.0, 2.0), (1.5, 3.0)], [(1.0, 2.0), (1.2, 1.8), (0.0, 10.0), (2.5, 4.0)]),
+    ]
+    for segments_before, segments_after in cases:
+        for operation in ("split", "merge"):
+            flags_map = track_postprocess_history(segments_before, segments_after, operation)
+            assert dict(flags_map) == pairwise(segments_before, segments_after, operation)
@@ -0,0 +1,107 @@
+"""测试 JSON / 文本文件原子写入"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from onepass_audioclean_seg.io.jsonfile import write_json_atomic, write_lines_atomic, write_text_atomic
+
+
+def test_write_json_atomic_replaces_content():
+    """测试写入后内容完整且不残留临时文件"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "seg_report.json"
+        path.write_text("old", encoding="utf-8")
+        
+        write_json_atomic(path, {"name": "片段", "count": 2})
+        
+        assert json.loads(path.read_text(encoding="utf-8")) == {"name": "片段", "count": 2}
+        assert "片段" in path.read_text(encoding="utf-8")  # ensure_ascii=False
+        assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["seg_report.json"]
+
+
+def test_write_json_atomic_keeps_old_file_on_failure():
+    """测试编码失败时目标文件保持原内容"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "silences.json"
+        write_text_atomic(path, '{"ok": true}')
+        
+        with pytest.raises(TypeError):
+            write_json_atomic(path, {"bad": object()})
+        
+        assert path.read_text(encoding="utf-8") == '{"ok": true}'
+        assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["silences.json"]
+
+
+def test_write_lines_atomic_keeps_old_file_when_generator_fails():
+    """测试流式写入：生成器中途抛错时目标文件保持原内容且不残留临时文件"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "segments.jsonl"
+        write_lines_atomic(path, ('{"id": "seg_000001"}\n', '{"id": "seg_000002"}\n'))
+        assert path.read_text(encoding="utf-8").count("\n") == 2
+        
+        def _lines():
+            yield '{"id": "seg_000001"}\n'
+            raise RuntimeError("boom")
+        
+        with pytest.raises(RuntimeError):
+            write_lines_atomic(path, _lines())
+        
+        assert path.read_text(encoding="utf-8").count("\n") == 2
+        assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["segments.jsonl"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_json_indented_matches_stdlib_layout(monkeypatch, use_orjson):
+    """测试 orjson / 标准库两种编码输出的缩进布局一致"""
+    from onepass_audioclean_seg.io import jsonfile
+    
+    if use_orjson and jsonfile.orjson is None:
+        pytest.skip("orjson 未安装")
+    if not use_orjson:
+        monkeypatch.setattr(jsonfile, "orjson", None)
+    
+    data = {"name": "片段", "series": [{"t_sec": 0.05, "speech_ratio": 0.5}], "empty": {}, "none": None}
+    assert jsonfile.dumps_json_indented(data) == json.dumps(data, ensure_ascii=False, indent=2)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_json_accepts_bytes_and_str(monkeypatch, use_orjson):
+    """测试 loads_json 对 bytes / str 的解析结果一致，解析失败抛出 JSONDecodeError"""
+    from onepass_audioclean_seg.io import jsonfile
+    
+    if use_orjson and jsonfile.orjson is None:
+        pytest.skip("orjson 未安装")
+    if not use_orjson:
+        monkeypatch.setattr(jsonfile, "orjson", None)
+    
+    line = '{"workdir": "/data/片段", "success": true, "n": 3}'
+    expected = json.loads(line)
+    assert jsonfile.loads_json(line) == expected
+    assert jsonfile.loads_json(line.encode("utf-8")) == expected
+    with pytest.raises(json.JSONDecodeError):
+        jsonfile.loads_json(b'{"workdir": ')
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_non_finite_floats_round_trip(monkeypatch, use_orjson):
+    """测试含 NaN / Infinity 的数据在 orjson / 标准库两种环境下写出一致且能读回"""
+    import math
+    
+    from onepass_audioclean_seg.io import jsonfile
+    
+    if use_orjson and jsonfile.orjson is None:
+        pytest.skip("orjson 未安装")
+    if not use_orjson:
+        monkeypatch.setattr(jsonfile, "orjson", None)
+    
+    data = {"rms": float("nan"), "series": [{"energy_db": float("-inf")}], "error": None}
+    text = jsonfile.dumps_json_indented(data)
+    assert text == json.dumps(data, ensure_ascii=False, indent=2)
+    
+    loaded = jsonfile.loads_json(text.encode("utf-8"))
+    assert math.isnan(loaded["rms"])
+    assert loaded["series"][0]["energy_db"] == float("-inf")
+    assert loaded["error"] is None
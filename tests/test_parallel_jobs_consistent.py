@@ -0,0 +1,117 @@
+"""测试 --jobs > 1 并行执行时输出与串行一致"""
+
+import array
+import os
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+
+def create_test_wav(path: Path, duration_sec: float = 2.0, sample_rate: int = 16000):
+    """创建测试 WAV 文件（中间一段静音）"""
+    n_samples = int(duration_sec * sample_rate)
+    third = n_samples // 3
+    audio_data = array.array("h", [8000] * third + [0] * third + [8000] * (n_samples - 2 * third))
+    
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+
+
+def run_segment(in_root: Path, out_root: Path, jobs: int) -> subprocess.CompletedProcess:
+    """运行 segment 命令（energy 策略，不依赖 ffmpeg）"""
+    return subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "onepass_audioclean_seg",
+            "segment",
+            "--in",
+            str(in_root),
+            "--out",
+            str(out_root),
+            "--out-mode",
+            "out_root",
+            "--strategy",
+            "energy",
+            "--min-seg-sec",
+            "0.2",
+            "--emit-segments",
+            "--jobs",
+            str(jobs),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_parallel_jobs_match_serial_output():
+    """测试 --jobs 3 与 --jobs 1 生成相同的 segments.jsonl，且 stdout 按 job 顺序输出"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        in_root = tmpdir_path / "in"
+        names = ["a", "b", "c", "d"]
+        for name in names:
+            workdir = in_root / name
+            workdir.mkdir(parents=True)
+            create_test_wav(workdir / "audio.wav")
+        
+        serial = run_segment(in_root, tmpdir_path / "out_serial", jobs=1)
+        parallel = run_segment(in_root, tmpdir_path / "out_parallel", jobs=3)
+        
+        assert serial.returncode == 0, serial.stderr
+        assert parallel.returncode == 0, parallel.stderr
+        
+        # stdout 行顺序一致（仅输出目录不同）
+        serial_lines = serial.stdout.replace("out_serial", "OUT").splitlines()
+        parallel_lines = parallel.stdout.replace("out_parallel", "OUT").splitlines()
+        assert serial_lines == parallel_lines
+        assert sum(1 for line in parallel_lines if line.startswith("EMIT ")) == len(names)
+        
+        for name in names:
+            serial_path = tmpdir_path / "out_serial" / name / "seg" / "segments.jsonl"
+            parallel_path = tmpdir_path / "out_parallel" / name / "seg" / "segments.jsonl"
+            assert parallel_path.read_text(encoding="utf-8") == serial_path.read_text(encoding="utf-8")
+
+
+def test_parallel_jobs_interleaved_skip_order_matches_serial():
+    """测试跳过与执行的 job 交错时，--jobs 3 的 SKIP 行与各 job 输出仍按输入顺序排列"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        in_root = tmpdir_path / "in"
+        names = ["a", "b", "c", "d", "e"]
+        for name in names:
+            workdir = in_root / name
+            workdir.mkdir(parents=True)
+            create_test_wav(workdir / "audio.wav")
+        
+        stdouts = {}
+        for out_name, jobs in (("out_serial", 1), ("out_parallel", 3)):
+            out_root = tmpdir_path / out_name
+            first = run_segment(in_root, out_root, jobs=1)
+            assert first.returncode == 0, first.stderr
+            # 删除 b、d 的输出：第二次运行时 a、c、e 跳过，b、d 重新执行
+            for name in ("b", "d"):
+                (out_root / name / "seg" / "segments.jsonl").unlink()
+            second = run_segment(in_root, out_root, jobs=jobs)
+            assert second.returncode == 0, second.stderr
+            stdouts[out_name] = second.stdout.replace(out_name, "OUT").splitlines()
+        
+        assert stdouts["out_parallel"] == stdouts["out_serial"]
+        assert [line.split()[0] for line in stdouts["out_parallel"] if line.startswith(("SKIP ", "EMIT "))] == [
+            "SKIP", "EMIT", "SKIP", "EMIT", "SKIP",
+        ]
+
+
+def test_jobs_zero_uses_all_cpus():
+    """测试 --jobs 0 解析为 CPU 核数，其余值至少为 1"""
+    from onepass_audioclean_seg.pipeline.planner import SegmentPlanner
+    
+    assert SegmentPlanner._resolve_worker_count(0) == (os.cpu_count() or 1)
+    assert SegmentPlanner._resolve_worker_count(3) == 3
+    assert SegmentPlanner._resolve_worker_count(-2) == 1
+    assert SegmentPlanner._resolve_worker_count(None) == 1
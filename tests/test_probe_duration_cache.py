@@ -0,0 +1,43 @@
+"""测试 get_audio_duration_sec 的 ffprobe 结果缓存"""
+
+import subprocess
+
+from onepass_audioclean_seg.audio import probe
+
+
+def test_ffprobe_called_once_per_unchanged_file(monkeypatch, tmp_path):
+    """测试同一文件只调用一次 ffprobe，文件改写后重新探测"""
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"\x00" * 100)
+    
+    calls = []
+    
+    def mock_run_cmd(cmd, timeout_sec=None):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"{len(calls)}.5\n", stderr="")
+    
+    monkeypatch.setattr(probe, "run_cmd", mock_run_cmd)
+    
+    assert probe.get_audio_duration_sec(audio_path, ffprobe_path="/usr/bin/ffprobe") == 1.5
+    assert probe.get_audio_duration_sec(audio_path, ffprobe_path="/usr/bin/ffprobe") == 1.5
+    assert len(calls) == 1
+    
+    # 文件大小变化后缓存失效
+    audio_path.write_bytes(b"\x00" * 200)
+    assert probe.get_audio_duration_sec(audio_path, ffprobe_path="/usr/bin/ffprobe") == 2.5
+    assert len(calls) == 2
+
+
+def test_ffprobe_failure_not_cached(monkeypatch, tmp_path):
+    """测试探测失败的结果不进入缓存"""
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"\x00" * 100)
+    
+    results = iter([
+        subprocess.CompletedProcess([], 1, stdout="", stderr="boom"),
+        subprocess.CompletedProcess([], 0, stdout="3.0\n", stderr=""),
+    ])
+    monkeypatch.setattr(probe, "run_cmd", lambda cmd, timeout_sec=None: next(results))
+    
+    assert probe.get_audio_duration_sec(audio_path, ffprobe_path="/usr/bin/ffprobe") is None
+    assert probe.get_audio_duration_sec(audio_path, ffprobe_path="/usr/bin/ffprobe") == 3.0
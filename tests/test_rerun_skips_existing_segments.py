@@ -0,0 +1,72 @@
+"""测试重复运行时已有 segments.jsonl 的 job 被直接跳过（不重新计算）"""
+
+import array
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+
+def create_test_wav(path: Path, duration_sec: float = 2.0, sample_rate: int = 16000):
+    """创建测试 WAV 文件（中间一段静音）"""
+    n_samples = int(duration_sec * sample_rate)
+    third = n_samples // 3
+    audio_data = array.array("h", [8000] * third + [0] * third + [8000] * (n_samples - 2 * third))
+    
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+
+
+def run_segment(in_root: Path, out_root: Path, extra_args: list[str]) -> subprocess.CompletedProcess:
+    """运行 segment 命令（energy 策略，不依赖 ffmpeg）"""
+    return subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "onepass_audioclean_seg",
+            "segment",
+            "--in",
+            str(in_root),
+            "--out",
+            str(out_root),
+            "--out-mode",
+            "out_root",
+            "--strategy",
+            "energy",
+            "--min-seg-sec",
+            "0.2",
+            "--emit-segments",
+        ] + extra_args,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_rerun_skips_job_with_existing_segments():
+    """测试第二次运行（即使 --jobs 不同）输出 SKIP 且不重写 segments.jsonl"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        in_root = tmpdir_path / "in"
+        (in_root / "a").mkdir(parents=True)
+        create_test_wav(in_root / "a" / "audio.wav")
+        out_root = tmpdir_path / "out"
+        
+        first = run_segment(in_root, out_root, [])
+        assert first.returncode == 0, first.stderr
+        segments_path = out_root / "a" / "seg" / "segments.jsonl"
+        mtime_ns = segments_path.stat().st_mtime_ns
+        
+        second = run_segment(in_root, out_root, ["--jobs", "2"])
+        assert second.returncode == 0, second.stderr
+        assert any(line.startswith("SKIP ") for line in second.stdout.splitlines())
+        assert not any(line.startswith("EMIT ") for line in second.stdout.splitlines())
+        assert segments_path.stat().st_mtime_ns == mtime_ns
+        
+        # --overwrite 时仍然重新生成
+        third = run_segment(in_root, out_root, ["--overwrite"])
+        assert third.returncode == 0, third.stderr
+        assert any(line.startswith("EMIT ") for line in third.stdout.splitlines())
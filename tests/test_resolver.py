@@ -173,3 +173,72 @@ def test_resolve_manifest():
         assert plan_count == 1, f"应有一个 PLAN 行（只解析成功项），实际有 {plan_count} 个"
         assert "job1" in result.stdout, "输出应包含 job1"
 
+
+def test_resolve_root_scandir_matches_rglob(tmp_path):
+    """测试根目录扫描（scandir 遍历）与 Path.rglob 的结果一致"""
+    from onepass_audioclean_seg.pipeline.resolver import _path_sort_key, _scandir_matches
+    
+    root = tmp_path / "root"
+    for rel in ["a/audio.wav", "a-b/audio.wav", "b/c/audio.wav", "b/other.wav", ".hidden/audio.wav", "d/AUDIO.txt"]:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    
+    for pattern in ["audio.wav", "other.wav", "*.wav", "[ab]*"]:
+        expected = sorted(root.rglob(pattern))
+        assert sorted(Path(p) for p in _scandir_matches(str(root), pattern)) == expected
+        # 按组件切分的排序键与 Path 排序顺序一致（"a-b" 与 "a/..." 的相对顺序不同于纯字符串排序）
+        ordered = sorted(_scandir_matches(str(root), pattern), key=_path_sort_key)
+        assert [Path(p) for p in ordered] == expected
+
+
+def test_resolve_manifest_parallel_probe_matches_serial(tmp_path, monkeypatch):
+    """测试 manifest 并发检查文件存在性与串行结果一致（顺序、缺失项跳过、meta.json 缺失告警）"""
+    from onepass_audioclean_seg.pipeline import resolver
+    
+    lines = []
+    for i in range(80):
+        workdir = tmp_path / f"w{i:03d}"
+        workdir.mkdir()
+        if i % 5 != 0:  # 每 5 个缺一个音频
+            (workdir / "audio.wav").touch()
+        if i % 2 == 0:
+            (workdir / "meta.json").touch()
+        lines.append(json.dumps({"workdir": str(workdir), "status": "success"}))
+    lines.insert(10, "{broken")
+    manifest_file = tmp_path / "manifest.jsonl"
+    manifest_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    
+    def _resolve():
+        jobs = resolver.InputResolver()._resolve_manifest(manifest_file, tmp_path / "out", "out_root")
+        return [(job.job_id, job.audio_path, job.meta_path, job.warnings) for job in jobs]
+    
+    monkeypatch.setattr(resolver, "MANIFEST_PROBE_PARALLEL_MIN_ROWS", 1)
+    parallel = _resolve()
+    monkeypatch.setattr(resolver, "MANIFEST_PROBE_PARALLEL_MIN_ROWS", 10**9)
+    serial = _resolve()
+    
+    assert parallel == serial
+    assert len(parallel) == 64
+    assert [audio.parent.name for _, audio, _, _ in parallel] == [f"w{i:03d}" for i in range(80) if i % 5 != 0]
+
+
+def test_resolve_manifest_skips_non_object_lines(tmp_path, caplog):
+    """测试 manifest 中合法 JSON 但不是对象的行被跳过并告警，不影响后续行"""
+    from onepass_audioclean_seg.pipeline.resolver import InputResolver
+    
+    workdir = tmp_path / "job1"
+    workdir.mkdir()
+    (workdir / "audio.wav").touch()
+    manifest_file = tmp_path / "manifest.jsonl"
+    manifest_file.write_text(
+        '["a"]\n"x"\n' + json.dumps({"workdir": str(workdir), "status": "success"}) + "\n",
+        encoding="utf-8",
+    )
+    
+    with caplog.at_level("WARNING"):
+        jobs = InputResolver()._resolve_manifest(manifest_file, tmp_path / "out", "out_root")
+    
+    assert [job.workdir for job in jobs] == [workdir]
+    assert "第 1 行不是 JSON 对象" in caplog.text
+    assert "第 2 行不是 JSON 对象" in caplog.text
@@ -1,13 +1,20 @@
 """测试 RMS 计算功能"""
 
 import array
+import math
 import tempfile
 import wave
 from pathlib import Path
 
 import pytest
 
-from onepass_audioclean_seg.audio.features import compute_rms, rms_to_db
+from onepass_audioclean_seg.audio.features import (
+    compute_rms,
+    compute_rms_batch,
+    rms_from_pcm16,
+    rms_series_from_pcm16,
+    rms_to_db,
+)
 
 
 def create_test_wav(path: Path, duration_sec: float, sample_rate: int = 16000, silent_first_half: bool = True):
@@ -112,3 +119,95 @@ def test_rms_computation_invalid_range():
         rms = compute_rms(wav_path, start_sec=-0.1, end_sec=0.5)
         assert rms is None
 
+
+def test_rms_from_pcm16_stereo_downmix():
+    """测试多声道下混：按帧取平均并截断为整数后再计算 RMS"""
+    # 两帧立体声：(3, 4) -> int(3.5)=3，(-3, -4) -> int(-3.5)=-3
+    frames = array.array("h", [3, 4, -3, -4]).tobytes()
+    rms = rms_from_pcm16(frames, n_channels=2)
+    assert rms == pytest.approx(3 / 32768.0)
+    
+    # 单声道常量幅度
+    frames = array.array("h", [10000] * 160).tobytes()
+    assert rms_from_pcm16(frames) == pytest.approx(10000 / 32768.0)
+    
+    # 空数据
+    assert rms_from_pcm16(b"", n_channels=2) is None
+
+
+def test_rms_from_pcm16_sum_of_squares_exact():
+    """测试平方和在整数域精确累加（含 int16 极值），与逐样本公式逐位一致"""
+    samples = [-32768, 32767, 0, 1, -1, 12345, -23456] * 1000
+    frames = array.array("h", samples).tobytes()
+    expected = math.sqrt(sum(s * s for s in samples) / len(samples)) / 32768.0
+    assert rms_from_pcm16(frames) == expected
+
+
+def test_compute_rms_batch_matches_per_segment():
+    """测试批量 RMS 与逐段 compute_rms 结果一致，无效片段为 None"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = Path(tmpdir) / "test.wav"
+        create_test_wav(wav_path, duration_sec=1.0, silent_first_half=True)
+        
+        segments = [(0.0, 0.5), (0.5, 1.0), (0.25, 0.75), (0.6, 0.6), (2.0, 3.0)]
+        batch = compute_rms_batch(wav_path, segments)
+        
+        assert len(batch) == len(segments)
+        for (start, end), rms in zip(segments, batch):
+            assert rms == compute_rms(wav_path, start_sec=start, end_sec=end)
+        assert batch[3] is None  # end <= start
+        assert batch[4] is None  # 超出文件长度
+        
+        assert compute_rms_batch(wav_path, []) == []
+
+
+def test_compute_rms_batch_seek_fallback_matches(monkeypatch):
+    """测试超过整文件读入上限时回退为逐段读取，结果不变"""
+    from onepass_audioclean_seg.audio import features
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = Path(tmpdir) / "test.wav"
+        create_test_wav(wav_path, duration_sec=1.0, silent_first_half=True)
+        
+        segments = [(0.0, 0.5), (0.25, 0.75), (0.9, 1.5), (2.0, 3.0)]
+        full_read = compute_rms_batch(wav_path, segments)
+        
+        monkeypatch.setattr(features, "BATCH_FULL_READ_MAX_BYTES", 0)
+        assert compute_rms_batch(wav_path, segments) == full_read
+
+
+@pytest.mark.parametrize("n_channels", [1, 2])
+def test_rms_series_from_pcm16_matches_per_frame(n_channels):
+    """测试整段分块计算的 RMS 序列与逐帧切片调用 rms_from_pcm16 逐位一致"""
+    samples = [(i * 7919) % 65536 - 32768 for i in range(1000 * n_channels)]
+    frames = array.array("h", samples).tobytes()
+    
+    for frame_samples, hop_samples, total_samples in [(30, 10, None), (25, 10, 995), (8, 10, None), (10, 10, 2000)]:
+        rms_series, frame_starts = rms_series_from_pcm16(frames, n_channels, frame_samples, hop_samples, total_samples)
+        limit = min(total_samples or 1000, 1000)
+        expected_starts = list(range(0, limit, hop_samples))
+        frame_bytes = 2 * n_channels
+        expected = [
+            rms_from_pcm16(frames[start * frame_bytes:min(start + frame_samples, limit) * frame_bytes], n_channels)
+            for start in expected_starts
+        ]
+        assert frame_starts == expected_starts
+        assert rms_series == expected
+
+
+@pytest.mark.parametrize("chunk_bytes", [16 * 1024 * 1024, 1000, 1])
+def test_energy_rms_series_full_read_matches_streaming(monkeypatch, chunk_bytes):
+    """测试 energy 策略整文件读入与按块流式读取得到相同的 RMS 序列（含块小于一个帧移的情况）"""
+    from onepass_audioclean_seg.strategies import energy_rms
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = Path(tmpdir) / "test.wav"
+        create_test_wav(wav_path, duration_sec=1.0, silent_first_half=True)
+        
+        strategy = energy_rms.EnergyStrategy()
+        full_read = strategy._compute_rms_series(wav_path, frame_ms=30.0, hop_ms=10.0, duration_sec=1.0)
+        assert len(full_read[0]) == 100
+        
+        monkeypatch.setattr(energy_rms, "BATCH_FULL_READ_MAX_BYTES", 0)
+        monkeypatch.setattr(energy_rms, "RMS_STREAM_CHUNK_BYTES", chunk_bytes)
+        assert strategy._compute_rms_series(wav_path, frame_ms=30.0, hop_ms=10.0, duration_sec=1.0) == full_read
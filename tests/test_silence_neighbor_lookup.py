@@ -0,0 +1,68 @@
+"""测试 pre/post silence 的二分查找"""
+
+from onepass_audioclean_seg.pipeline.segments_from_silence import SilenceNeighborLookup
+
+
+def linear_pre_post(silences, start, end):
+    """逐个扫描的参考实现"""
+    pre = 0.0
+    for silence_start, silence_end in silences:
+        if abs(silence_end - start) <= 0.001:
+            pre = silence_end - silence_start
+            break
+    post = 0.0
+    for silence_start, silence_end in silences:
+        if abs(silence_start - end) <= 0.001:
+            post = silence_end - silence_start
+            break
+    return pre, post
+
+
+def test_silence_neighbor_lookup_basic():
+    """测试前后静音查找"""
+    silences = [(0.0, 0.12), (3.0, 3.5), (8.5, 9.0)]
+    lookup = SilenceNeighborLookup(silences)
+    
+    # 语音段 (0.12, 3.0)：前静音 0.12，后静音 0.5
+    assert lookup.pre_silence_sec(0.12) == 0.12
+    assert lookup.post_silence_sec(3.0) == 0.5
+    
+    # 容差内匹配（1ms）
+    assert lookup.pre_silence_sec(3.501) == 0.5
+    assert lookup.post_silence_sec(8.499) == 0.5
+    
+    # 没有相邻静音
+    assert lookup.pre_silence_sec(5.0) == 0.0
+    assert lookup.post_silence_sec(9.5) == 0.0
+
+
+def test_silence_neighbor_lookup_matches_linear_scan():
+    """测试与逐个扫描结果一致（包括容差边界）"""
+    silences = [(0.0, 0.12), (1.0, 1.001), (1.002, 2.0), (3.0, 3.5), (3.501, 4.0), (8.5, 9.0)]
+    lookup = SilenceNeighborLookup(silences)
+    
+    points = sorted({p + d for s, e in silences for p in (s, e) for d in (-0.002, -0.001, 0.0, 0.001, 0.002)})
+    for point in points:
+        point = round(point, 3)
+        pre, post = linear_pre_post(silences, point, point)
+        assert lookup.pre_silence_sec(point) == pre
+        assert lookup.post_silence_sec(point) == post
+
+
+def test_silence_neighbor_lookup_empty():
+    """测试空静音列表"""
+    lookup = SilenceNeighborLookup([])
+    assert lookup.pre_silence_sec(1.0) == 0.0
+    assert lookup.post_silence_sec(1.0) == 0.0
+
+
+def test_silence_neighbor_lookup_segments_batch():
+    """测试批量查找与逐段查找一致（有序与乱序输入）"""
+    silences = [(0.0, 0.12), (1.0, 1.001), (1.002, 2.0), (3.0, 3.5), (3.501, 4.0), (8.5, 9.0)]
+    lookup = SilenceNeighborLookup(silences)
+    
+    segments = [(0.12, 1.0), (0.121, 0.999), (2.0, 3.0), (2.001, 3.001), (4.0, 8.5), (9.0, 9.5)]
+    for ordered in (segments, list(reversed(segments))):
+        pre_values, post_values = lookup.lookup_segments(ordered)
+        assert pre_values == [lookup.pre_silence_sec(start) for start, _ in ordered]
+        assert post_values == [lookup.post_silence_sec(end) for _, end in ordered]
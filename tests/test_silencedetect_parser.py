@@ -2,8 +2,12 @@
 
 import pytest
 
+from pathlib import Path
+
 from onepass_audioclean_seg.strategies.silence_ffmpeg import (
     SilenceInterval,
+    build_silencedetect_cmd,
+    parse_progress_duration,
     parse_silencedetect_output,
 )
 
@@ -89,3 +93,32 @@ def test_parse_silencedetect_output_sorted():
     assert intervals[0].start_sec == 0.000
     assert intervals[1].start_sec == 8.500
 
+
+def test_build_silencedetect_cmd_skips_non_audio_streams():
+    """测试 silencedetect 命令跳过视频/字幕/数据流，且不压低日志级别"""
+    cmd = build_silencedetect_cmd("ffmpeg", Path("audio.wav"), -35.0, 0.35)
+    
+    input_idx = cmd.index("-i")
+    for flag in ("-vn", "-sn", "-dn"):
+        assert flag in cmd
+        assert cmd.index(flag) > input_idx
+    assert "-loglevel" not in cmd
+    assert cmd[cmd.index("-c:a") + 1] == "pcm_s16le"
+    assert "silencedetect=noise=-35.0dB:d=0.35" in cmd
+
+
+def test_parse_progress_duration():
+    """测试从 -progress 输出中解析音频时长（取最后一个 out_time_us）"""
+    output_text = """
+    out_time_us=500000
+    progress=continue
+    [silencedetect @ 0x123456] silence_start: 0.511
+    [silencedetect @ 0x123456] silence_end: 1.509 | silence_duration: 0.998
+out_time_us=2000438
+progress=end
+"""
+    assert parse_progress_duration(output_text) == pytest.approx(2.000438)
+    
+    # 缺失或无效时返回 None（由调用方回退到 ffprobe）
+    assert parse_progress_duration("silence_start: 0.0") is None
+    assert parse_progress_duration("out_time_us=N/A\nprogress=end") is None